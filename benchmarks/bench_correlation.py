@@ -0,0 +1,74 @@
+"""
+Time the batched lead/lag correlation engine against a per-pair pandas loop.
+
+Panels are synthetic, sized like the current data set (about 60 days x 8 subreddits
+x 5 assets) and at 10x the number of days. Run from the repository root:
+
+    python benchmarks/bench_correlation.py
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+
+from scripts.correlation import DEFAULT_LAGS, lag_correlations
+
+N_SUBREDDITS = 8
+N_ASSETS = 5
+BASE_DAYS = 60
+WINDOW = 14
+
+
+def synthetic_panels(n_days: int, seed: int = 0) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Random sentiment/return panels with ~5% missing days, like weekends without bars."""
+    rng = np.random.default_rng(seed)
+    days = pd.date_range("2025-01-01", periods=n_days, freq="D", name="Date")
+    sentiment = pd.DataFrame(rng.normal(0, 0.2, (n_days, N_SUBREDDITS)), index=days,
+                             columns=[f"sub{i}" for i in range(N_SUBREDDITS)])
+    returns = pd.DataFrame(rng.normal(0, 0.01, (n_days, N_ASSETS)), index=days,
+                           columns=[f"asset{i}" for i in range(N_ASSETS)])
+    returns = returns.mask(rng.random(returns.shape) < 0.05)
+    return sentiment, returns
+
+
+def pandas_loop(sentiment: pd.DataFrame, returns: pd.DataFrame, window: int | None):
+    """One Series.corr / rolling().corr call per (lag, subreddit, asset), as a naive implementation would."""
+    for lag in DEFAULT_LAGS:
+        shifted = returns.shift(-lag)
+        for sub in sentiment.columns:
+            for asset in returns.columns:
+                if window is None:
+                    sentiment[sub].corr(shifted[asset])
+                else:
+                    sentiment[sub].rolling(window, min_periods=5).corr(shifted[asset])
+
+
+def measure(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print(f"{'scale':<7}{'days':>6}{'method':>10}{'window':>8}{'batched ms':>12}{'pandas loop ms':>16}")
+    for scale in (1, 10):
+        sentiment, returns = synthetic_panels(BASE_DAYS * scale)
+        for method in ("pearson", "spearman"):
+            for window in (None, WINDOW):
+                batched = measure(lambda: lag_correlations(sentiment, returns, method=method, window=window))
+                # pandas needs scipy for Spearman, so the loop baseline is Pearson only
+                loop = measure(lambda: pandas_loop(sentiment, returns, window)) if method == "pearson" else None
+                loop_text = f"{loop * 1000:>16.1f}" if loop is not None else f"{'-':>16}"
+                print(f"{scale:<7}{len(sentiment):>6}{method:>10}{window or 'full':>8}"
+                      f"{batched * 1000:>12.1f}{loop_text}")
+
+
+if __name__ == "__main__":
+    main()
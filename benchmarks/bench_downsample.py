@@ -0,0 +1,66 @@
+"""
+Report the Plotly payload of the price and dual-axis chart grid with and without downsampling.
+
+Builds the same figures as the dashboard (one price chart per asset plus one dual-axis chart
+per subreddit x asset pair) from data/financial_data.csv, and from a synthetic year of hourly
+bars. Run from the repository root:
+
+    python benchmarks/bench_downsample.py
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from scripts.data_store import load_table
+from scripts.downsample import METHODS, downsample, payload_bytes, point_budget
+
+N_SUBREDDITS = 8
+CHART_WIDTH = 1000
+
+
+def synthetic_prices(hours: int = 24 * 365, assets: int = 5, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2025-01-01", periods=hours, freq="h")
+    frames = [pd.DataFrame({"Date": dates, "asset": f"asset{i}",
+                            "Close": 100 * np.exp(np.cumsum(rng.normal(0, 0.002, hours)))})
+              for i in range(assets)]
+    return pd.concat(frames, ignore_index=True)
+
+
+def grid_payload(prices: pd.DataFrame, method: str) -> tuple[int, int, float]:
+    """Return (points sent, payload bytes, seconds) for the whole price + dual-axis grid."""
+    start = time.perf_counter()
+    budget = point_budget(CHART_WIDTH)
+    series = {asset: downsample(group, "Date", "Close", budget, method) for asset, group in prices.groupby("asset")}
+    elapsed = time.perf_counter() - start
+
+    total = 0
+    for asset, data in series.items():
+        if "Open" in data.columns:
+            trace = go.Candlestick(x=data["Date"], open=data["Open"], high=data["High"], low=data["Low"], close=data["Close"])
+        else:
+            trace = go.Scatter(x=data["Date"], y=data["Close"], mode="lines+markers")
+        # One price chart plus one dual-axis chart per subreddit carry the same price trace
+        total += payload_bytes(go.Figure(trace)) * (1 + N_SUBREDDITS)
+    return sum(len(data) for data in series.values()), total, elapsed
+
+
+def main():
+    data_sets = {"financial_data": load_table("financial_data", ["Date", "asset", "Close"]),
+                 "synthetic 1y": synthetic_prices()}
+    print(f"{'data':<16}{'method':<8}{'points':>9}{'payload MiB':>13}{'downsample ms':>15}")
+    for label, prices in data_sets.items():
+        prices = prices.assign(asset=prices["asset"].astype(str))
+        for method in ("none",) + tuple(m for m in METHODS if m != "none"):
+            points, size, seconds = grid_payload(prices, method)
+            print(f"{label:<16}{method:<8}{points:>9}{size / 2**20:>13.2f}{seconds * 1000:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Time date-range filtering with boolean masks against FrameIndex binary searches.
+
+Builds synthetic frames shaped like the dashboard's three (hourly prices by asset, posts by
+subreddit, rollup cube cells) at 1M and 5M rows, and filters each to a 30-day window for
+a subset of partitions, the way a rerun does. Run from the repository root:
+
+    python benchmarks/bench_frame_index.py
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+
+from scripts.frame_index import FrameIndex
+
+SUBREDDITS = ["Economics", "StockMarket", "cryptocurrency", "investing", "news", "stocks", "wallstreetbets", "worldnews"]
+ASSETS = ["Bitcoin", "Crude Oil", "Gold", "NASDAQ", "S&P 500"]
+START = pd.Timestamp("2020-01-01")
+
+
+def synthetic_frame(kind: str, n_rows: int, seed: int = 0) -> tuple[pd.DataFrame, list[str], str]:
+    """A shuffled frame of one of the dashboard's shapes, with its partition columns and time column."""
+    rng = np.random.default_rng(seed)
+    if kind == "prices":
+        keys = {"asset": ASSETS}
+        time_col, step = "Date", "1h"
+    elif kind == "posts":
+        keys = {"subreddit": SUBREDDITS}
+        time_col, step = "created_utc", "1min"
+    else:
+        keys = {"subreddit": SUBREDDITS, "asset": ASSETS}
+        time_col, step = "Date", "1D"
+    n_cells = int(np.prod([len(values) for values in keys.values()]))
+    per_cell = n_rows // n_cells
+    grid = pd.MultiIndex.from_product(list(keys.values()), names=list(keys)).to_frame(index=False)
+    df = grid.loc[grid.index.repeat(per_cell)].reset_index(drop=True)
+    df[time_col] = START + np.tile(np.arange(per_cell), n_cells) * pd.Timedelta(step)
+    df["value"] = rng.normal(size=len(df))
+    return df.sample(frac=1, random_state=seed).reset_index(drop=True), list(keys), time_col
+
+
+def mask_filter(df: pd.DataFrame, keys: list[str], time_col: str, wanted: dict, start, end) -> pd.DataFrame:
+    """The dashboard's previous approach: one boolean mask over every row."""
+    mask = (df[time_col] >= start) & (df[time_col] <= end)
+    for col in keys:
+        mask &= df[col].isin(wanted[col])
+    return df[mask]
+
+
+def index_filter(index: FrameIndex, keys: list[str], wanted: dict, start, end) -> pd.DataFrame:
+    cells = pd.MultiIndex.from_product([wanted[col] for col in keys]).tolist() if len(keys) > 1 else wanted[keys[0]]
+    return index.take(cells, start, end)
+
+
+def measure(fn, repeat: int = 5):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    print(f"{'frame':<8}{'rows':>11}{'matched':>9}{'build ms':>10}{'mask ms':>10}{'index ms':>10}{'speedup':>9}")
+    for n_rows in (1_000_000, 5_000_000):
+        for kind in ("prices", "posts", "cube"):
+            df, keys, time_col = synthetic_frame(kind, n_rows)
+            wanted = {"asset": ASSETS[:3], "subreddit": SUBREDDITS[:4]}
+            span = df[time_col].max() - df[time_col].min()
+            start = df[time_col].min() + span / 2
+            end = start + pd.Timedelta(days=30)
+
+            build, index = measure(lambda: FrameIndex(df, keys[0] if len(keys) == 1 else keys, time_col), repeat=1)
+            mask_time, expected = measure(lambda: mask_filter(df, keys, time_col, wanted, start, end))
+            index_time, got = measure(lambda: index_filter(index, keys, wanted, start, end))
+            assert len(expected) == len(got)
+            print(f"{kind:<8}{len(df):>11,}{len(got):>9,}{build * 1000:>10.0f}{mask_time * 1000:>10.2f}"
+                  f"{index_time * 1000:>10.2f}{mask_time / index_time:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Measure the concurrent scraping engine against a fake Reddit client (no network needed).
+
+    python benchmarks/bench_scrape.py
+"""
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.fakes import FakeReddit
+from scripts.scoring import ScoringStage
+from scripts.scrape_engine import print_stats, scrape_subreddits
+
+SUBREDDITS = [
+    "cryptocurrency", "stocks", "investing", "StockMarket",
+    "wallstreetbets", "Economics", "worldnews", "news",
+]
+
+
+def main():
+    scoring = ScoringStage()
+    client = FakeReddit(SUBREDDITS, posts_per_subreddit=500, page_latency=0.2, rate_limit_every=17)
+    cutoff = datetime.now(timezone.utc) - timedelta(days=90)
+
+    def prepare_post(sub, post):
+        return {"id": post.id, "subreddit": sub, "text": f"{post.title}\n{post.selftext}"}
+
+    for workers in (1, 4, 8):
+        start = time.perf_counter()
+        rows, stats = scrape_subreddits(lambda: client, SUBREDDITS, prepare_post, cutoff, scoring=scoring,
+                                        max_workers=workers, requests_per_minute=6000, base_delay=0.1)
+        elapsed = time.perf_counter() - start
+        print(f"\n{workers} worker(s): {len(rows)} posts in {elapsed:.2f}s ({len(rows) / elapsed:.0f} posts/s)")
+        print_stats(stats)
+    scoring.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Compare cold-load time and memory of the legacy CSV path against the Parquet store.
+
+Run from the repository root:
+
+    python benchmarks/bench_store.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pandas as pd
+
+from scripts.data_store import TABLES, read_csv_table, read_table, write_table
+
+
+def load_csv_legacy(csv_path: str, time_col: str | None) -> pd.DataFrame:
+    """The CSV path load_data() used before the store existed."""
+    if time_col is None:
+        return pd.read_csv(csv_path)
+    df = pd.read_csv(csv_path, parse_dates=[time_col])
+    df[time_col] = pd.to_datetime(df[time_col], utc=True, format="mixed").dt.tz_localize(None)
+    return df
+
+
+def measure(fn, repeat: int = 5) -> tuple[float, float]:
+    """Return (best seconds, in-memory frame MiB) for a loader."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, df.memory_usage(deep=True).sum() / 2**20
+
+
+def main():
+    with tempfile.TemporaryDirectory() as store_dir:
+        print(f"{'table':<18}{'path':<10}{'rows':>8}{'load s':>10}{'frame MiB':>11}")
+        for name, spec in TABLES.items():
+            if spec["csv"] is None:
+                # Store-only tables (the rollup) have no CSV path to compare against
+                continue
+            csv_path = spec["csv"]
+            if name == "reddit_text" and not os.path.exists(csv_path):
+                # Fall back to the title-only export so the text path is still exercised
+                csv_path = "data/reddit_sentiment.csv"
+            if not os.path.exists(csv_path):
+                continue
+
+            source = pd.read_csv(csv_path)
+            write_table(source, name, store_dir)
+
+            csv_stats = measure(lambda: load_csv_legacy(csv_path, spec["time_col"]))
+            store_stats = measure(lambda: read_table(name, store_dir=store_dir))
+            for label, (seconds, frame) in (("csv", csv_stats), ("parquet", store_stats)):
+                print(f"{name:<18}{label:<10}{len(source):>8}{seconds:>10.4f}{frame:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Compare blocking and streaming summaries against the local fake LLM server, and show how
+much the token budget shrinks prompts built from long posts.
+
+    python benchmarks/bench_summary.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pandas as pd
+
+from benchmarks.fake_llm_server import FakeLLMServer
+from benchmarks.fakes import fake_text
+
+N_POSTS = 200
+
+
+def synthetic_posts(n: int = N_POSTS, seed: int = 0) -> pd.DataFrame:
+    rng = random.Random(seed)
+    # A few very long selftexts among mostly short posts, like real subreddits
+    texts = [fake_text(rng, 400, 1200) if rng.random() < 0.1 else fake_text(rng) for _ in range(n)]
+    return pd.DataFrame({
+        "text": texts,
+        "compound": [rng.uniform(-1, 1) for _ in range(n)],
+        "score": [rng.randint(0, 500) for _ in range(n)],
+        "num_comments": [rng.randint(0, 200) for _ in range(n)],
+    })
+
+
+def main():
+    with FakeLLMServer(token_delay=0.02, first_token_delay=0.3) as server:
+        os.environ["GROQ_BASE_URL"] = server.base_url
+        os.environ.setdefault("GROQ_API_KEY", "fake")
+        from scripts import summary_generator as sg
+
+        posts = synthetic_posts()
+        unbounded = sg.PROMPT_TEMPLATE.format(subreddit="stocks", posts="\n".join(posts["text"].head(20)))
+        prompt, texts = sg.build_prompt(posts, "stocks")
+        print(f"prompt tokens (est.): first 20 posts {sg.estimate_tokens(unbounded):,} → "
+              f"budgeted {sg.estimate_tokens(prompt):,} ({len(texts)} posts)")
+
+        start = time.perf_counter()
+        sg.summarize_with_groq(posts, "stocks", cache=None)
+        blocking = time.perf_counter() - start
+
+        start = time.perf_counter()
+        first = None
+        for _ in sg.stream_summary(posts, "stocks", cache=None):
+            if first is None:
+                first = time.perf_counter() - start
+        streaming = time.perf_counter() - start
+
+        print(f"blocking: summary after {blocking:.2f}s")
+        print(f"streaming: first text after {first:.2f}s, complete after {streaming:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Measure the memory the dashboard spends on Reddit text, before and after compaction.
+
+The legacy path keeps object-dtype strings, hands every rerun its own copy through
+st.cache_data and copies again while filtering and grouping. The compact path builds one
+shared TextIndex and answers filters with slices. Posts are synthetic, at the current
+volume and at 10x. Run from the repository root:
+
+    python benchmarks/bench_text_memory.py
+"""
+import os
+import pickle
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+
+from scripts.text_frame import TextIndex
+
+SUBREDDITS = ["Economics", "StockMarket", "cryptocurrency", "investing", "news", "stocks", "wallstreetbets", "worldnews"]
+BASE_POSTS = 20_000
+DAYS = 90
+SESSIONS = 5
+WORDS = np.array("market rates inflation earnings bullish bearish fed tariffs recession rally crash "
+                 "bitcoin yields jobs guidance buyback dividend calls puts options".split())
+
+
+def synthetic_posts(n_posts: int, seed: int = 0) -> pd.DataFrame:
+    """Random posts with object-dtype strings as the CSV loader used to produce; ~20% repeat an earlier body."""
+    rng = np.random.default_rng(seed)
+    n_unique = int(n_posts * 0.8)
+    bodies = [" ".join(rng.choice(WORDS, rng.integers(20, 80))) for _ in range(n_unique)]
+    body_ids = np.concatenate([np.arange(n_unique), rng.integers(0, n_unique, n_posts - n_unique)])
+    start = pd.Timestamp("2025-05-01")
+    df = pd.DataFrame({
+        "subreddit": rng.choice(SUBREDDITS, n_posts),
+        "created_utc": start + pd.to_timedelta(rng.integers(0, DAYS * 86400, n_posts), unit="s"),
+        "text_id": [f"{i:016x}" for i in body_ids],
+        "text": [bodies[i] for i in body_ids],
+        "title": [bodies[i][:60] for i in body_ids],
+        "compound": rng.uniform(-1, 1, n_posts),
+        "score": rng.integers(0, 5000, n_posts),
+        "num_comments": rng.integers(0, 500, n_posts),
+    })
+    for col in ("subreddit", "text_id", "text", "title"):
+        df[col] = df[col].astype(object)
+    return df
+
+
+def frame_bytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(deep=True).sum())
+
+
+def copied_bytes(frames: list[pd.DataFrame], base: pd.DataFrame) -> int:
+    """Bytes of the frames in `frames` whose data is not shared with `base`."""
+    base_values = base["compound"].to_numpy()
+    return sum(frame_bytes(df) for df in frames if not np.shares_memory(df["compound"].to_numpy(), base_values))
+
+
+def legacy_rerun(cached: pd.DataFrame, subreddits: list[str]) -> list[pd.DataFrame]:
+    """What one rerun used to allocate for an already-loaded date range."""
+    text_df = pickle.loads(pickle.dumps(cached))  # st.cache_data returns a fresh copy on every call
+    text_filtered = text_df[text_df["subreddit"].isin(subreddits)]
+    groups = [group.sort_values("created_utc").copy() for _, group in text_filtered.groupby("subreddit")]
+    return [text_df, text_filtered, *groups]
+
+
+def compact_rerun(index: TextIndex, subreddits: list[str], start, end) -> list[pd.DataFrame]:
+    return list(index.select(subreddits, start, end).values())
+
+
+def timed(fn, repeat: int = 3):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    mib = 1024 ** 2
+    print(f"{'scale':<7}{'posts':>9}{'path':>9}{'all posts MiB':>15}{'copied/rerun MiB':>18}"
+          f"{f'{SESSIONS} sessions MiB':>18}{'rerun ms':>10}")
+    for scale in (1, 10):
+        posts = synthetic_posts(BASE_POSTS * scale)
+        start, end = pd.Timestamp("2025-06-01"), pd.Timestamp("2025-06-30")
+        subreddits = SUBREDDITS[:4]
+
+        cached = posts[(posts["created_utc"] >= start) & (posts["created_utc"] <= end)]
+        legacy_time, legacy_frames = timed(lambda: legacy_rerun(cached, subreddits))
+        legacy_copied = copied_bytes(legacy_frames, cached)
+        # The cache entry holds the selected month; each session adds its own rerun copies on top
+        legacy_sessions = frame_bytes(cached) + SESSIONS * legacy_copied
+
+        index = TextIndex(posts)
+        compact_time, compact_frames = timed(lambda: compact_rerun(index, subreddits, start, end))
+        compact_copied = copied_bytes(compact_frames, index.frame)
+        compact_sessions = index.memory_bytes() + SESSIONS * compact_copied
+
+        for path, resident, copied, sessions, seconds in (
+            ("legacy", frame_bytes(posts), legacy_copied, legacy_sessions, legacy_time),
+            ("compact", index.memory_bytes(), compact_copied, compact_sessions, compact_time),
+        ):
+            print(f"{scale:<7}{len(posts):>9,}{path:>9}{resident / mib:>15.1f}{copied / mib:>18.1f}"
+                  f"{sessions / mib:>18.1f}{seconds * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
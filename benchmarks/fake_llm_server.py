@@ -0,0 +1,145 @@
+"""
+Local OpenAI-compatible chat completions server for exercising the summarizer offline.
+
+Serves POST /v1/chat/completions in both blocking and streaming (server-sent events)
+form, replying with canned text one word at a time. Start it and point the app at it:
+
+    python benchmarks/fake_llm_server.py --port 8001 --token-delay 0.05
+    GROQ_BASE_URL=http://127.0.0.1:8001/v1 GROQ_API_KEY=fake streamlit run dashboard/app.py
+"""
+import argparse
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_REPLY = (
+    "Sentiment is mixed: posters worry about rates and inflation, while a bullish minority "
+    "points to strong earnings. The tone is cautious, with recession fears recurring."
+)
+
+
+class FakeLLMServer:
+    """
+    Threaded fake of the OpenAI chat completions endpoint.
+
+    Args:
+        reply (str): Text every completion returns (cut to the request's max_tokens words).
+        token_delay (float): Seconds between streamed tokens, and per token for blocking replies.
+        first_token_delay (float): Extra seconds before the first token (queueing/prefill time).
+        host (str): Interface to bind.
+        port (int): Port to bind; 0 picks a free one.
+    """
+
+    def __init__(self, reply: str = DEFAULT_REPLY, token_delay: float = 0.02, first_token_delay: float = 0.2,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.reply = reply
+        self.token_delay = token_delay
+        self.first_token_delay = first_token_delay
+        self.requests = []
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeLLMServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _tokens(self, max_tokens: int | None) -> list[str]:
+        words = self.reply.split(" ")
+        if max_tokens:
+            words = words[:max_tokens]
+        return [word if i == 0 else " " + word for i, word in enumerate(words)]
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self.send_error(404)
+                    return
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                with server._lock:
+                    server.requests.append(body)
+                tokens = server._tokens(body.get("max_tokens"))
+                completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+                base = {"id": completion_id, "created": int(time.time()), "model": body.get("model", "fake")}
+                time.sleep(server.first_token_delay)
+
+                if not body.get("stream"):
+                    time.sleep(server.token_delay * len(tokens))
+                    payload = dict(base, object="chat.completion", choices=[{
+                        "index": 0, "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": "".join(tokens)},
+                    }], usage={"prompt_tokens": 0, "completion_tokens": len(tokens), "total_tokens": len(tokens)})
+                    data = json.dumps(payload).encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                for i, token in enumerate(tokens):
+                    delta = {"role": "assistant", "content": token} if i == 0 else {"content": token}
+                    self._event(dict(base, object="chat.completion.chunk",
+                                     choices=[{"index": 0, "delta": delta, "finish_reason": None}]))
+                    time.sleep(server.token_delay)
+                self._event(dict(base, object="chat.completion.chunk",
+                                 choices=[{"index": 0, "delta": {}, "finish_reason": "stop"}]))
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+
+            def _event(self, payload: dict):
+                self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake OpenAI-compatible chat completions server.")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--token-delay", type=float, default=0.05, help="Seconds between streamed tokens.")
+    parser.add_argument("--first-token-delay", type=float, default=0.3)
+    args = parser.parse_args()
+
+    server = FakeLLMServer(token_delay=args.token_delay, first_token_delay=args.first_token_delay, port=args.port)
+    print(f"🧪 Fake LLM server listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
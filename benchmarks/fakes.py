@@ -0,0 +1,97 @@
+"""
+Offline stand-ins for the external services the pipeline talks to.
+
+These mimic just enough of each client's interface for the pipeline code to run
+without network access or credentials.
+"""
+import random
+import threading
+import time
+import types
+from datetime import datetime, timezone
+
+WORDS = [
+    "stocks", "rally", "crash", "inflation", "rates", "earnings", "bitcoin", "gold", "oil",
+    "fed", "recession", "growth", "jobs", "bullish", "bearish", "great", "terrible", "surge",
+    "plunge", "record", "fear", "hope", "market", "tariffs", "yields", "default", "boom",
+]
+
+
+def fake_text(rng: random.Random, min_words: int = 6, max_words: int = 20) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))).capitalize()
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, headers: dict | None = None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class FakeTooManyRequests(Exception):
+    """Shaped like prawcore.TooManyRequests: carries a response with status 429."""
+
+    def __init__(self, retry_after: float | None = None):
+        headers = {} if retry_after is None else {"retry-after": str(retry_after)}
+        self.response = FakeResponse(429, headers)
+        super().__init__("received 429 HTTP response")
+
+
+class _FakeSubreddit:
+    def __init__(self, client: "FakeReddit", name: str):
+        self.client = client
+        self.name = name
+
+    def new(self, limit: int = 100):
+        posts = self.client.posts[self.name][:limit]
+        for i, post in enumerate(posts):
+            if i % 100 == 0:
+                self.client._request(self.name)
+            yield post
+
+
+class FakeReddit:
+    """
+    praw.Reddit stand-in serving generated posts newest first, 100 per simulated page.
+
+    Args:
+        subreddits (list[str]): Subreddits to generate posts for.
+        posts_per_subreddit (int): Posts generated per subreddit.
+        page_latency (float): Seconds each listing page takes to "download".
+        rate_limit_every (int): Raise a 429 on every n-th page request (0 disables).
+        seed (int): Seed for reproducible post content.
+        now (datetime | None): Timestamp of the newest post.
+    """
+
+    def __init__(self, subreddits: list[str], posts_per_subreddit: int = 500, page_latency: float = 0.05,
+                 rate_limit_every: int = 0, seed: int = 0, now: datetime | None = None):
+        rng = random.Random(seed)
+        now = (now or datetime.now(timezone.utc)).timestamp()
+        self.page_latency = page_latency
+        self.rate_limit_every = rate_limit_every
+        self.requests = 0
+        self._lock = threading.Lock()
+        self.posts = {
+            sub: [
+                types.SimpleNamespace(
+                    id=f"{sub[:3]}{i:07d}",
+                    created_utc=now - i * 600,
+                    title=fake_text(rng),
+                    selftext=fake_text(rng, 0, 60),
+                    score=rng.randint(0, 5000),
+                    num_comments=rng.randint(0, 800),
+                )
+                for i in range(posts_per_subreddit)
+            ]
+            for sub in subreddits
+        }
+
+    def _request(self, sub: str) -> None:
+        with self._lock:
+            self.requests += 1
+            count = self.requests
+        if self.rate_limit_every and count % self.rate_limit_every == 0:
+            raise FakeTooManyRequests(retry_after=0.1)
+        time.sleep(self.page_latency)
+
+    def subreddit(self, name: str) -> _FakeSubreddit:
+        return _FakeSubreddit(self, name)
@@ -0,0 +1,226 @@
+"""
+End-to-end benchmark suite on synthetic data, with no network access needed.
+
+For each scale, writes synthetic data sets to a temporary directory (see synthetic.py) and
+times the pipeline and dashboard hot paths against stubbed services: the fake Reddit client
+(benchmarks/fakes.py), price fixtures (FixtureTransport) and the fake LLM server
+(benchmarks/fake_llm_server.py). Results are printed and written as JSON, one record per
+(scale, case), so runs can be compared over time. Run from the repository root:
+
+    python benchmarks/run_suite.py                          # scales 1 and 10
+    python benchmarks/run_suite.py --scales 1 10 100 --output bench_results.json
+    python benchmarks/run_suite.py --cases process_full dashboard_filter
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from functools import partial
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(REPO_ROOT)
+
+import pandas as pd
+
+from benchmarks.fake_llm_server import FakeLLMServer
+from benchmarks.fakes import FakeReddit
+from benchmarks.synthetic import SUBREDDITS, write_dataset
+from scripts.change_log import record_changes
+from scripts.correlation import daily_panels, lag_correlations
+from scripts.data_store import attach_texts, load_table
+from scripts.frame_index import FrameIndex
+from scripts.rollup import combine, index_cube, slice_cube
+from scripts.scoring import ScoringStage
+from scripts.scrape_engine import scrape_subreddits
+from scripts.text_frame import TextIndex
+
+# Same columns the dashboard reads
+FINANCIAL_COLUMNS = ["Date", "asset", "Close"]
+TEXT_COLUMNS = ["subreddit", "created_utc", "text_id", "text", "title", "compound", "score", "num_comments"]
+WINDOW_DAYS = 30
+POSTS_PER_SUBREDDIT = 800
+
+
+def measure(fn, repeat: int):
+    """Best wall time of `repeat` calls, and the last call's result."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run_script(script: str, *args: str, cwd: str) -> None:
+    """Run a pipeline script with `cwd` as the repository-relative working directory."""
+    subprocess.run([sys.executable, os.path.join(REPO_ROOT, script), *args], cwd=cwd, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+
+class Suite:
+    """
+    The benchmark cases for one synthetic data set. Each case returns extra fields for its record.
+
+    Args:
+        root (str): Directory holding the data set (its data/ is the working directory's data/).
+        scale (float): Data set scale, for the fake Reddit client's post count.
+    """
+
+    def __init__(self, root: str, scale: float):
+        self.root = root
+        self.scale = scale
+        self.merged = False
+        self.financial = self.cube = self.text = None
+
+    def window(self):
+        end = pd.Timestamp.now(tz="UTC").floor("D").tz_localize(None)
+        return end - timedelta(days=WINDOW_DAYS), end
+
+    def scrape_fake_reddit(self):
+        """Concurrent fetch from the fake Reddit client with VADER scoring in a process pool."""
+        per_subreddit = int(POSTS_PER_SUBREDDIT * self.scale)
+        client = FakeReddit(SUBREDDITS, posts_per_subreddit=per_subreddit, page_latency=0)
+        cutoff = datetime.now(timezone.utc) - timedelta(days=3650)
+
+        def prepare_post(sub, post):
+            return {"id": post.id, "subreddit": sub, "text": f"{post.title}\n{post.selftext}"}
+
+        with ScoringStage(processes=1) as scoring:
+            rows, _ = scrape_subreddits(lambda: client, SUBREDDITS, prepare_post, cutoff, scoring=scoring,
+                                        limit=per_subreddit, requests_per_minute=10 ** 6)
+        return {"posts": len(rows)}
+
+    def fetch_prices_fixtures(self):
+        """financial_data.py reading the synthetic raw snapshots; it keeps the last 90 days whatever the scale."""
+        fetch_dir = os.path.join(self.root, "fetch")
+        os.makedirs(fetch_dir, exist_ok=True)
+        run_script("scripts/financial_data.py", "--fixtures", os.path.join(self.root, "fixtures"), cwd=fetch_dir)
+        return {}
+
+    def process_full(self):
+        run_script("scripts/process_data.py", cwd=self.root)
+        self.merged = True
+        return {}
+
+    def process_incremental(self):
+        """Incremental merge after one subreddit's latest day changed."""
+        day = (pd.Timestamp.now(tz="UTC") - timedelta(days=1)).strftime("%Y-%m-%d")
+        record_changes("reddit_sentiment", {(day, SUBREDDITS[0])}, changes_dir=os.path.join(self.root, "data", "changes"))
+        run_script("scripts/process_data.py", "--incremental", cwd=self.root)
+        return {}
+
+    def dashboard_load(self):
+        """Cold load of the three frames the dashboard shares across sessions."""
+        self.financial = FrameIndex(load_table("financial_data", FINANCIAL_COLUMNS), "asset", "Date")
+        self.cube = index_cube(load_table("rollup"))
+        self.text = TextIndex(attach_texts(load_table("reddit_text", TEXT_COLUMNS)))
+        return {"posts": len(self.text.frame), "bars": len(self.financial.frame), "cube_rows": len(self.cube.frame)}
+
+    def dashboard_filter(self):
+        """One rerun's filtering: cube rows, posts and prices for a 30-day window."""
+        start, end = self.window()
+        rows = slice_cube(self.cube, "day", self.cube.key_values("subreddit"), self.cube.key_values("asset"), start, end)
+        posts = self.text.select(self.text.subreddits, start, end)
+        prices = {asset: self.financial.slice(asset, start, end) for asset in self.financial.partitions}
+        return {"cube_rows": len(rows), "posts": sum(map(len, posts.values())), "bars": sum(map(len, prices.values()))}
+
+    def aggregate(self):
+        """Chart re-aggregation and the lead/lag correlation matrix over the whole range."""
+        start, end = self.window()
+        subreddits, assets = self.cube.key_values("subreddit"), self.cube.key_values("asset")
+        window_rows = slice_cube(self.cube, "day", subreddits, assets, start, end)
+        combine(window_rows, ["Date", "subreddit"])
+        combine(window_rows, ["Date"])
+        lag_correlations(*daily_panels(slice_cube(self.cube, "day", subreddits, assets)), window=14)
+        return {}
+
+    def summary_prompts(self):
+        """Prompt building for every subreddit: one ranked prompt and one per weekly chunk."""
+        from scripts.summary_generator import CHUNK_PROMPT_TEMPLATE, build_prompt, chunk_posts
+        start, end = self.window()
+        prompts = 0
+        for name, posts in self.text.select(self.text.subreddits, start, end).items():
+            build_prompt(posts, name)
+            for period, chunk in chunk_posts(posts, "W"):
+                build_prompt(chunk, name, template=CHUNK_PROMPT_TEMPLATE, period=period)
+                prompts += 1
+        return {"chunk_prompts": prompts}
+
+    def summary_fake_llm(self):
+        """Streamed map-reduce summaries for every subreddit against the fake LLM server, caches off."""
+        from scripts.summary_generator import stream_many, stream_map_reduce
+        start, end = self.window()
+        posts = self.text.select(self.text.subreddits, start, end)
+        stream_fn = partial(stream_map_reduce, freq="W", chunk_cache=None)
+        pieces = sum(1 for _ in stream_many(posts, cache=None, stream_fn=stream_fn))
+        return {"pieces": pieces}
+
+
+CASES = ["scrape_fake_reddit", "fetch_prices_fixtures", "process_full", "process_incremental",
+         "dashboard_load", "dashboard_filter", "aggregate", "summary_prompts", "summary_fake_llm"]
+# Cases reading the merged data/rollup, and cases reading the frames dashboard_load builds
+NEEDS_MERGE = set(CASES[3:])
+NEEDS_FRAMES = set(CASES[5:])
+# Cases that build state later cases read run once; the others report the best of --repeat
+SINGLE_RUN = {"process_full", "dashboard_load"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the pipeline and dashboard on synthetic data.")
+    parser.add_argument("--scales", type=float, nargs="+", default=[1, 10], help="Data set sizes relative to today's.")
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=CASES, help="Cases to run.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the best time is reported.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_results.json", help="JSON file to write the results to.")
+    args = parser.parse_args()
+
+    # The summarizer reads its endpoint at import time, so it is pointed at the fake server first
+    server = FakeLLMServer(token_delay=0.0, first_token_delay=0.05).start()
+    os.environ["GROQ_BASE_URL"] = server.base_url
+    os.environ.setdefault("GROQ_API_KEY", "fake")
+
+    records = []
+    print(f"{'scale':>6}  {'case':<24}{'seconds':>10}  details")
+    try:
+        for scale in args.scales:
+            with tempfile.TemporaryDirectory(prefix="bench_suite_") as root, contextlib.chdir(root):
+                start = time.perf_counter()
+                rows = write_dataset(root, scale, args.seed)
+                records.append({"scale": scale, "case": "generate", "seconds": time.perf_counter() - start, **rows})
+                print(f"{scale:>6g}  {'generate':<24}{records[-1]['seconds']:>10.3f}  {rows}")
+
+                suite = Suite(root, scale)
+                for case in [case for case in CASES if case in args.cases]:
+                    # Prerequisites of a case that were not selected themselves run untimed
+                    if case in NEEDS_MERGE and not suite.merged:
+                        suite.process_full()
+                    if case in NEEDS_FRAMES and suite.cube is None:
+                        suite.dashboard_load()
+                    repeat = 1 if case in SINGLE_RUN else args.repeat
+                    seconds, extra = measure(getattr(suite, case), repeat)
+                    records.append({"scale": scale, "case": case, "seconds": seconds, "repeat": repeat, **extra})
+                    print(f"{scale:>6g}  {case:<24}{seconds:>10.3f}  {extra or ''}")
+    finally:
+        server.stop()
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "results": [{**record, "seconds": round(record["seconds"], 6)} for record in records],
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1)
+    print(f"\n📄 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Synthetic stand-ins for the pipeline's data sets, at a multiple of the current size.
+
+Scale 1 matches the live data: about 90 days of posts from eight subreddits (~70 a day)
+and hourly bars for five assets. Scale k covers k times as many days at the same density,
+so every table grows k-fold while a 30-day dashboard window stays the same size.
+"""
+import os
+import random
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.fakes import fake_text
+from scripts.data_store import write_table
+from scripts.market_data import snapshot_name
+from scripts.reddit_ingest import split_texts
+from scripts.sentiment_memo import text_id
+
+SUBREDDITS = ["cryptocurrency", "stocks", "investing", "StockMarket", "wallstreetbets", "Economics", "worldnews", "news"]
+ASSETS = {"S&P 500": "^GSPC", "NASDAQ": "^IXIC", "Bitcoin": "BTC-USD", "Gold": "GC=F", "Crude Oil": "CL=F"}
+# Crypto trades around the clock, futures around the clock on weekdays, indices during US market hours (UTC)
+ALWAYS_OPEN = {"Bitcoin"}
+WEEKDAYS_ONLY = {"Gold", "Crude Oil"}
+MARKET_HOURS = range(13, 21)
+BASE_DAYS = 90
+POSTS_PER_DAY = 72
+# Share of posts repeating an earlier body (cross-posts, bots)
+REPEAT_SHARE = 0.1
+
+
+def _scores(rng: np.random.Generator, n: int) -> dict[str, np.ndarray]:
+    """VADER-shaped scores: neg/neu/pos summing to 1 and a compound in [-1, 1]."""
+    parts = rng.dirichlet([1, 6, 1.2], n)
+    compound = np.clip((parts[:, 2] - parts[:, 0]) * 3 + rng.normal(0, 0.2, n), -1, 1)
+    return {"compound": compound.round(4), "neg": parts[:, 0].round(3), "neu": parts[:, 1].round(3),
+            "pos": parts[:, 2].round(3)}
+
+
+def synthetic_posts(scale: float = 1, seed: int = 0, end: pd.Timestamp | None = None) -> pd.DataFrame:
+    """
+    Posts shaped like reddit_text (with its `text` column still attached) and their scores.
+
+    Returns:
+        pd.DataFrame: id, subreddit, created_utc (UTC), title, text_id, text, score, num_comments,
+            compound, neg, neu, pos, newest first.
+    """
+    rng = np.random.default_rng(seed)
+    text_rng = random.Random(seed)
+    end = end or pd.Timestamp.now(tz="UTC").floor("D")
+    days = int(BASE_DAYS * scale)
+    n = days * POSTS_PER_DAY
+
+    n_unique = n - int(n * REPEAT_SHARE)
+    titles = [fake_text(text_rng) for _ in range(n_unique)]
+    bodies = [f"{title}\n{fake_text(text_rng, 0, 60)}".strip() for title in titles]
+    which = np.concatenate([np.arange(n_unique), rng.integers(0, n_unique, n - n_unique)])
+    rng.shuffle(which)
+
+    offsets = np.sort(rng.integers(0, days * 86400, n))
+    texts = [bodies[i] for i in which]
+    posts = pd.DataFrame({
+        "id": [f"p{i:09d}" for i in range(n)],
+        "subreddit": rng.choice(SUBREDDITS, n),
+        "created_utc": end - pd.to_timedelta(offsets, unit="s"),
+        "title": [titles[i] for i in which],
+        "text_id": [text_id(text) for text in texts],
+        "text": texts,
+        "score": rng.integers(0, 5000, n),
+        "num_comments": rng.integers(0, 800, n),
+        **_scores(rng, n),
+    })
+    return posts
+
+
+def synthetic_prices(scale: float = 1, seed: int = 0, end: pd.Timestamp | None = None) -> pd.DataFrame:
+    """Hourly bars in the financial_data layout (Date naive UTC, Open, Close, pct_change, asset, ticker, Volume)."""
+    rng = np.random.default_rng(seed)
+    end = end or pd.Timestamp.now(tz="UTC").floor("D")
+    hours = pd.date_range(end=end.tz_localize(None), periods=int(BASE_DAYS * scale) * 24, freq="h")
+    weekdays = hours.weekday < 5
+    sessions = {"always": hours, "weekdays": hours[weekdays], "market": hours[weekdays & np.isin(hours.hour, MARKET_HOURS)]}
+    frames = []
+    for i, (asset, ticker) in enumerate(ASSETS.items()):
+        times = sessions["always" if asset in ALWAYS_OPEN else "weekdays" if asset in WEEKDAYS_ONLY else "market"]
+        close = 100 * (i + 1) * np.exp(np.cumsum(rng.normal(0, 0.004, len(times))))
+        bars = pd.DataFrame({
+            "Date": times,
+            "Open": np.concatenate([[close[0]], close[:-1]]),
+            "Close": close,
+            "asset": asset,
+            "ticker": ticker,
+            "Volume": rng.integers(1_000, 1_000_000, len(times)),
+        })
+        bars.insert(3, "pct_change", bars["Close"].pct_change())
+        frames.append(bars)
+    return pd.concat(frames, ignore_index=True)
+
+
+def write_raw_snapshots(prices: pd.DataFrame, directory: str) -> None:
+    """Write bars as raw_<ticker>.csv files in the yfinance layout read by FixtureTransport."""
+    os.makedirs(directory, exist_ok=True)
+    for ticker, bars in prices.groupby("ticker"):
+        raw = pd.DataFrame({
+            "Datetime": bars["Date"].dt.tz_localize("UTC"),
+            "Adj Close": bars["Close"], "Close": bars["Close"], "High": bars[["Open", "Close"]].max(axis=1),
+            "Low": bars[["Open", "Close"]].min(axis=1), "Open": bars["Open"], "Volume": bars["Volume"],
+        })
+        raw.to_csv(os.path.join(directory, f"raw_{snapshot_name(ticker)}.csv"), index=False)
+
+
+def write_dataset(root: str, scale: float = 1, seed: int = 0) -> dict[str, int]:
+    """
+    Write synthetic reddit_sentiment, reddit_text/texts and financial_data tables under `root`/data,
+    as CSVs and in the columnar store, plus raw price snapshots under `root`/fixtures.
+
+    Returns:
+        dict[str, int]: Rows written per table.
+    """
+    data_dir = os.path.join(root, "data")
+    store_dir = os.path.join(data_dir, "store")
+    os.makedirs(data_dir, exist_ok=True)
+
+    posts = synthetic_posts(scale, seed)
+    prices = synthetic_prices(scale, seed)
+    sentiment = posts[["id", "subreddit", "title", "created_utc", "compound", "neg", "neu", "pos"]]
+    text_posts, texts = split_texts(posts.drop(columns=["title"]))
+
+    tables = {"reddit_sentiment": sentiment, "reddit_text": text_posts, "texts": texts, "financial_data": prices}
+    for name, df in tables.items():
+        df.to_csv(os.path.join(data_dir, f"{name}.csv"), index=False)
+        write_table(df, name, store_dir=store_dir)
+    write_raw_snapshots(prices, os.path.join(root, "fixtures"))
+    return {name: len(df) for name, df in tables.items()}
@@ -1,8 +1,18 @@
 import sys
 import os
+import math
+from functools import partial
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from scripts.summary_generator import summarize_with_groq
+from scripts.summary_generator import chunk_cache, stream_many, stream_map_reduce, summary_cache
+from scripts.data_store import attach_texts, load_table
+from scripts.rollup import combine, cube_from_merged, index_cube, slice_cube
+from scripts.correlation import DEFAULT_LAGS, METHODS, daily_panels, lag_correlations
+from scripts.downsample import downsample, payload_bytes, point_budget
+from scripts.frame_index import FrameIndex
+from scripts.text_frame import TextIndex
+from scripts.instrumentation import Recorder, activate
+from scripts.live_store import LiveData, LiveTable
 
 # app.py
 import streamlit as st
@@ -10,115 +20,244 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 
-# Load data
+# Only the columns the charts below actually use are read from the store
+MERGED_COLUMNS = ["Date", "asset", "subreddit", "avg_compound", "avg_neg", "avg_neu", "avg_pos", "Volume", "pct_change"]
+FINANCIAL_COLUMNS = ["Date", "asset", "Close"]
+# compound and engagement columns let the summarizer pick the most informative posts
+TEXT_COLUMNS = ["subreddit", "created_utc", "text_id", "text", "title", "compound", "score", "num_comments"]
+SUMMARY_MODES = {
+    "Whole period (weekly chunks)": partial(stream_map_reduce, freq="W"),
+    "Whole period (daily chunks)": partial(stream_map_reduce, freq="D"),
+    "Most informative posts only": None,
+}
+DOWNSAMPLE_LABELS = {
+    "lttb": "LTTB (keeps the shape)",
+    "minmax": "Min/max per bucket",
+    "ohlc": "OHLC candles",
+    "none": "Off (every hourly point)",
+}
+VERSION_POLL_SECONDS = 10
+# Both grains are precomputed in the rollup cube, so switching only changes which cells are sliced
+GRANULARITIES = {
+    "day": "Daily (sentiment vs. next trading day)",
+    "hour": "Hourly (sentiment vs. a later hourly bar)",
+}
+
+# Load data: prices, the rollup cube and Reddit text are each partitioned (by asset, cube cell,
+# subreddit) and time-sorted once, shared as-is across reruns and sessions, and only ever sliced.
+# When the refresh worker (scripts/refresh_worker.py) publishes a new data version, only the
+# months it changed are read and spliced in; sessions pick it up on their next rerun.
+def financial_rows(store_dir):
+    return load_table("financial_data", FINANCIAL_COLUMNS, store_dir=store_dir)
+
+def cube_rows(store_dir):
+    return cube_from_merged(load_table("merged_data", MERGED_COLUMNS, store_dir=store_dir))
+
+def text_rows(store_dir):
+    return attach_texts(load_table("reddit_text", TEXT_COLUMNS, store_dir=store_dir), store_dir)
+
+@st.cache_resource
+def live_data():
+    return LiveData({
+        "financial": LiveTable("financial_data", partial(FrameIndex, keys="asset", time_col="Date"),
+                               FINANCIAL_COLUMNS, fallback=financial_rows),
+        "cube": LiveTable("rollup", index_cube, fallback=cube_rows),
+    })
+
+# Reddit text is the heaviest table, so it is also compacted (see scripts/text_frame.py) and
+# only loaded once a date range asks for posts
+@st.cache_resource
+def live_text():
+    return LiveData({"text": LiveTable("reddit_text", TextIndex, TEXT_COLUMNS, prepare=attach_texts,
+                                          fallback=text_rows)})
+
+# Correlations are computed for every pair at once, so changing the subreddit/asset filters
+# only indexes into the cached matrix; the data version keys out results from older data, so
+# the cube of that version is left out of the cache key (leading underscore)
 @st.cache_data
-def load_data():
-    merged_df = pd.read_csv("data/merged_data.csv", parse_dates=["Date"])
-    text_df = pd.read_csv("data/reddit_text.csv", parse_dates=["created_utc"])
-    financial_df = pd.read_csv("data/financial_data.csv", parse_dates=["Date"])
-    merged_df["Date"] = pd.to_datetime(merged_df["Date"]).dt.tz_localize(None)
-    text_df["created_utc"] = pd.to_datetime(text_df["created_utc"]).dt.tz_localize(None)
-    financial_df["Date"] = pd.to_datetime(financial_df["Date"]).dt.tz_localize(None)
-    return merged_df, text_df, financial_df
+def lag_correlation_matrix(data_version, start_date, end_date, method, window, _cube):
+    rows = slice_cube(_cube, "day", _cube.key_values("subreddit"), _cube.key_values("asset"), start_date, end_date)
+    return lag_correlations(*daily_panels(rows), method=method, window=window)
+
+# Reruns every few seconds to check for a newer data version, and reruns the page when one is loaded
+@st.fragment(run_every=VERSION_POLL_SECONDS)
+def data_version_status(shown_version):
+    latest = live_data().refresh()
+    if latest.number != shown_version:
+        st.rerun()
+    if latest.number is None:
+        st.caption("Data as loaded at startup (no data version published by the refresh worker)")
+        return
+    st.caption(f"Data version {latest.number}, published {latest.published_at}")
+    reloaded = [f"{name}: {', '.join(parts) if parts is not None else 'all'}"
+                for name, parts in latest.changed.items() if parts != []]
+    if reloaded:
+        st.caption("Reloaded: " + "; ".join(reloaded))
+
+def price_trace(prices, asset, **kwargs):
+    """Close price line, or candles when the prices were resampled to OHLC."""
+    if "Open" in prices.columns:
+        return go.Candlestick(x=prices["Date"], open=prices["Open"], high=prices["High"], low=prices["Low"],
+                              close=prices["Close"], name=f"Close Price ({asset})", **kwargs)
+    return go.Scatter(x=prices["Date"], y=prices["Close"], name=f"Close Price ({asset})",
+                      mode="lines+markers", **kwargs)
 
-merged_df, text_df, financial_df = load_data()
+def sentiment_series(data, point_limit, method):
+    """One subreddit's sentiment line reduced like the prices; candles only suit prices, so "ohlc" uses LTTB."""
+    return downsample(data, "Date", "avg_compound", point_limit, "lttb" if method == "ohlc" else method)
+
+# Built on first view and memoized per pair, date range, price detail and data version; the
+# frames are determined by those keys, so they are left out of the cache key (leading underscore)
+@st.cache_data(max_entries=256)
+def dual_axis_figure(subreddit, asset, start_date, end_date, grain, downsample_method, chart_width, data_version,
+                     _sentiment_data, _price_data):
+    sentiment = sentiment_series(_sentiment_data, point_budget(chart_width), downsample_method)
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=sentiment["Date"], y=sentiment["avg_compound"], name=f"Sentiment ({subreddit})",
+                             yaxis="y1", mode="lines+markers"))
+    fig.add_trace(price_trace(_price_data, asset, yaxis="y2"))
+    fig.update_layout(
+        title=f"{subreddit} Sentiment vs. {asset} Close Price",
+        xaxis_rangeslider_visible=False,
+        xaxis=dict(domain=[0.1, 0.9]),
+        yaxis=dict(title="Sentiment", side="left"),
+        yaxis2=dict(title="Price", overlaying="y", side="right")
+    )
+    return fig
+
+# Every rerun records into its own recorder; LLM calls on worker threads report to it too
+timings = activate(Recorder())
+
+data = live_data().refresh()
+financial, cube = data.tables["financial"], data.tables["cube"]
+timings.lap("load_data")
 
 # Sidebar filters
 st.sidebar.header("Filters")
-assets = st.sidebar.multiselect("Select Assets", options=financial_df["asset"].unique(), default=financial_df["asset"].unique())
-subreddits = st.sidebar.multiselect("Select Subreddits", options=merged_df["subreddit"].unique(), default=merged_df["subreddit"].unique())
+assets = st.sidebar.multiselect("Select Assets", options=financial.partitions, default=financial.partitions)
+subreddits = st.sidebar.multiselect("Select Subreddits", options=cube.key_values("subreddit"), default=cube.key_values("subreddit"))
 date_range = st.sidebar.date_input("Select Date Range", [])
+# The cube built from merged_data alone (before the first rollup) only has day rows
+grain = st.sidebar.radio("Granularity", [g for g in GRANULARITIES if g in cube.key_values("grain")],
+                         format_func=GRANULARITIES.get)
+
+# Hourly prices and sentiment are reduced to what a chart of this width can show before reaching the browser
+st.sidebar.header("Chart Detail")
+downsample_method = st.sidebar.selectbox("Downsampling", list(DOWNSAMPLE_LABELS),
+                                         format_func=DOWNSAMPLE_LABELS.get)
+chart_width = st.sidebar.slider("Chart width (px)", min_value=400, max_value=2000, value=1000, step=100)
+report_payload = st.sidebar.checkbox("Report chart payload size")
+
+with st.sidebar:
+    data_version_status(data.number)
+
+st.sidebar.header("Developer")
+show_timings = st.sidebar.checkbox("Show timing breakdown",
+                                   help="Per-section timings for this rerun. Every rerun is appended to data/timings.jsonl.")
 
 # Filtered data
 if date_range and len(date_range) == 2:
     start_date = pd.to_datetime(date_range[0]).tz_localize(None)
     end_date = pd.to_datetime(date_range[1]).tz_localize(None)
-    df = merged_df[
-        (merged_df["asset"].isin(assets)) &
-        (merged_df["subreddit"].isin(subreddits)) &
-        (merged_df["Date"] >= start_date) & (merged_df["Date"] <= end_date)
-    ]
-    text_filtered = text_df[
-        (text_df["subreddit"].isin(subreddits)) &
-        (text_df["created_utc"] >= start_date) & (text_df["created_utc"] <= end_date)
-    ]
-    fin_filtered = financial_df[
-        (financial_df["asset"].isin(assets)) &
-        (financial_df["Date"] >= start_date) & (financial_df["Date"] <= end_date)
-    ]
+    df = slice_cube(cube, grain, subreddits, assets, start_date, end_date)
+    posts_by_subreddit = live_text().refresh().tables["text"].select(subreddits, start_date, end_date)
+    raw_prices = {asset: financial.slice(asset, start_date, end_date) for asset in assets}
 else:
-    df = merged_df[0:0]
-    text_filtered = text_df[0:0]
-    fin_filtered = financial_df[0:0]
+    df = slice_cube(cube, grain, [], [])
+    posts_by_subreddit = {}
+    raw_prices = {asset: financial.frame.iloc[0:0] for asset in assets}
+
+timings.lap("filter")
 
 # Header
 st.title("📉 Reddit Sentiment vs. Market Dashboard")
-st.write("Compare daily sentiment across subreddits against asset price changes.")
+st.write(f"Compare {'hourly' if grain == 'hour' else 'daily'} sentiment across subreddits against asset price changes.")
+if grain == "hour":
+    st.caption("Each hour's posts are paired with the first bar starting a set lag later (one hour by default); "
+               "posts made while a market is closed are paired with its next open.")
 
 # Summary Headline
 if len(assets) == 1 and len(subreddits) == 1:
-    avg_sentiment = df["avg_compound"].mean()
+    avg_sentiment = df["sum_compound"].sum() / df["n_posts"].sum()
     sentiment_trend = "turned bearish" if avg_sentiment < -0.05 else "turned bullish" if avg_sentiment > 0.05 else "remained neutral"
     st.markdown(f"### 📢 Summary: {assets[0]} prices vs sentiment in r/{subreddits[0]} — sentiment {sentiment_trend}.")
 
 # Summary from Groq
 st.subheader("📝 Summary of Sentiment and News")
-if not text_filtered.empty:
-    grouped = text_filtered.groupby("subreddit")
-    for name, group in grouped:
-        posts_df = group.sort_values("created_utc").copy()
-        if "text" not in posts_df.columns:
-            if "title" in posts_df.columns:
-                posts_df["text"] = posts_df["title"]
-            else:
-                st.warning(f"No usable text found for r/{name}.")
-                continue
-        posts_df.rename(columns={"title": "text"}, inplace=True)
-        summary = summarize_with_groq(posts_df, name)
+summary_mode = st.radio("Summarize", list(SUMMARY_MODES), horizontal=True)
+if posts_by_subreddit:
+    # Reserve a slot per subreddit so every summary renders in place as its tokens stream in
+    summary_slots = {}
+    for name in posts_by_subreddit:
         st.markdown(f"**Summary for r/{name}:**")
-        st.write(summary)
+        summary_slots[name] = st.empty()
+        summary_slots[name].caption("Generating summary...")
+
+    summaries = {name: "" for name in posts_by_subreddit}
+    for name, piece in stream_many(posts_by_subreddit, stream_fn=SUMMARY_MODES[summary_mode]):
+        summaries[name] += piece
+        summary_slots[name].markdown(summaries[name] + " ▌")
+    for name, summary in summaries.items():
+        summary_slots[name].markdown(summary)
+    cache_stats = summary_cache.stats()
+    st.caption(f"Summary cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, {cache_stats['entries']} stored")
+    if SUMMARY_MODES[summary_mode] is not None:
+        chunk_stats = chunk_cache.stats()
+        st.caption(f"Chunk summaries: {chunk_stats['hits']} reused, {chunk_stats['misses']} generated, "
+                   f"{chunk_stats['entries']} stored")
 else:
     st.info("No post data to summarize in this date range.")
 
+timings.lap("summaries")
+
 # Asset Price Over Time
 st.subheader("📈 Asset Price Over Time")
+# Downsampled once per asset and reused by every dual-axis chart below
+point_limit = point_budget(chart_width)
+price_series = {asset: downsample(data, "Date", "Close", point_limit, downsample_method)
+                for asset, data in raw_prices.items()}
+payload_before = payload_after = 0
 for asset in assets:
-    asset_data = fin_filtered[fin_filtered["asset"] == asset]
-    if not asset_data.empty:
-        fig_price = px.line(
-            asset_data,
-            x="Date",
-            y="Close",
-            title=f"{asset} Closing Price Over Time",
-            labels={"Close": "Price", "Date": "Date"},
-            markers=True
-        )
+    if not price_series[asset].empty:
+        fig_price = go.Figure(price_trace(price_series[asset], asset))
+        fig_price.update_layout(title=f"{asset} Closing Price Over Time", xaxis_title="Date", yaxis_title="Price",
+                                xaxis_rangeslider_visible=False)
         st.plotly_chart(fig_price, use_container_width=True)
+        if report_payload:
+            fig_raw = go.Figure(price_trace(raw_prices[asset], asset))
+            fig_raw.update_layout(title=f"{asset} Closing Price Over Time", xaxis_title="Date", yaxis_title="Price")
+            payload_before += payload_bytes(fig_raw)
+            payload_after += payload_bytes(fig_price)
+
+raw_points = sum(len(data) for data in raw_prices.values())
+sent_points = sum(len(data) for data in price_series.values())
+st.caption(f"Hourly price points sent: {sent_points:,} of {raw_points:,} "
+           f"(budget {point_limit} per series, {DOWNSAMPLE_LABELS[downsample_method]})")
+if report_payload and payload_before:
+    st.caption(f"Price chart payload: {payload_before / 1024:,.0f} KiB before, {payload_after / 1024:,.0f} KiB after downsampling")
+
+timings.lap("charts.price")
 
 # Sentiment Over Time
 st.subheader("📊 Sentiment Over Time")
-sentiment_over_time = df.groupby(["Date", "subreddit"])["avg_compound"].mean().reset_index()
+sentiment_over_time = combine(df, ["Date", "subreddit"])
+if not sentiment_over_time.empty:
+    sentiment_over_time = pd.concat([sentiment_series(rows, point_limit, downsample_method)
+                                     for _, rows in sentiment_over_time.groupby("subreddit")], ignore_index=True)
 fig2 = px.line(sentiment_over_time, x="Date", y="avg_compound", color="subreddit",
                labels={"avg_compound": "Sentiment"}, markers=True)
 st.plotly_chart(fig2, use_container_width=True)
 
+timings.lap("charts.sentiment")
+
 # Sentiment Emotion Breakdown and Volume
 st.subheader("🧪 Sentiment Emotion Mix and Volume")
 expected_cols = ["avg_pos", "avg_neg", "avg_neu", "Volume"]
-for col in expected_cols:
-    if col in df.columns:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
-
 missing_cols = [col for col in expected_cols if col not in df.columns]
 if missing_cols:
     st.warning(f"Missing columns for emotion/volume analysis: {', '.join(missing_cols)}")
 else:
-    sentiment_components = df.groupby("Date").agg({
-        "avg_pos": "mean",
-        "avg_neg": "mean",
-        "avg_neu": "mean",
-        "Volume": "mean"
-    }).reset_index()
+    sentiment_components = combine(df, ["Date"])
 
     fig_emotion = go.Figure()
     fig_emotion.add_trace(go.Scatter(x=sentiment_components["Date"], y=sentiment_components["avg_pos"], name="Positive", stackgroup="one"))
@@ -132,25 +271,30 @@ else:
     )
     st.plotly_chart(fig_emotion, use_container_width=True)
 
+timings.lap("charts.emotion")
+
 # Sentiment vs Price (Dual Axis)
 st.subheader("🪙 Sentiment vs. Asset Price Over Time")
-for subreddit in subreddits:
-    for asset in assets:
-        sentiment_data = df[(df["subreddit"] == subreddit) & (df["asset"] == asset)]
-        price_data = fin_filtered[fin_filtered["asset"] == asset]
-        if not sentiment_data.empty and not price_data.empty:
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(x=sentiment_data["Date"], y=sentiment_data["avg_compound"], name=f"Sentiment ({subreddit})",
-                                     yaxis="y1", mode="lines+markers"))
-            fig.add_trace(go.Scatter(x=price_data["Date"], y=price_data["Close"], name=f"Close Price ({asset})",
-                                     yaxis="y2", mode="lines+markers"))
-            fig.update_layout(
-                title=f"{subreddit} Sentiment vs. {asset} Close Price",
-                xaxis=dict(domain=[0.1, 0.9]),
-                yaxis=dict(title="Sentiment", side="left"),
-                yaxis2=dict(title="Price", overlaying="y", side="right")
-            )
-            st.plotly_chart(fig, use_container_width=True)
+sentiment_by_pair = dict(tuple(df.groupby(["subreddit", "asset"])))
+pairs = [(subreddit, asset) for subreddit in subreddits for asset in assets
+         if (subreddit, asset) in sentiment_by_pair and not price_series[asset].empty]
+
+# Paged mode only builds and sends the figures on the current page
+grid_mode = st.radio("Show", ["One page at a time", "All pairs"], horizontal=True)
+visible_pairs = pairs
+if grid_mode == "One page at a time" and pairs:
+    per_page = st.select_slider("Charts per page", options=[2, 4, 6, 8], value=4)
+    n_pages = math.ceil(len(pairs) / per_page)
+    page = st.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, value=1)
+    visible_pairs = pairs[(page - 1) * per_page:page * per_page]
+    st.caption(f"Pairs {(page - 1) * per_page + 1}–{(page - 1) * per_page + len(visible_pairs)} of {len(pairs)}")
+
+for subreddit, asset in visible_pairs:
+    fig = dual_axis_figure(subreddit, asset, start_date, end_date, grain, downsample_method, chart_width, data.number,
+                           sentiment_by_pair[(subreddit, asset)], price_series[asset])
+    st.plotly_chart(fig, use_container_width=True)
+
+timings.lap("charts.dual_axis")
 
 # Sentiment vs. % Change (Scatter)
 st.subheader("📌 Sentiment vs. % Price Change")
@@ -158,3 +302,48 @@ st.write("Correlation between sentiment and asset price movement")
 fig1 = px.scatter(df, x="avg_compound", y="pct_change", color="subreddit",
                   labels={"avg_compound": "Avg Sentiment", "pct_change": "% Price Change"})
 st.plotly_chart(fig1, use_container_width=True)
+
+timings.lap("charts.scatter")
+
+# Lead/Lag Correlation (Heatmap)
+st.subheader("🔁 Sentiment Lead/Lag Correlation")
+st.write("Correlation of each subreddit's daily sentiment with each asset's return k days later "
+         "(lag 1 is the pairing used above; negative lags mean returns lead sentiment).")
+if date_range and len(date_range) == 2:
+    method = st.radio("Correlation method", METHODS, horizontal=True, format_func=str.title)
+    by_lag = lag_correlation_matrix(data.number, start_date, end_date, method, None, cube).select(subreddits, assets).by_lag()
+    if by_lag.dropna(how="all").empty:
+        st.info("Not enough overlapping days in this range to compute correlations.")
+    else:
+        fig_lag = px.imshow(by_lag, color_continuous_scale="RdBu", zmin=-1, zmax=1, aspect="auto",
+                            labels={"x": "Lag (days)", "y": "Pair", "color": "Correlation"})
+        fig_lag.update_layout(height=max(300, 22 * len(by_lag)), title="Correlation by Lag")
+        st.plotly_chart(fig_lag, use_container_width=True)
+
+        window = st.slider("Rolling window (days)", min_value=7, max_value=30, value=14)
+        lag = st.select_slider("Lag (days)", options=list(DEFAULT_LAGS), value=1)
+        rolling = lag_correlation_matrix(data.number, start_date, end_date, method, window, cube).select(subreddits, assets).over_time(lag)
+        fig_rolling = px.imshow(rolling, color_continuous_scale="RdBu", zmin=-1, zmax=1, aspect="auto",
+                                labels={"x": "Date", "y": "Pair", "color": "Correlation"})
+        fig_rolling.update_layout(height=max(300, 22 * len(rolling)),
+                                  title=f"Rolling {window}-Day Correlation at Lag {lag}")
+        st.plotly_chart(fig_rolling, use_container_width=True)
+else:
+    st.info("Select a date range to compute lead/lag correlations.")
+timings.lap("charts.lead_lag")
+
+# Every rerun is exported so regressions show up over time; the developer panel shows this one
+timings.export("dashboard", date_range=[str(day) for day in date_range], subreddits=len(subreddits),
+               assets=len(assets), summary_mode=summary_mode)
+if show_timings:
+    snapshot = timings.snapshot()
+    spans = pd.DataFrame.from_dict(snapshot["spans"], orient="index").rename_axis("section")
+    with st.sidebar.expander("⏱️ Timings", expanded=True):
+        st.caption(f"Rerun total: {snapshot['elapsed_s'] * 1000:,.0f} ms")
+        # Spans nested in a section add up over parallel calls; "max ms" is the longest single call
+        st.dataframe(spans.assign(ms=spans["total_s"] * 1000, max_ms=spans["max_s"] * 1000)[["calls", "ms", "max_ms"]]
+                     .round(1).rename(columns={"max_ms": "max ms"}))
+        for name, value in sorted(snapshot["counters"].items()):
+            st.caption(f"{name}: {value}")
+        for name, stats in sorted(snapshot["observations"].items()):
+            st.caption(f"{name}: {stats['count']} calls, mean {stats['mean']:.2f}s, p95 {stats['p95']:.2f}s")
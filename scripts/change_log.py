@@ -0,0 +1,64 @@
+import json
+import os
+
+import pandas as pd
+
+CHANGES_DIR = "data/changes"
+
+
+def _path(table: str, changes_dir: str = CHANGES_DIR) -> str:
+    # One file per table, so ingestion scripts running in parallel never write the same file
+    return os.path.join(changes_dir, f"{table}.json")
+
+
+def day_keys(df: pd.DataFrame, time_col: str, label_col: str) -> set[tuple[str, str]]:
+    """Distinct (YYYY-MM-DD, label) keys covered by the rows of `df`."""
+    if df is None or df.empty:
+        return set()
+    days = pd.to_datetime(df[time_col], utc=True, format="mixed").dt.strftime("%Y-%m-%d")
+    return set(zip(days, df[label_col].astype(str)))
+
+
+def key_months(keys: set[tuple[str, str]]) -> set[str]:
+    """Months (YYYY-MM) of the days in change keys: the store partitions those changes touch."""
+    return {day[:7] for day, _ in keys}
+
+
+def record_changes(table: str, keys: set[tuple[str, str]] | None = None, full: bool = False,
+                   changes_dir: str = CHANGES_DIR) -> None:
+    """
+    Add (day, label) keys to a table's pending change set.
+
+    Args:
+        table (str): Table the keys belong to (e.g. "reddit_sentiment").
+        keys (set | None): Changed (YYYY-MM-DD, subreddit/asset) keys.
+        full (bool): The whole table was rewritten; consumers should rebuild from scratch.
+        changes_dir (str): Directory holding the pending change files.
+    """
+    os.makedirs(changes_dir, exist_ok=True)
+    pending = load_changes(table, changes_dir)
+    pending["full"] = pending["full"] or full
+    pending["keys"] |= set(keys or ())
+
+    path = _path(table, changes_dir)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"full": pending["full"], "keys": sorted(pending["keys"])}, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def load_changes(table: str, changes_dir: str = CHANGES_DIR) -> dict:
+    """Return {"full": bool, "keys": set[(day, label)]} of changes not yet consumed."""
+    path = _path(table, changes_dir)
+    if not os.path.exists(path):
+        return {"full": False, "keys": set()}
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return {"full": bool(data.get("full")), "keys": {tuple(key) for key in data.get("keys", [])}}
+
+
+def clear_changes(table: str, changes_dir: str = CHANGES_DIR) -> None:
+    """Mark a table's pending changes as consumed."""
+    path = _path(table, changes_dir)
+    if os.path.exists(path):
+        os.remove(path)
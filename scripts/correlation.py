@@ -0,0 +1,197 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from scripts.rollup import combine
+
+DEFAULT_LAGS = range(-5, 6)
+METHODS = ("pearson", "spearman")
+MIN_PERIODS = 5
+
+
+@dataclass
+class LagCorrelations:
+    """
+    Sentiment/return correlations for every subreddit x asset pair and lag.
+
+    A lag of k pairs sentiment on day d with the return on day d + k, so lag 1 is
+    the pairing used by merged_data and negative lags mean returns lead sentiment.
+
+    `values` has shape (lags, subreddits, assets) for a full-range result, or
+    (lags, dates, subreddits, assets) for a rolling one, where each date holds the
+    correlation over the window ending on that day.
+    """
+    method: str
+    lags: list[int]
+    dates: pd.DatetimeIndex
+    subreddits: list[str]
+    assets: list[str]
+    values: np.ndarray
+    window: int | None = None
+
+    def select(self, subreddits, assets) -> "LagCorrelations":
+        """Restrict to the given subreddits and assets (an index lookup, nothing is recomputed)."""
+        sub_idx = [self.subreddits.index(s) for s in subreddits if s in self.subreddits]
+        asset_idx = [self.assets.index(a) for a in assets if a in self.assets]
+        values = self.values[..., sub_idx, :][..., asset_idx]
+        return LagCorrelations(self.method, self.lags, self.dates,
+                               [self.subreddits[i] for i in sub_idx], [self.assets[i] for i in asset_idx],
+                               values, self.window)
+
+    def pair_labels(self) -> list[str]:
+        return [f"r/{sub} × {asset}" for sub in self.subreddits for asset in self.assets]
+
+    def by_lag(self) -> pd.DataFrame:
+        """Full-range result as a (pair x lag) frame."""
+        flat = self.values.reshape(len(self.lags), -1).T
+        return pd.DataFrame(flat, index=self.pair_labels(), columns=self.lags)
+
+    def over_time(self, lag: int) -> pd.DataFrame:
+        """Rolling result at one lag as a (pair x date) frame."""
+        flat = self.values[self.lags.index(lag)].reshape(len(self.dates), -1).T
+        return pd.DataFrame(flat, index=self.pair_labels(), columns=self.dates)
+
+
+def daily_panels(rows: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Turn day-grain cube rows into calendar-aligned sentiment and return panels.
+
+    Args:
+        rows (pd.DataFrame): Day rows of the rollup cube (see scripts.rollup.slice_cube).
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: Daily mean sentiment indexed by the day the posts were
+            written (columns: subreddits) and daily returns indexed by trade date (columns: assets),
+            both reindexed to the same gap-free calendar.
+    """
+    if rows.empty:
+        empty = pd.DataFrame(index=pd.DatetimeIndex([], name="Date"))
+        return empty, empty
+    sentiment = combine(rows, ["Date", "subreddit"]).pivot(index="Date", columns="subreddit", values="avg_compound")
+    # Cube day rows are keyed by the trade date the sentiment feeds, one day after the posts
+    sentiment.index = sentiment.index - pd.Timedelta(days=1)
+    returns = rows.groupby(["Date", "asset"])["pct_change"].first().unstack("asset")
+
+    days = pd.date_range(min(sentiment.index.min(), returns.index.min()),
+                         max(sentiment.index.max(), returns.index.max()), freq="D", name="Date")
+    return sentiment.reindex(days).astype("float64"), returns.reindex(days).astype("float64")
+
+
+def _lagged(values: np.ndarray, lags: list[int]) -> np.ndarray:
+    """Stack copies of a (days, columns) array so out[i, t] = values[t + lags[i]], NaN-padded."""
+    n_days = values.shape[0]
+    out = np.full((len(lags),) + values.shape, np.nan)
+    for i, lag in enumerate(lags):
+        if abs(lag) >= n_days:
+            continue
+        if lag >= 0:
+            out[i, :n_days - lag] = values[lag:]
+        else:
+            out[i, -lag:] = values[:n_days + lag]
+    return out
+
+
+def _ranks(values: np.ndarray) -> np.ndarray:
+    """Ordinal ranks along the last axis, ignoring NaNs (which stay NaN)."""
+    order = np.argsort(values, axis=-1, kind="stable")  # NaNs sort last
+    ranks = np.empty_like(values)
+    np.put_along_axis(ranks, order, np.arange(values.shape[-1], dtype=values.dtype), axis=-1)
+    return np.where(np.isnan(values), np.nan, ranks)
+
+
+def _corr_from_sums(n, sx, sy, sxx, syy, sxy, min_periods: int) -> np.ndarray:
+    cov = n * sxy - sx * sy
+    var = (n * sxx - sx ** 2) * (n * syy - sy ** 2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = cov / np.sqrt(var)
+    corr[(n < min_periods) | ~(var > 0)] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+def _masked_sums(x: np.ndarray, y: np.ndarray, axis: int):
+    """Sums needed for Pearson over `axis`, using only positions where both x and y are present."""
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x = np.where(valid, x, 0.0)
+    y = np.where(valid, y, 0.0)
+    return (valid.sum(axis=axis), x.sum(axis=axis), y.sum(axis=axis),
+            (x * x).sum(axis=axis), (y * y).sum(axis=axis), (x * y).sum(axis=axis))
+
+
+def _rolling_pearson(x: np.ndarray, y: np.ndarray, window: int, min_periods: int) -> np.ndarray:
+    """Rolling Pearson along axis 1 from cumulative sums: O(days) regardless of the window."""
+    valid = ~(np.isnan(x) | np.isnan(y))
+    # Centering first keeps the cumulative sums small enough to avoid cancellation
+    x = np.where(valid, x - np.nanmean(x), 0.0)
+    y = np.where(valid, y - np.nanmean(y), 0.0)
+
+    def rolling_sum(values):
+        csum = np.cumsum(values, axis=1)
+        csum[:, window:] = csum[:, window:] - csum[:, :-window]
+        return csum
+
+    corr = _corr_from_sums(rolling_sum(valid.astype(np.float64)), rolling_sum(x), rolling_sum(y),
+                           rolling_sum(x * x), rolling_sum(y * y), rolling_sum(x * y), min_periods)
+    corr[:, :window - 1] = np.nan
+    return corr
+
+
+def lag_correlations(sentiment: pd.DataFrame, returns: pd.DataFrame, lags=DEFAULT_LAGS,
+                     method: str = "pearson", window: int | None = None,
+                     min_periods: int = MIN_PERIODS) -> LagCorrelations:
+    """
+    Correlate every subreddit's sentiment with every asset's returns at every lag in one batched pass.
+
+    Args:
+        sentiment (pd.DataFrame): Daily sentiment (dates x subreddits), see `daily_panels`.
+        returns (pd.DataFrame): Daily returns (dates x assets) on the same calendar.
+        lags: Day offsets to evaluate.
+        method (str): "pearson" or "spearman". Spearman uses ordinal ranks within each window.
+        window (int | None): Rolling window in days, or None for one correlation over the whole range.
+        min_periods (int): Fewest overlapping days needed for a correlation; fewer gives NaN.
+
+    Returns:
+        LagCorrelations: Correlation matrix for all pairs and lags.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown correlation method '{method}'. Available: {', '.join(METHODS)}")
+    lags = list(lags)
+    n_days = len(sentiment.index)
+    if n_days == 0 or sentiment.empty or returns.empty:
+        shape = (len(lags), sentiment.shape[1], returns.shape[1])
+        if window is not None:
+            shape = shape[:1] + (n_days,) + shape[1:]
+        return LagCorrelations(method, lags, sentiment.index, list(sentiment.columns), list(returns.columns),
+                               np.full(shape, np.nan), window)
+
+    # Broadcast layout: (lag, day, subreddit, asset)
+    x = sentiment.to_numpy(dtype=np.float64)[None, :, :, None]
+    y = _lagged(returns.to_numpy(dtype=np.float64), lags)[:, :, None, :]
+
+    if window is not None and window > n_days:
+        # No window fits in the range yet
+        values = np.full((len(lags), n_days, sentiment.shape[1], returns.shape[1]), np.nan)
+    elif window is None:
+        if method == "spearman":
+            x, y = np.broadcast_arrays(x, y)
+            valid = ~(np.isnan(x) | np.isnan(y))
+            x = _ranks(np.moveaxis(np.where(valid, x, np.nan), 1, -1))
+            y = _ranks(np.moveaxis(np.where(valid, y, np.nan), 1, -1))
+            values = _corr_from_sums(*_masked_sums(x, y, axis=-1), min_periods)
+        else:
+            values = _corr_from_sums(*_masked_sums(x, y, axis=1), min_periods)
+    elif method == "spearman":
+        # (lag, window end, subreddit, asset, day in window); ranks must be taken per window
+        x_win = sliding_window_view(x, window, axis=1)
+        y_win = sliding_window_view(y, window, axis=1)
+        valid = ~(np.isnan(x_win) | np.isnan(y_win))
+        x_win = _ranks(np.where(valid, x_win, np.nan))
+        y_win = _ranks(np.where(valid, y_win, np.nan))
+        values = np.full((len(lags), n_days) + valid.shape[2:4], np.nan)
+        values[:, window - 1:] = _corr_from_sums(*_masked_sums(x_win, y_win, axis=-1), min_periods)
+    else:
+        values = _rolling_pearson(x, y, window, min_periods)
+
+    return LagCorrelations(method, lags, sentiment.index, list(sentiment.columns), list(returns.columns),
+                           values, window)
@@ -0,0 +1,102 @@
+from datetime import timedelta
+
+import pandas as pd
+
+PRICE_AGGREGATIONS = {
+    "Open": "first",
+    "Close": "last",
+    "High": "max",
+    "Low": "min",
+    "Volume": "sum",
+    "pct_change": "sum"
+}
+DATE_COLUMNS = ["trade_date", "date", "target_date"]
+
+
+def fill_first_available(df: pd.DataFrame, base_col: str) -> pd.DataFrame:
+    """Fill `base_col` from legacy fallback columns such as `Open.1` when present."""
+    fallback_cols = [col for col in df.columns if col.startswith(base_col + ".")]
+    for col in fallback_cols:
+        df[base_col] = df[base_col].fillna(df[col])
+    return df
+
+
+def aggregate_sentiment(reddit_df: pd.DataFrame) -> pd.DataFrame:
+    """Aggregate per-post sentiment to daily means per subreddit, keyed to the next day's prices."""
+    reddit_df = reddit_df.copy()
+    reddit_df["date"] = pd.to_datetime(reddit_df["created_utc"]).dt.date
+    reddit_df["subreddit"] = reddit_df["subreddit"].astype(str)
+
+    daily_sentiment = reddit_df.groupby(["date", "subreddit"]).agg({
+        "compound": "mean",
+        "neg": "mean",
+        "neu": "mean",
+        "pos": "mean"
+    }).reset_index().rename(columns={
+        "compound": "avg_compound",
+        "neg": "avg_neg",
+        "neu": "avg_neu",
+        "pos": "avg_pos"
+    })
+    daily_sentiment["target_date"] = pd.to_datetime(daily_sentiment["date"]) + timedelta(days=1)
+    daily_sentiment["target_date"] = daily_sentiment["target_date"].dt.date
+    return daily_sentiment
+
+
+def aggregate_finance(finance_df: pd.DataFrame) -> pd.DataFrame:
+    """Aggregate hourly bars to daily bars per asset."""
+    finance_df = finance_df.copy()
+    # Older exports named the hourly timestamp column "Datetime"
+    time_col = "Datetime" if "Datetime" in finance_df.columns else "Date"
+    finance_df[time_col] = pd.to_datetime(finance_df[time_col])
+    finance_df["asset"] = finance_df["asset"].astype(str)
+
+    for col in ["Open", "Close", "High", "Low", "Volume"]:
+        if col in finance_df.columns:
+            finance_df = fill_first_available(finance_df, col)
+
+    # Extract date only from hourly datetime
+    finance_df["Date"] = finance_df[time_col].dt.date
+
+    aggregations = {col: how for col, how in PRICE_AGGREGATIONS.items() if col in finance_df.columns}
+    daily_finance = finance_df.groupby(["Date", "asset"]).agg(aggregations).reset_index()
+    daily_finance["trade_date"] = pd.to_datetime(daily_finance["Date"]).dt.date
+    return daily_finance
+
+
+def merge_daily(daily_finance: pd.DataFrame, daily_sentiment: pd.DataFrame) -> pd.DataFrame:
+    """Join each day's prices to the previous day's sentiment and drop unusable rows."""
+    merged = daily_finance.merge(
+        daily_sentiment,
+        left_on="trade_date",
+        right_on="target_date",
+        how="inner"
+    )
+
+    # Repair fallback columns if present (legacy columns)
+    merged = fill_first_available(merged, "Open")
+    merged = fill_first_available(merged, "Close")
+
+    # Add data quality flag
+    merged["data_quality"] = merged[["Open", "Close"]].notna().all(axis=1)
+    return merged
+
+
+def affected_trade_dates(sentiment_keys: set[tuple[str, str]], finance_keys: set[tuple[str, str]]) -> set:
+    """
+    Trade dates whose merged rows depend on the changed keys.
+
+    Sentiment for day d feeds trade date d + 1; prices for day D feed trade date D.
+    """
+    dates = {pd.Timestamp(day).date() + timedelta(days=1) for day, _ in sentiment_keys}
+    dates |= {pd.Timestamp(day).date() for day, _ in finance_keys}
+    return dates
+
+
+def format_date_columns(merged: pd.DataFrame) -> pd.DataFrame:
+    """Store calendar-date columns as YYYY-MM-DD strings, matching what a CSV round trip produces."""
+    merged = merged.copy()
+    for col in DATE_COLUMNS:
+        if col in merged.columns:
+            merged[col] = pd.to_datetime(merged[col]).dt.strftime("%Y-%m-%d")
+    return merged
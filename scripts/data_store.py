@@ -0,0 +1,209 @@
+import os
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+STORE_DIR = "data/store"
+PARTITION_COL = "month"
+PARTITION_FORMAT = "%Y-%m"
+CATEGORICAL_COLS = ["subreddit", "asset", "ticker"]
+
+# Timestamp column each table is partitioned on (None: unpartitioned), and the CSV it replaces
+# (None: the table only exists in the store)
+TABLES = {
+    "financial_data": {"time_col": "Date", "csv": "data/financial_data.csv"},
+    "reddit_sentiment": {"time_col": "created_utc", "csv": "data/reddit_sentiment.csv"},
+    "reddit_text": {"time_col": "created_utc", "csv": "data/reddit_text.csv"},
+    "texts": {"time_col": None, "csv": "data/texts.csv"},
+    "merged_data": {"time_col": "Date", "csv": "data/merged_data.csv"},
+    "rollup": {"time_col": "Date", "csv": None},
+}
+
+# Month partitions keep files large enough to read efficiently while still pruning by date range
+_PARTITIONING = ds.partitioning(pa.schema([(PARTITION_COL, pa.string())]), flavor="hive")
+
+
+def table_path(name: str, store_dir: str = STORE_DIR) -> str:
+    return os.path.join(store_dir, name)
+
+
+def has_table(name: str, store_dir: str = STORE_DIR) -> bool:
+    return os.path.isdir(table_path(name, store_dir))
+
+
+def _normalize(df: pd.DataFrame, time_col: str | None) -> pd.DataFrame:
+    """Parse the timestamp column to tz-naive UTC and make label columns categorical."""
+    df = df.copy()
+    if time_col is not None:
+        times = pd.to_datetime(df[time_col], utc=True, format="mixed")
+        df[time_col] = times.dt.tz_localize(None)
+    for col in CATEGORICAL_COLS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    return df
+
+
+def write_table(df: pd.DataFrame, name: str, store_dir: str = STORE_DIR, overwrite: bool = True) -> str:
+    """
+    Write a frame to the columnar store as Parquet, partitioned by calendar month.
+
+    Args:
+        df (pd.DataFrame): Frame to store. Must contain the table's timestamp column.
+        name (str): Table name (one of TABLES).
+        store_dir (str): Root directory of the store.
+        overwrite (bool): Replace the whole table. Otherwise only the months present in `df` are replaced.
+
+    Returns:
+        str: Path of the table directory.
+    """
+    time_col = TABLES[name]["time_col"]
+    path = table_path(name, store_dir)
+    if overwrite and os.path.isdir(path):
+        shutil.rmtree(path)
+    os.makedirs(path, exist_ok=True)
+
+    df = _normalize(df, time_col)
+    if time_col is None:
+        # Written under a hidden name and renamed, so the file is replaced rather than rewritten
+        # in place (data snapshots hard-link it, see live_store.py) and readers never see it half-written
+        tmp_path = os.path.join(path, ".part-0.parquet.tmp")
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp_path)
+        os.replace(tmp_path, os.path.join(path, "part-0.parquet"))
+        return path
+
+    df[PARTITION_COL] = df[time_col].dt.strftime(PARTITION_FORMAT)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_to_dataset(
+        table,
+        root_path=path,
+        partitioning=_PARTITIONING,
+        existing_data_behavior="delete_matching"
+    )
+    return path
+
+
+def write_months(df: pd.DataFrame, name: str, months, store_dir: str = STORE_DIR) -> str:
+    """
+    Replace only the given month partitions (YYYY-MM) of a table with the rows of `df` in those months.
+
+    Months with no rows left in `df` are removed, so the table matches a full rewrite; the
+    other partitions are left untouched.
+
+    Returns:
+        str: Path of the table directory.
+    """
+    time_col = TABLES[name]["time_col"]
+    months = set(months)
+    row_months = pd.to_datetime(df[time_col], utc=True, format="mixed").dt.strftime(PARTITION_FORMAT)
+    rows = df[row_months.isin(months)]
+    path = table_path(name, store_dir)
+    if not rows.empty:
+        write_table(rows, name, store_dir, overwrite=False)
+    for month in months - set(row_months[row_months.isin(months)]):
+        shutil.rmtree(os.path.join(path, f"{PARTITION_COL}={month}"), ignore_errors=True)
+    return path
+
+
+def read_table(name: str, columns: list[str] | None = None, start=None, end=None,
+               store_dir: str = STORE_DIR, filter=None) -> pd.DataFrame:
+    """
+    Read a table from the columnar store, touching only the requested columns and months.
+
+    Args:
+        name (str): Table name (one of TABLES).
+        columns (list[str] | None): Columns to load. Columns missing from the table are skipped.
+        start, end: Optional inclusive bounds on the table's timestamp column.
+        store_dir (str): Root directory of the store.
+        filter (pyarrow.dataset.Expression | None): Extra row filter pushed down to the scan.
+
+    Returns:
+        pd.DataFrame: Requested rows with categorical label columns and tz-naive timestamps.
+    """
+    time_col = TABLES[name]["time_col"]
+    dataset = ds.dataset(table_path(name, store_dir), format="parquet", partitioning=_PARTITIONING)
+    available = [field for field in dataset.schema.names if field != PARTITION_COL]
+    if columns is not None:
+        columns = [col for col in columns if col in available]
+    else:
+        columns = available
+
+    # Month bounds prune whole partitions; timestamp bounds trim rows inside the edge months
+    filters = filter
+    if time_col is None:
+        start = end = None
+    if start is not None:
+        start = pd.Timestamp(start)
+        start_filter = ds.field(PARTITION_COL) >= start.strftime(PARTITION_FORMAT)
+        start_filter &= ds.field(time_col) >= pa.scalar(start.to_pydatetime(), pa.timestamp("ns"))
+        filters = start_filter if filters is None else filters & start_filter
+    if end is not None:
+        end = pd.Timestamp(end)
+        end_filter = ds.field(PARTITION_COL) <= end.strftime(PARTITION_FORMAT)
+        end_filter &= ds.field(time_col) <= pa.scalar(end.to_pydatetime(), pa.timestamp("ns"))
+        filters = end_filter if filters is None else filters & end_filter
+
+    table = dataset.to_table(columns=columns, filter=filters)
+    return table.to_pandas()
+
+
+def read_months(name: str, months, columns: list[str] | None = None, store_dir: str = STORE_DIR) -> pd.DataFrame:
+    """Read only the given month partitions (YYYY-MM) of a table; months need not be contiguous."""
+    return read_table(name, columns, store_dir=store_dir, filter=ds.field(PARTITION_COL).isin(sorted(months)))
+
+
+def read_csv_table(name: str, columns: list[str] | None = None) -> pd.DataFrame:
+    """Read a table from its legacy CSV with the same typing as the store."""
+    time_col = TABLES[name]["time_col"]
+    usecols = None if columns is None else (lambda col: col in columns)
+    df = pd.read_csv(TABLES[name]["csv"], usecols=usecols)
+    return _normalize(df, time_col)
+
+
+def load_table(name: str, columns: list[str] | None = None, start=None, end=None,
+               store_dir: str = STORE_DIR) -> pd.DataFrame:
+    """Read a table from the store, falling back to its CSV when the store has not been built yet."""
+    if has_table(name, store_dir):
+        return read_table(name, columns, start, end, store_dir)
+
+    df = read_csv_table(name, columns)
+    time_col = TABLES[name]["time_col"]
+    if time_col is not None and start is not None:
+        df = df[df[time_col] >= pd.Timestamp(start)]
+    if time_col is not None and end is not None:
+        df = df[df[time_col] <= pd.Timestamp(end)]
+    return df
+
+
+def attach_texts(posts_df: pd.DataFrame, store_dir: str = STORE_DIR) -> pd.DataFrame:
+    """
+    Add the `text` column to posts that reference their body by `text_id`.
+
+    Only the texts referenced by `posts_df` are read. Frames that already carry
+    their text (older exports) are returned unchanged.
+    """
+    if "text" in posts_df.columns or "text_id" not in posts_df.columns:
+        return posts_df
+    ids = posts_df["text_id"].dropna().unique().tolist()
+    if has_table("texts", store_dir):
+        texts = read_table("texts", ["text_id", "text"], store_dir=store_dir, filter=ds.field("text_id").isin(ids))
+    elif os.path.exists(TABLES["texts"]["csv"]):
+        texts = read_csv_table("texts", ["text_id", "text"])
+        texts = texts[texts["text_id"].isin(ids)]
+    else:
+        return posts_df.assign(text=pd.NA)
+    return posts_df.merge(texts, on="text_id", how="left")
+
+
+if __name__ == "__main__":
+    # Build the store from the existing CSVs without refetching anything
+    for table_name, spec in TABLES.items():
+        if spec["csv"] is None:
+            continue
+        if not os.path.exists(spec["csv"]):
+            print(f"⚠️ {spec['csv']} not found, skipping {table_name}.")
+            continue
+        out = write_table(read_csv_table(table_name), table_name)
+        print(f"✅ {spec['csv']} → {out}")
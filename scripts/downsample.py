@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+
+METHODS = ("lttb", "minmax", "ohlc", "none")
+# Candle widths tried in order until the series fits the point budget
+OHLC_RULES = ["1h", "2h", "4h", "6h", "12h", "1D", "2D", "7D"]
+
+
+def point_budget(width_px: int, px_per_point: float = 2.0, minimum: int = 50) -> int:
+    """Points worth sending for a chart `width_px` wide; more than one point per couple of pixels is invisible."""
+    return max(minimum, int(width_px / px_per_point))
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: pick `n_out` points that preserve the visual shape of a series.
+
+    The first and last points are always kept; every bucket in between contributes the point
+    forming the largest triangle with the previously kept point and the next bucket's mean.
+
+    Args:
+        x (np.ndarray): Monotonic x values (numeric).
+        y (np.ndarray): y values without NaNs.
+        n_out (int): Number of points to keep.
+
+    Returns:
+        np.ndarray: Sorted positions of the kept points.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Bucket i spans [edges[i], edges[i + 1]); the first and last points sit outside the buckets
+    edges = (np.arange(n_out - 1) * (n - 2) / (n_out - 2)).astype(np.int64) + 1
+    edges = np.append(edges, n)
+    next_mean_x = np.add.reduceat(x, edges[1:-1]) / np.diff(edges[1:])
+    next_mean_y = np.add.reduceat(y, edges[1:-1]) / np.diff(edges[1:])
+
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        area = np.abs((x[a] - next_mean_x[i]) * (y[start:end] - y[a])
+                      - (x[a] - x[start:end]) * (next_mean_y[i] - y[a]))
+        a = start + int(np.argmax(area))
+        kept[i + 1] = a
+    return kept
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """Keep the minimum and maximum of each of `n_out // 2` equal-count buckets, so spikes survive."""
+    n = len(y)
+    n_buckets = n_out // 2
+    if n_buckets < 1 or n_out >= n:
+        return np.arange(n)
+    bucket = np.arange(n) * n_buckets // n
+    positions = pd.Series(y).groupby(bucket)
+    kept = np.concatenate([positions.idxmin().to_numpy(), positions.idxmax().to_numpy(), [0, n - 1]])
+    return np.unique(kept)
+
+
+def resample_ohlc(df: pd.DataFrame, x_col: str, y_col: str, n_out: int) -> pd.DataFrame:
+    """
+    Resample a price series to Open/High/Low/Close candles, using the finest candle width that fits `n_out`.
+
+    Returns:
+        pd.DataFrame: Columns x_col, Open, High, Low, Close.
+    """
+    series = df.set_index(x_col)[y_col].dropna().sort_index()
+    if series.empty:
+        return pd.DataFrame(columns=[x_col, "Open", "High", "Low", "Close"])
+    span = series.index.max() - series.index.min()
+    rule = next((r for r in OHLC_RULES if span / pd.Timedelta(r) < n_out), OHLC_RULES[-1])
+    candles = series.resample(rule).ohlc().dropna()
+    candles.columns = ["Open", "High", "Low", "Close"]
+    return candles.rename_axis(x_col).reset_index()
+
+
+def downsample(df: pd.DataFrame, x_col: str, y_col: str, n_out: int, method: str = "lttb") -> pd.DataFrame:
+    """
+    Reduce one series to about `n_out` points before it is handed to Plotly.
+
+    Args:
+        df (pd.DataFrame): Rows of a single series, sorted or not.
+        x_col (str): Time column.
+        y_col (str): Value column.
+        n_out (int): Point budget (see `point_budget`).
+        method (str): "lttb", "minmax", "ohlc" (candles; see `resample_ohlc`) or "none".
+
+    Returns:
+        pd.DataFrame: The kept rows of `df`, or candles for "ohlc".
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown downsampling method '{method}'. Available: {', '.join(METHODS)}")
+    if method == "ohlc":
+        return resample_ohlc(df, x_col, y_col, n_out)
+    df = df.dropna(subset=[y_col]).sort_values(x_col)
+    if method == "none" or len(df) <= n_out:
+        return df
+    y = df[y_col].to_numpy(dtype=np.float64)
+    if method == "lttb":
+        x = pd.to_datetime(df[x_col]).to_numpy().astype(np.int64).astype(np.float64)
+        kept = lttb_indices(x, y, n_out)
+    else:
+        kept = minmax_indices(y, n_out)
+    return df.iloc[kept]
+
+
+def payload_bytes(fig) -> int:
+    """Size of the JSON Plotly sends to the browser for `fig`."""
+    return len(fig.to_json().encode("utf-8"))
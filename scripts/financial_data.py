@@ -1,8 +1,26 @@
-import yfinance as yf
 import pandas as pd
 import os
+import sys
+import argparse
 from datetime import datetime, timedelta, timezone
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts.change_log import day_keys, key_months, record_changes
+from scripts.data_store import has_table, write_months, write_table
+from scripts.instrumentation import export, lap
+from scripts.market_data import (
+    FixtureTransport, YahooTransport, last_bar_times, normalize_bars, save_snapshots, upsert_bars
+)
+
+parser = argparse.ArgumentParser(description="Fetch hourly asset prices from Yahoo Finance.")
+parser.add_argument("--incremental", action="store_true",
+                    help="Only fetch bars after the last stored bar and upsert them into the existing CSV.")
+parser.add_argument("--snapshot-rate", type=float, default=0.0,
+                    help="Share of tickers whose raw download is saved to data/debug_snapshots (0-1).")
+parser.add_argument("--fixtures", metavar="DIR",
+                    help="Read raw_<ticker>.csv files from DIR instead of calling Yahoo Finance.")
+args = parser.parse_args()
+
 # Define assets and tickers
 assets = {
     "S&P 500": "^GSPC",
@@ -11,85 +29,79 @@ assets = {
     "Gold": "GC=F",
     "Crude Oil": "CL=F"
 }
+output_path = "data/financial_data.csv"
+transport = FixtureTransport(args.fixtures) if args.fixtures else YahooTransport()
 
 # Set date range: last 90 days
 end_date = datetime.now(timezone.utc)
 start_date = end_date - timedelta(days=90)
-
-# Prepare output directory
-os.makedirs("data/debug_snapshots", exist_ok=True)
-
-# Download and label data
+window_start = start_date
+
+# Incremental runs start from the oldest "latest bar" across assets
+existing = None
+if args.incremental and os.path.exists(output_path):
+    existing = pd.read_csv(output_path, parse_dates=["Date"])
+    latest = last_bar_times(existing, assets)
+    if all(ts is not None for ts in latest.values()):
+        start_date = max(start_date, min(latest.values()).tz_localize(timezone.utc))
+        print(f"🔁 Incremental fetch from {start_date:%Y-%m-%d %H:%M} UTC")
+    else:
+        print("⚠️ Some assets have no stored bars, fetching the full window.")
+
+# Download every ticker in one batched request
+tickers = list(assets.values())
+print(f"\n📥 Fetching {len(tickers)} tickers: {', '.join(tickers)}")
+try:
+    frames = transport.download(tickers, start_date, end_date, interval="1h")
+except Exception as e:
+    print(f"❌ Error fetching tickers: {e}")
+    frames = {}
+
+lap("fetch")
+for path in save_snapshots(frames, rate=args.snapshot_rate):
+    print(f"📁 Raw snapshot saved to: {path}")
+
+# Normalize and label data
 all_data = []
-
 for asset_name, ticker in assets.items():
-    print(f"\n📥 Fetching {asset_name} ({ticker})")
-
-    try:
-        df = yf.download(
-            ticker,
-            start=start_date.strftime("%Y-%m-%d"),
-            end=end_date.strftime("%Y-%m-%d"),
-            interval="1h",
-            progress=False,
-            auto_adjust=False  # disable auto-adjust warning
-        )
-
-        if df.empty:
-            print(f"⚠️ No data returned for {asset_name}, skipping.")
-            continue
-
-        df.reset_index(inplace=True)
-
-        # Flatten multilevel columns if needed
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = [col[0] if isinstance(col, tuple) else col for col in df.columns]
-
-        # Debug: print column names and snapshot
-        print(f"🧪 Flattened columns: {list(df.columns)}")
-        print(df.head(2))
-
-
-        # Save raw snapshot
-        debug_path = f"data/debug_snapshots/raw_{ticker.replace('=', '').replace('^', '')}.csv"
-        df.to_csv(debug_path, index=False)
-        print(f"📁 Raw snapshot saved to: {debug_path}")
-
-        # Normalize date column
-        if "Datetime" in df.columns:
-            df.rename(columns={"Datetime": "Date"}, inplace=True)
-        elif "index" in df.columns:
-            df.rename(columns={"index": "Date"}, inplace=True)
-
-        required_cols = {"Date", "Open", "Close"}
-        missing_cols = required_cols - set(df.columns)
-        if missing_cols:
-            print(f"⚠️ Missing required columns for {asset_name}: {missing_cols}")
-            continue
-
-        df["Date"] = pd.to_datetime(df["Date"]).dt.floor("H").dt.tz_localize(None)
-        df["asset"] = asset_name
-        df["ticker"] = ticker
-        df["pct_change"] = df["Close"].pct_change()
-
-        # Keep only necessary columns
-        cleaned = df[["Date", "Open", "Close", "pct_change", "asset", "ticker"]].copy()
+    df = frames.get(ticker)
+    if df is None or df.empty:
+        print(f"⚠️ No data returned for {asset_name}, skipping.")
+        continue
+    cleaned = normalize_bars(df, asset_name, ticker)
+    if cleaned is not None:
         all_data.append(cleaned)
 
-    except Exception as e:
-        print(f"❌ Error fetching {asset_name}: {e}")
+lap("normalize")
 
 # Save final merged CSV
-if all_data:
-    final_df = pd.concat(all_data, ignore_index=True)
-    final_df.drop_duplicates(subset=["Date", "asset"], inplace=True)
-    final_df.dropna(subset=["Open", "Close"], inplace=True)
+if all_data or existing is not None:
+    new_bars = pd.concat(all_data, ignore_index=True) if all_data else None
+    final_df = upsert_bars(existing, new_bars, window_start=window_start)
 
     os.makedirs("data", exist_ok=True)
-    final_df.to_csv("data/financial_data.csv", index=False)
-
-    print("\n✅ Final dataset saved to data/financial_data.csv")
-    print(f"📊 Total rows: {len(final_df)}")
+    final_df.to_csv(output_path, index=False)
+    if existing is not None:
+        # Fetched bars and bars that left the retention window both change their day's aggregates
+        dropped = existing[pd.to_datetime(existing["Date"]) < window_start.replace(tzinfo=None)]
+        # An asset that lost older bars has no previous close for its first kept bar, whose pct_change is now NaN
+        first_kept = final_df[final_df["asset"].isin(dropped["asset"].astype(str))].groupby("asset").head(1)
+        changes = day_keys(new_bars, "Date", "asset") | day_keys(dropped, "Date", "asset") | \
+            day_keys(first_kept, "Date", "asset")
+        record_changes("financial_data", changes)
+    else:
+        record_changes("financial_data", full=True)
+    if existing is not None and has_table("financial_data"):
+        # Only the months holding changed bars are rewritten, so data versions see just those as changed
+        store_path = write_months(final_df, "financial_data", key_months(changes))
+    else:
+        store_path = write_table(final_df, "financial_data")
+
+    print(f"\n✅ Final dataset saved to {output_path}")
+    print(f"🗄️ Columnar store written to {store_path}")
+    print(f"📊 Total rows: {len(final_df)} ({0 if new_bars is None else len(new_bars)} fetched)")
     print(f"📈 Assets: {final_df['asset'].value_counts().to_dict()}")
+    lap("write")
 else:
     print("❌ No valid data fetched for any asset.")
+export("financial_data", incremental=existing is not None, tickers=len(frames))
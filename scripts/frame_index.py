@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+
+class FrameIndex:
+    """
+    Read-only frame partitioned by key columns and sorted by time within each partition.
+
+    Every partition (one subreddit, one asset, one (grain, subreddit, asset) cube cell...) is a
+    contiguous block of rows, so a date range resolves to slice bounds with a binary search over
+    the block's timestamps: O(log n + k) per lookup instead of a boolean mask over every row.
+    Single-partition lookups return `iloc` slices that share memory with the indexed frame;
+    callers must not modify them in place, since one instance is shared across reruns and sessions.
+
+    Args:
+        df (pd.DataFrame): Rows to index.
+        keys (str | list[str]): Partition column, or columns (partition keys are then tuples).
+        time_col (str): Timestamp column; naive datetimes.
+    """
+
+    def __init__(self, df: pd.DataFrame, keys: str | list[str], time_col: str):
+        self.keys = keys
+        self.time_col = time_col
+        key_cols = [keys] if isinstance(keys, str) else list(keys)
+        self.frame = df.sort_values([*key_cols, time_col], kind="stable").reset_index(drop=True)
+        positions = self.frame.groupby(keys, observed=True, sort=True).indices
+        self._bounds = {key: (int(pos[0]), int(pos[-1]) + 1) for key, pos in positions.items()}
+        self._times = self.frame[time_col].to_numpy()
+
+    @property
+    def partitions(self) -> list:
+        """Partition keys, sorted."""
+        return list(self._bounds)
+
+    def key_values(self, col: str) -> list:
+        """Distinct values of one key column, sorted."""
+        if isinstance(self.keys, str):
+            return self.partitions
+        level = list(self.keys).index(col)
+        return sorted({key[level] for key in self._bounds})
+
+    def bounds(self, key, start=None, end=None) -> tuple[int, int]:
+        """Row positions [lo, hi) of `key`'s rows with start <= time <= end."""
+        if key not in self._bounds:
+            return 0, 0
+        first, last = self._bounds[key]
+        times = self._times[first:last]
+        lo = first + int(np.searchsorted(times, _as_datetime64(start), side="left")) if start is not None else first
+        hi = first + int(np.searchsorted(times, _as_datetime64(end), side="right")) if end is not None else last
+        return lo, max(lo, hi)
+
+    def slice(self, key, start=None, end=None) -> pd.DataFrame:
+        """Rows of one partition in the inclusive date range, oldest first, as a view."""
+        lo, hi = self.bounds(key, start, end)
+        return self.frame.iloc[lo:hi]
+
+    def select(self, keys, start=None, end=None) -> dict:
+        """Non-empty slices for each of `keys`, keyed by partition."""
+        slices = {key: self.slice(key, start, end) for key in keys}
+        return {key: rows for key, rows in slices.items() if not rows.empty}
+
+    def take(self, keys, start=None, end=None) -> pd.DataFrame:
+        """Rows of several partitions in the inclusive date range, gathered into one frame (a copy)."""
+        ranges = [self.bounds(key, start, end) for key in keys]
+        positions = [np.arange(lo, hi) for lo, hi in ranges if hi > lo]
+        if not positions:
+            return self.frame.iloc[0:0]
+        return self.frame.take(np.concatenate(positions)).reset_index(drop=True)
+
+    def memory_bytes(self) -> int:
+        return int(self.frame.memory_usage(deep=True).sum())
+
+
+def _as_datetime64(value) -> np.datetime64:
+    """Naive UTC datetime64 to compare against the sorted time column."""
+    value = pd.Timestamp(value)
+    if value.tzinfo is not None:
+        value = value.tz_convert(None)
+    return value.to_datetime64()
@@ -0,0 +1,133 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from datetime import datetime, timezone
+
+import numpy as np
+
+TIMINGS_PATH = "data/timings.jsonl"
+
+
+class Recorder:
+    """
+    Thread-safe collector of timed spans, counters and observed values (e.g. LLM latencies).
+
+    Spans with the same name are aggregated into call count, total and max seconds, so a
+    recorder stays small however often a hot path runs. Laps split a run into consecutive
+    sections; spans can time phases nested inside them, including on worker threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spans = {}
+        self._counters = {}
+        self._observations = {}
+        self._started = self._last_lap = time.perf_counter()
+
+    def add_span(self, name: str, seconds: float) -> None:
+        with self._lock:
+            calls, total, longest = self._spans.get(name, (0, 0.0, 0.0))
+            self._spans[name] = (calls + 1, total + seconds, max(longest, seconds))
+
+    @contextmanager
+    def span(self, name: str):
+        """Time the enclosed block under `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_span(name, time.perf_counter() - start)
+
+    def lap(self, name: str) -> None:
+        """Record the time since the previous lap (or since the recorder was created) under `name`."""
+        now = time.perf_counter()
+        with self._lock:
+            start, self._last_lap = self._last_lap, now
+        self.add_span(name, now - start)
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            self._observations.setdefault(name, []).append(value)
+
+    def snapshot(self) -> dict:
+        """
+        Return {"elapsed_s", "spans", "counters", "observations"} with spans and observations summarized.
+
+        `elapsed_s` runs up to the last lap, so it is the total of the laps; nested spans overlap them.
+        """
+        with self._lock:
+            elapsed = self._last_lap - self._started
+            spans = dict(self._spans)
+            counters = dict(self._counters)
+            observations = {name: list(values) for name, values in self._observations.items()}
+        return {
+            "elapsed_s": round(elapsed, 6),
+            "spans": {name: {"calls": calls, "total_s": round(total, 6), "max_s": round(longest, 6)}
+                      for name, (calls, total, longest) in spans.items()},
+            "counters": counters,
+            "observations": {name: _summarize(values) for name, values in observations.items()},
+        }
+
+    def export(self, source: str, path: str = TIMINGS_PATH, **fields) -> None:
+        """Append the snapshot as one JSON line tagged with `source`, a timestamp and `fields`."""
+        record = {"source": source, "at": datetime.now(timezone.utc).isoformat(timespec="seconds"), **fields,
+                  **self.snapshot()}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, default=str) + "\n")
+
+
+def _summarize(values: list[float]) -> dict:
+    values = np.asarray(values, dtype=float)
+    return {"count": int(len(values)), "mean": round(float(values.mean()), 6),
+            "p50": round(float(np.percentile(values, 50)), 6), "p95": round(float(np.percentile(values, 95)), 6),
+            "max": round(float(values.max()), 6)}
+
+
+# Scripts record into the process-wide recorder; the dashboard activates a fresh one per rerun
+default_recorder = Recorder()
+_active = ContextVar("recorder", default=default_recorder)
+
+
+def current() -> Recorder:
+    return _active.get()
+
+
+def activate(recorder: Recorder) -> Recorder:
+    """Make `recorder` the one `span`/`count`/`observe` report to in the current context."""
+    _active.set(recorder)
+    return recorder
+
+
+def span(name: str):
+    return current().span(name)
+
+
+def lap(name: str) -> None:
+    current().lap(name)
+
+
+def count(name: str, n: int = 1) -> None:
+    current().count(name, n)
+
+
+def observe(name: str, value: float) -> None:
+    current().observe(name, value)
+
+
+def submit(executor, fn, *args, **kwargs):
+    """`executor.submit` that runs `fn` under the caller's active recorder."""
+    return executor.submit(copy_context().run, fn, *args, **kwargs)
+
+
+def export(source: str, path: str = TIMINGS_PATH, **fields) -> None:
+    current().export(source, path, **fields)
@@ -0,0 +1,255 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+
+from scripts.data_store import PARTITION_COL, STORE_DIR, TABLES, has_table, read_table
+
+SNAPSHOT_DIR = "data/snapshots"
+VERSION_PATH = "data/snapshots/CURRENT.json"
+# Older snapshots stay readable for sessions still loading from them
+KEEP_SNAPSHOTS = 3
+_SNAPSHOT_NAME = re.compile(r"^v(\d+)$")
+
+
+def partition_signatures(store_dir: str = STORE_DIR) -> dict[str, dict[str, str]]:
+    """
+    Map each table to {partition directory: signature} ("" for unpartitioned tables).
+
+    Store writes replace a month's files with new, uniquely named ones, so the file names,
+    sizes and modification times identify a partition's contents without reading them.
+    """
+    signatures = {}
+    for name in TABLES:
+        path = os.path.join(store_dir, name)
+        if not os.path.isdir(path):
+            continue
+        table = {}
+        for root, _, files in os.walk(path):
+            if not files:
+                continue
+            digest = hashlib.blake2b(digest_size=12)
+            for file_name in sorted(files):
+                stat = os.stat(os.path.join(root, file_name))
+                digest.update(f"{file_name}:{stat.st_size}:{stat.st_mtime_ns};".encode("utf-8"))
+            partition = os.path.relpath(root, path)
+            table["" if partition == "." else partition.replace(os.sep, "/")] = digest.hexdigest()
+        signatures[name] = table
+    return signatures
+
+
+def read_version(path: str = VERSION_PATH) -> dict | None:
+    """The published data version (version, published_at, store_dir, partitions), or None before the first one."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _link_tree(src: str, dst: str) -> None:
+    """Mirror `src` into `dst` with hard links (copies where the filesystem has none)."""
+    for root, _, files in os.walk(src):
+        target = os.path.join(dst, os.path.relpath(root, src))
+        os.makedirs(target, exist_ok=True)
+        for file_name in files:
+            try:
+                os.link(os.path.join(root, file_name), os.path.join(target, file_name))
+            except OSError:
+                shutil.copy2(os.path.join(root, file_name), os.path.join(target, file_name))
+
+
+def publish_snapshot(store_dir: str = STORE_DIR, snapshot_dir: str = SNAPSHOT_DIR, version_path: str = VERSION_PATH,
+                     keep: int = KEEP_SNAPSHOTS) -> dict | None:
+    """
+    Freeze the store as a new immutable version and make it the current one.
+
+    The snapshot is a tree of hard links, so it costs no copying, and later writes to the store
+    (which replace files rather than rewrite them) leave it intact. Readers only ever see
+    complete versions: the snapshot directory is renamed into place before the version file,
+    itself replaced atomically, points at it.
+
+    Returns:
+        dict | None: The new version record, or None when the store has not changed since the current version.
+    """
+    current = read_version(version_path)
+    signatures = partition_signatures(store_dir)
+    if current is not None and current["partitions"] == signatures:
+        return None
+
+    version = (current["version"] if current else 0) + 1
+    snapshot_path = os.path.join(snapshot_dir, f"v{version:06d}")
+    tmp_path = f"{snapshot_path}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    _link_tree(store_dir, tmp_path)
+    os.replace(tmp_path, snapshot_path)
+
+    record = {"version": version, "published_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+              "store_dir": snapshot_path, "partitions": signatures}
+    tmp_version = f"{version_path}.tmp"
+    with open(tmp_version, "w", encoding="utf-8") as f:
+        json.dump(record, f, indent=1)
+    os.replace(tmp_version, version_path)
+
+    versions = sorted(int(match.group(1)) for match in map(_SNAPSHOT_NAME.match, os.listdir(snapshot_dir)) if match)
+    for old in versions[:-keep]:
+        shutil.rmtree(os.path.join(snapshot_dir, f"v{old:06d}"), ignore_errors=True)
+    return record
+
+
+def changed_partitions(old: dict | None, new: dict, table: str) -> list[str] | None:
+    """
+    Partition directories of `table` that differ between two versions (added, rewritten or removed).
+
+    Returns:
+        list[str] | None: Changed partitions, or None when the table must be reloaded whole
+            (no previous version, or an unpartitioned table that changed).
+    """
+    before = (old or {}).get("partitions", {}).get(table)
+    after = new["partitions"].get(table, {})
+    if before is None:
+        return None
+    changed = sorted(part for part in before.keys() | after.keys() if before.get(part) != after.get(part))
+    if changed and TABLES[table]["time_col"] is None:
+        return None
+    return changed
+
+
+def _month_mask(times: pd.Series, months: list[str]) -> np.ndarray:
+    """Rows whose timestamp falls in one of the YYYY-MM months."""
+    values = times.to_numpy()
+    mask = np.zeros(len(values), dtype=bool)
+    for month in months:
+        start = pd.Timestamp(f"{month}-01")
+        mask |= (values >= start.to_datetime64()) & (values < (start + pd.offsets.MonthBegin()).to_datetime64())
+    return mask
+
+
+class LiveTable:
+    """
+    One store table held in memory and kept at the current data version by reloading only changed months.
+
+    Args:
+        name (str): Table name (one of TABLES).
+        build (Callable[[pd.DataFrame], object]): Turns the table's rows into the object the app reads
+            (e.g. a FrameIndex). The object's `frame` holds the rows again, so a delta can be spliced in.
+        columns (list[str] | None): Columns to load.
+        prepare (Callable[[pd.DataFrame, str], pd.DataFrame] | None): Applied to rows read from the store,
+            with the store directory they came from (e.g. attach_texts).
+        fallback (Callable[[str], pd.DataFrame] | None): Rows to use when the store has no such table yet.
+    """
+
+    def __init__(self, name: str, build, columns: list[str] | None = None, prepare=None, fallback=None):
+        self.name = name
+        self.build = build
+        self.columns = columns
+        self.prepare = prepare
+        self.fallback = fallback
+
+    def _read(self, store_dir: str, months: list[str] | None = None) -> pd.DataFrame:
+        row_filter = None if months is None else ds.field(PARTITION_COL).isin([m.split("=", 1)[1] for m in months])
+        df = read_table(self.name, self.columns, store_dir=store_dir, filter=row_filter)
+        return self.prepare(df, store_dir) if self.prepare else df
+
+    def load(self, store_dir: str):
+        if not has_table(self.name, store_dir) and self.fallback is not None:
+            return self.build(self.fallback(store_dir))
+        return self.build(self._read(store_dir))
+
+    def update(self, built, old: dict | None, new: dict):
+        """
+        Bring `built` (loaded at version `old`) to version `new`, reading only the months that changed.
+
+        Returns:
+            `built` itself when nothing changed, otherwise a new object; `built` is never modified.
+        """
+        months = changed_partitions(old, new, self.name)
+        if months is None:
+            return self.load(new["store_dir"])
+        if not months:
+            return built
+        frame = built.frame
+        kept = frame[~_month_mask(frame[TABLES[self.name]["time_col"]], [m.split("=", 1)[1] for m in months])]
+        rows = pd.concat([kept, self._read(new["store_dir"], months)], ignore_index=True)
+        # The two parts have different categories, which concat turns into plain values
+        for col in kept.columns:
+            if isinstance(kept[col].dtype, pd.CategoricalDtype):
+                rows[col] = rows[col].astype("category")
+        return self.build(rows)
+
+
+@dataclass(frozen=True)
+class DataVersion:
+    """
+    The app's tables as of one data version.
+
+    Args:
+        number (int | None): Published version number (None when read straight from the store).
+        published_at (str | None): When the version was published (ISO 8601, UTC).
+        tables (dict): Built table objects by name.
+        changed (dict[str, list[str] | None]): Per table, the partitions reloaded to reach this
+            version from the previous one (None: reloaded whole).
+        record (dict | None): The version record, to diff the next version against.
+    """
+    number: int | None
+    published_at: str | None
+    tables: dict
+    changed: dict = field(default_factory=dict)
+    record: dict | None = None
+
+
+class LiveData:
+    """
+    The app's tables at the latest published data version, shared by every session.
+
+    `refresh` polls the version file (one stat per call). When a new version has been published,
+    the first caller splices the changed months into each table while other callers carry on
+    with the previous version instead of waiting. Readers take `current` once and use it
+    throughout, so they always see the tables of a single version.
+
+    Args:
+        tables (dict[str, LiveTable]): Tables by the name the app reads them under.
+        store_dir (str): Store read when no version has been published (no refresh worker running).
+        version_path (str): Version file written by `publish_snapshot`.
+    """
+
+    def __init__(self, tables: dict[str, LiveTable], store_dir: str = STORE_DIR, version_path: str = VERSION_PATH):
+        self._specs = tables
+        self._version_path = version_path
+        self._lock = threading.Lock()
+        self._mtime = self._version_mtime()
+        record = read_version(version_path)
+        source = record["store_dir"] if record else store_dir
+        self.current = DataVersion(record["version"] if record else None, record["published_at"] if record else None,
+                                   {name: spec.load(source) for name, spec in tables.items()}, record=record)
+
+    def _version_mtime(self) -> int | None:
+        try:
+            return os.stat(self._version_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def refresh(self) -> DataVersion:
+        """Load the delta of a newly published version, if there is one, and return the current version."""
+        mtime = self._version_mtime()
+        if mtime is None or mtime == self._mtime or not self._lock.acquire(blocking=False):
+            return self.current
+        try:
+            current, record = self.current, read_version(self._version_path)
+            if record["version"] != current.number:
+                changed = {name: changed_partitions(current.record, record, spec.name)
+                           for name, spec in self._specs.items()}
+                tables = {name: spec.update(current.tables[name], current.record, record)
+                          for name, spec in self._specs.items()}
+                self.current = DataVersion(record["version"], record["published_at"], tables, changed, record)
+            self._mtime = mtime
+            return self.current
+        finally:
+            self._lock.release()
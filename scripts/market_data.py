@@ -0,0 +1,159 @@
+import os
+import random
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+
+class YahooTransport:
+    """Fetches hourly bars for many tickers in one batched yfinance request."""
+
+    def download(self, tickers: list[str], start: datetime, end: datetime, interval: str = "1h") -> dict[str, pd.DataFrame]:
+        """
+        Download bars for every ticker at once.
+
+        Returns:
+            dict[str, pd.DataFrame]: Raw yfinance frames per ticker (index reset, flat columns).
+        """
+        import yfinance as yf
+
+        # yfinance's end date is exclusive; ask for the next day so `end`'s own bars are included.
+        # Bars fetched again on the next run are absorbed by the (Date, asset) upsert.
+        raw = yf.download(
+            tickers,
+            start=start.strftime("%Y-%m-%d"),
+            end=(end + timedelta(days=1)).strftime("%Y-%m-%d"),
+            interval=interval,
+            group_by="ticker",
+            progress=False,
+            auto_adjust=False,  # disable auto-adjust warning
+            threads=True
+        )
+        frames = {}
+        for ticker in tickers:
+            if isinstance(raw.columns, pd.MultiIndex):
+                if ticker not in raw.columns.get_level_values(0):
+                    continue
+                df = raw[ticker]
+            else:
+                df = raw
+            df = df.dropna(how="all").reset_index()
+            frames[ticker] = df
+        return frames
+
+
+class FixtureTransport:
+    """
+    Serves bars from local raw snapshot CSVs (data/debug_snapshots/raw_<ticker>.csv) instead of Yahoo.
+
+    Useful for running the fetch pipeline offline or against a known data set.
+    """
+
+    def __init__(self, directory: str = "data/debug_snapshots"):
+        self.directory = directory
+
+    def download(self, tickers: list[str], start: datetime, end: datetime, interval: str = "1h") -> dict[str, pd.DataFrame]:
+        frames = {}
+        for ticker in tickers:
+            path = os.path.join(self.directory, f"raw_{snapshot_name(ticker)}.csv")
+            if not os.path.exists(path):
+                continue
+            df = pd.read_csv(path)
+            time_col = "Datetime" if "Datetime" in df.columns else "Date"
+            times = pd.to_datetime(df[time_col], utc=True, format="mixed")
+            # Same whole-day window as YahooTransport, including the day of `end`
+            keep = (times >= pd.Timestamp(start).tz_convert("UTC").floor("D")) & \
+                   (times < pd.Timestamp(end).tz_convert("UTC").floor("D") + pd.Timedelta(days=1))
+            frames[ticker] = df[keep.values].reset_index(drop=True)
+        return frames
+
+
+def snapshot_name(ticker: str) -> str:
+    return ticker.replace("=", "").replace("^", "")
+
+
+def save_snapshots(frames: dict[str, pd.DataFrame], directory: str = "data/debug_snapshots",
+                   rate: float = 0.0) -> list[str]:
+    """
+    Save raw frames for debugging, for a random `rate` share of tickers (0 disables, 1 saves all).
+
+    Returns:
+        list[str]: Paths written.
+    """
+    if rate <= 0:
+        return []
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for ticker, df in frames.items():
+        if rate < 1 and random.random() >= rate:
+            continue
+        path = os.path.join(directory, f"raw_{snapshot_name(ticker)}.csv")
+        df.to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def normalize_bars(df: pd.DataFrame, asset_name: str, ticker: str) -> pd.DataFrame | None:
+    """Turn one raw ticker frame into the (Date, Open, Close, pct_change, asset, ticker) layout, or None if unusable."""
+    df = df.copy()
+
+    # Flatten multilevel columns if needed
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = [col[0] if isinstance(col, tuple) else col for col in df.columns]
+
+    # Normalize date column
+    if "Datetime" in df.columns:
+        df.rename(columns={"Datetime": "Date"}, inplace=True)
+    elif "index" in df.columns:
+        df.rename(columns={"index": "Date"}, inplace=True)
+
+    required_cols = {"Date", "Open", "Close"}
+    missing_cols = required_cols - set(df.columns)
+    if missing_cols:
+        print(f"⚠️ Missing required columns for {asset_name}: {missing_cols}")
+        return None
+
+    dates = pd.to_datetime(df["Date"], utc=True, format="mixed")
+    df["Date"] = dates.dt.floor("h").dt.tz_localize(None)
+    df["asset"] = asset_name
+    df["ticker"] = ticker
+    return df[["Date", "Open", "Close", "asset", "ticker"]]
+
+
+def last_bar_times(existing: pd.DataFrame | None, assets: dict[str, str]) -> dict[str, pd.Timestamp | None]:
+    """Latest stored bar per asset (None for assets with no stored bars)."""
+    latest = {name: None for name in assets}
+    if existing is None or existing.empty:
+        return latest
+    for name, ts in existing.groupby("asset", observed=True)["Date"].max().items():
+        if name in latest:
+            latest[name] = ts
+    return latest
+
+
+def upsert_bars(existing: pd.DataFrame | None, new_bars: pd.DataFrame, window_start=None) -> pd.DataFrame:
+    """
+    Upsert new bars into the stored ones on (Date, asset) and recompute pct_change per asset.
+
+    Args:
+        existing (pd.DataFrame | None): Previously stored bars.
+        new_bars (pd.DataFrame): Freshly fetched bars; they win over stored bars with the same key.
+        window_start: Bars before this time are dropped (retention window).
+    """
+    frames = [df for df in (existing, new_bars) if df is not None and not df.empty]
+    if not frames:
+        return new_bars
+    bars = pd.concat(frames, ignore_index=True)
+    bars["Date"] = pd.to_datetime(bars["Date"])
+    bars["asset"] = bars["asset"].astype(str)
+    bars["ticker"] = bars["ticker"].astype(str)
+    bars = bars.drop_duplicates(subset=["Date", "asset"], keep="last")
+    bars = bars.dropna(subset=["Open", "Close"])
+    if window_start is not None:
+        bars = bars[bars["Date"] >= pd.Timestamp(window_start).tz_localize(None)]
+
+    # Preserve the asset order of the original script's output, then time order within each asset
+    order = {name: i for i, name in enumerate(dict.fromkeys(bars["asset"]))}
+    bars = bars.sort_values(["asset", "Date"], key=lambda col: col.map(order) if col.name == "asset" else col)
+    bars["pct_change"] = bars.groupby("asset")["Close"].pct_change()
+    return bars[["Date", "Open", "Close", "pct_change", "asset", "ticker"]].reset_index(drop=True)
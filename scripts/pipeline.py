@@ -0,0 +1,235 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+STATE_PATH = "data/pipeline_state.json"
+RUNS_PATH = "data/pipeline_runs.jsonl"
+LOG_DIR = "data/pipeline_logs"
+# Every stage's fingerprint covers the shared code, so editing a helper module reruns its callers
+CODE_GLOB = "scripts/*.py"
+# The two Reddit stages run at the same time, each scoring on its own process pool; half the
+# CPUs each keeps them from oversubscribing the machine
+SCORING_PROCESSES = ["--processes", str(max(1, (os.cpu_count() or 2) // 2))]
+
+
+@dataclass
+class Stage:
+    """
+    One pipeline step: a script run as a subprocess from the repository root.
+
+    Args:
+        name (str): Stage name used on the command line and in the state file.
+        script (str): Script to run with the current Python interpreter.
+        inputs (list[str]): Files or directories the stage reads. A stage producing one of them runs first.
+        outputs (list[str]): Files or directories the stage writes.
+        args (list[str]): Arguments for incremental runs.
+        full_args (list[str]): Arguments for `--full` runs.
+        refresh_every (int | None): For stages fetching external data (no file inputs to fingerprint),
+            seconds after which a successful run is considered stale.
+    """
+    name: str
+    script: str
+    inputs: list[str] = field(default_factory=list)
+    outputs: list[str] = field(default_factory=list)
+    args: list[str] = field(default_factory=list)
+    full_args: list[str] = field(default_factory=list)
+    refresh_every: int | None = None
+
+
+STAGES = [
+    Stage("prices", "scripts/financial_data.py",
+          outputs=["data/financial_data.csv", "data/store/financial_data"],
+          args=["--incremental"], refresh_every=3600),
+    Stage("reddit_sentiment", "scripts/reddit_sentiment.py",
+          outputs=["data/reddit_sentiment.csv", "data/store/reddit_sentiment"],
+          args=["--incremental", *SCORING_PROCESSES], full_args=[*SCORING_PROCESSES], refresh_every=3600),
+    Stage("reddit_text", "scripts/reddit_scraper.py",
+          outputs=["data/reddit_text.csv", "data/texts.csv", "data/store/reddit_text", "data/store/texts"],
+          args=["--incremental", *SCORING_PROCESSES], full_args=[*SCORING_PROCESSES], refresh_every=3600),
+    Stage("merge", "scripts/process_data.py",
+          inputs=["data/store/financial_data", "data/store/reddit_sentiment",
+                  "data/changes/financial_data.json", "data/changes/reddit_sentiment.json"],
+          outputs=["data/merged_data.csv", "data/store/merged_data", "data/store/rollup"],
+          args=["--incremental"]),
+]
+
+
+def dependencies(stages: list[Stage]) -> dict[str, set[str]]:
+    """Map each stage to the stages writing one of its inputs."""
+    producers = {path: stage.name for stage in stages for path in stage.outputs}
+    return {stage.name: {producers[path] for path in stage.inputs if path in producers} - {stage.name}
+            for stage in stages}
+
+
+def _files(path: str) -> list[str]:
+    if os.path.isfile(path):
+        return [path]
+    return sorted(os.path.join(root, name) for root, _, names in os.walk(path) for name in names)
+
+
+def fingerprint(paths: list[str]) -> str:
+    """Content hash of the given files and directory trees; missing paths hash as absent."""
+    digest = hashlib.blake2b(digest_size=16)
+    for path in paths:
+        digest.update(path.encode("utf-8"))
+        if not os.path.exists(path):
+            digest.update(b"\0missing")
+            continue
+        for file_path in _files(path):
+            digest.update(file_path.encode("utf-8"))
+            with open(file_path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+    return digest.hexdigest()
+
+
+def stage_fingerprint(stage: Stage, args: list[str], code_hash: str) -> str:
+    """Fingerprint of everything a stage's result depends on: its inputs, its code and its arguments."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps([stage.script, args, code_hash, fingerprint(stage.inputs)]).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def is_fresh(stage: Stage, state: dict, stage_hash: str, now: float) -> bool:
+    """True when the last successful run saw the same fingerprint and its outputs are still there."""
+    last = state.get(stage.name)
+    if not last or last.get("status") != "ran" or last.get("fingerprint") != stage_hash:
+        return False
+    if not all(os.path.exists(path) for path in stage.outputs):
+        return False
+    if stage.refresh_every is not None and now - last.get("finished_at", 0) > stage.refresh_every:
+        return False
+    return True
+
+
+def load_state(path: str = STATE_PATH) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(state: dict, path: str = STATE_PATH) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def _run_stage(stage: Stage, args: list[str], log_dir: str) -> tuple[int, float, str]:
+    """Run one stage's script, writing its output to `log_dir/<name>.log`."""
+    os.makedirs(log_dir, exist_ok=True)
+    log_path = os.path.join(log_dir, f"{stage.name}.log")
+    start = time.perf_counter()
+    with open(log_path, "w", encoding="utf-8") as log:
+        returncode = subprocess.run([sys.executable, stage.script, *args], stdout=log, stderr=subprocess.STDOUT).returncode
+    return returncode, time.perf_counter() - start, log_path
+
+
+def run_pipeline(stages: list[Stage] = STAGES, force: bool = False, full: bool = False, max_workers: int = 4,
+                 state_path: str = STATE_PATH, runs_path: str = RUNS_PATH, log_dir: str = LOG_DIR) -> list[dict]:
+    """
+    Run the stages in dependency order, independent ones in parallel, skipping those whose fingerprint is unchanged.
+
+    A stage is decided only once the stages it depends on have finished, so it sees their new outputs.
+    Stages downstream of a failure are reported as blocked and not run.
+
+    Args:
+        stages (list[Stage]): Stages to consider.
+        force (bool): Run every stage regardless of fingerprints.
+        full (bool): Use each stage's `full_args` instead of its incremental `args`.
+        max_workers (int): Stages run at the same time.
+        state_path (str): JSON file with each stage's last fingerprint and timing.
+        runs_path (str): JSON-lines file every run's per-stage results are appended to.
+        log_dir (str): Directory for each stage's captured output.
+
+    Returns:
+        list[dict]: One result per stage (name, status, seconds, log), in completion order.
+    """
+    deps = dependencies(stages)
+    by_name = {stage.name: stage for stage in stages}
+    state = load_state(state_path)
+    code_hash = fingerprint(sorted(glob.glob(CODE_GLOB)))
+    pending = set(by_name)
+    done, results, running = {}, [], {}
+    run_started = time.perf_counter()
+
+    def record(name, status, seconds=0.0, log=None):
+        done[name] = status
+        results.append({"stage": name, "status": status, "seconds": round(seconds, 3), "log": log})
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while pending or running:
+            for name in sorted(pending):
+                if not deps[name] <= done.keys():
+                    continue
+                pending.discard(name)
+                stage = by_name[name]
+                if any(done[dep] in ("failed", "blocked") for dep in deps[name]):
+                    record(name, "blocked")
+                    continue
+                args = stage.full_args if full else stage.args
+                check_start = time.perf_counter()
+                stage_hash = stage_fingerprint(stage, args, code_hash)
+                if not force and is_fresh(stage, state, stage_hash, time.time()):
+                    record(name, "skipped", time.perf_counter() - check_start)
+                    continue
+                print(f"▶️ {name}: {stage.script} {' '.join(args)}")
+                running[pool.submit(_run_stage, stage, args, log_dir)] = (stage, args)
+
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage, args = running.pop(future)
+                returncode, seconds, log_path = future.result()
+                status = "ran" if returncode == 0 else "failed"
+                record(stage.name, status, seconds, log_path)
+                print(f"{'✅' if status == 'ran' else '❌'} {stage.name} {status} in {seconds:.1f}s (log: {log_path})")
+                if status == "ran":
+                    # Fingerprint after the run: stages that consume their inputs (change logs) leave them changed
+                    state[stage.name] = {"status": status, "fingerprint": stage_fingerprint(stage, args, code_hash),
+                                         "finished_at": time.time(), "seconds": round(seconds, 3)}
+                else:
+                    state.pop(stage.name, None)
+                save_state(state, state_path)
+
+    os.makedirs(os.path.dirname(runs_path), exist_ok=True)
+    with open(runs_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"started": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                            "seconds": round(time.perf_counter() - run_started, 3), "force": force,
+                            "full": full, "stages": results}) + "\n")
+    return results
+
+
+def print_timings(results: list[dict]) -> None:
+    print(f"\n{'stage':<20}{'status':>10}{'seconds':>10}")
+    for result in results:
+        print(f"{result['stage']:<20}{result['status']:>10}{result['seconds']:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Refresh all data: fetch prices and Reddit posts, then merge.")
+    parser.add_argument("--force", action="store_true", help="Run every stage even if its inputs are unchanged.")
+    parser.add_argument("--full", action="store_true", help="Run full rebuilds instead of incremental updates.")
+    parser.add_argument("--only", nargs="+", choices=[stage.name for stage in STAGES], metavar="STAGE",
+                        help="Run only these stages.")
+    parser.add_argument("--max-workers", type=int, default=4, help="Stages run at the same time.")
+    args = parser.parse_args()
+
+    stages = [stage for stage in STAGES if not args.only or stage.name in args.only]
+    start = time.perf_counter()
+    results = run_pipeline(stages, force=args.force, full=args.full, max_workers=args.max_workers)
+    print_timings(results)
+    print(f"⏱️ Pipeline finished in {time.perf_counter() - start:.1f}s")
+    if any(result["status"] in ("failed", "blocked") for result in results):
+        sys.exit(1)
@@ -1,91 +1,133 @@
 import pandas as pd
 from datetime import timedelta
 import os
+import sys
+import argparse
 
-# --- Load Reddit Sentiment ---
-reddit_df = pd.read_csv("data/reddit_sentiment.csv", parse_dates=["created_utc"])
-reddit_df["date"] = reddit_df["created_utc"].dt.date
-
-# Aggregate sentiment to daily level
-daily_sentiment = reddit_df.groupby(["date", "subreddit"]).agg({
-    "compound": "mean",
-    "neg": "mean",
-    "neu": "mean",
-    "pos": "mean"
-}).reset_index().rename(columns={
-    "compound": "avg_compound",
-    "neg": "avg_neg",
-    "neu": "avg_neu",
-    "pos": "avg_pos"
-})
-daily_sentiment["target_date"] = pd.to_datetime(daily_sentiment["date"]) + timedelta(days=1)
-daily_sentiment["target_date"] = daily_sentiment["target_date"].dt.date
-
-# --- Load Financial Data (hourly) ---
-finance_df = pd.read_csv("data/financial_data.csv", parse_dates=["Datetime"])
-
-# --- Fill fallback values before aggregation
-def fill_first_available(df, base_col):
-    fallback_cols = [col for col in df.columns if col.startswith(base_col + ".")]
-    for col in fallback_cols:
-        df[base_col] = df[base_col].fillna(df[col])
-    return df
-
-for col in ["Open", "Close", "High", "Low", "Volume"]:
-    finance_df = fill_first_available(finance_df, col)
-
-# Extract date only from hourly datetime
-finance_df["Date"] = finance_df["Datetime"].dt.date
-
-
-# Aggregate financials to daily level (by asset)
-daily_finance = finance_df.groupby(["Date", "asset"]).agg({
-    "Open": "first",
-    "Close": "last",
-    "High": "max",
-    "Low": "min",
-    "Volume": "sum",
-    "pct_change": "sum"
-}).reset_index()
-daily_finance["trade_date"] = pd.to_datetime(daily_finance["Date"]).dt.date
-
-# --- Merge daily finance + sentiment ---
-merged = daily_finance.merge(
-    daily_sentiment,
-    left_on="trade_date",
-    right_on="target_date",
-    how="inner"
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts.change_log import clear_changes, load_changes
+from scripts.daily_merge import (
+    affected_trade_dates, aggregate_finance, aggregate_sentiment, format_date_columns, merge_daily
 )
-
-# --- Repair fallback columns if present (legacy columns)
-def fill_first_available(df, base_col):
-    fallback_cols = [col for col in df.columns if col.startswith(base_col + ".")]
-    if fallback_cols:
-        for col in fallback_cols:
-            df[base_col] = df[base_col].fillna(df[col])
-    return df
-
-merged = fill_first_available(merged, "Open")
-merged = fill_first_available(merged, "Close")
-
-# --- Add data quality flag
-merged["data_quality"] = merged[["Open", "Close"]].notna().all(axis=1)
-
-# --- Diagnostics
-print("\n📊 Merged asset counts BEFORE dropna:")
-print(merged["asset"].value_counts())
-print("❌ Missing Open:", merged["Open"].isna().sum())
-print("❌ Missing Close:", merged["Close"].isna().sum())
-
-# --- Drop only if Close or sentiment is missing
-merged = merged.dropna(subset=["Close", "avg_compound"])
-
-# --- Save merged output
-os.makedirs("data", exist_ok=True)
-merged.to_csv("data/merged_data.csv", index=False)
-
-# --- Final report
-print("\n✅ Final merged dataset")
-print("Rows:", len(merged))
-print("Assets:", merged['asset'].value_counts())
-print("Subreddits:", merged['subreddit'].value_counts())
+from scripts.data_store import has_table, load_table, read_months, write_months, write_table
+from scripts.instrumentation import export, lap
+from scripts.rollup import build_cube, hour_window
+
+parser = argparse.ArgumentParser(description="Merge daily Reddit sentiment with daily asset prices.")
+parser.add_argument("--incremental", action="store_true",
+                    help="Only recompute the days changed since the last run and upsert them into the merged data.")
+parser.add_argument("--hour-lag", type=float, default=1,
+                    help="Hourly rollup: hours between a post hour and the bar whose return it is paired with.")
+parser.add_argument("--max-wait", type=float, default=72,
+                    help="Hourly rollup: longest wait, in hours, for a closed market's next bar (0: open hours only).")
+args = parser.parse_args()
+hour_lag, max_wait = timedelta(hours=args.hour_lag), timedelta(hours=args.max_wait)
+
+SENTIMENT_COLUMNS = ["subreddit", "created_utc", "compound", "neg", "neu", "pos"]
+
+# --- Work out what needs recomputing
+sentiment_changes = load_changes("reddit_sentiment")
+finance_changes = load_changes("financial_data")
+incremental = (
+    args.incremental
+    and all(has_table(name) for name in ("reddit_sentiment", "financial_data", "merged_data", "rollup"))
+    and not sentiment_changes["full"]
+    and not finance_changes["full"]
+)
+if args.incremental and not incremental:
+    print("⚠️ Full rewrite or missing store detected, running a full merge.")
+
+trade_dates = None
+if incremental:
+    trade_dates = affected_trade_dates(sentiment_changes["keys"], finance_changes["keys"])
+    print(f"🔁 Incremental merge for {len(trade_dates)} trade date(s)")
+
+if trade_dates is not None and not trade_dates:
+    print("✅ No changed days since the last merge, nothing to do.")
+else:
+    # --- Load Reddit Sentiment and Financial Data (hourly), only the affected days when incremental
+    if trade_dates is not None:
+        # Trade dates need the previous day's sentiment. Hour rows are paired with bars up to
+        # `window` days later, so those of the days before also change, and need the bars after
+        load_days = trade_dates | {day - timedelta(days=1) for day in trade_dates}
+        window = hour_window(hour_lag, max_wait)
+        hour_days = {day - timedelta(days=k) for day in load_days for k in range(window + 1)}
+        reddit_df = load_table("reddit_sentiment", SENTIMENT_COLUMNS,
+                               start=min(hour_days), end=max(hour_days) + timedelta(days=1))
+        reddit_df = reddit_df[reddit_df["created_utc"].dt.date.isin(hour_days)]
+        finance_df = load_table("financial_data",
+                                start=min(hour_days), end=max(load_days) + timedelta(days=window + 1))
+    else:
+        reddit_df = load_table("reddit_sentiment", SENTIMENT_COLUMNS)
+        finance_df = load_table("financial_data")
+
+    lap("load")
+
+    # --- Aggregate both sides to daily level and merge
+    daily_sentiment = aggregate_sentiment(reddit_df)
+    daily_finance = aggregate_finance(finance_df)
+    merged = merge_daily(daily_finance, daily_sentiment)
+    lap("merge")
+    cube = build_cube(reddit_df, finance_df, hour_lag, max_wait)
+    lap("rollup")
+    if trade_dates is not None:
+        merged = merged[merged["trade_date"].isin(trade_dates)]
+
+    # --- Diagnostics
+    print("\n📊 Merged asset counts BEFORE dropna:")
+    print(merged["asset"].value_counts())
+    print("❌ Missing Open:", merged["Open"].isna().sum())
+    print("❌ Missing Close:", merged["Close"].isna().sum())
+
+    # --- Drop only if Close or sentiment is missing
+    merged = format_date_columns(merged.dropna(subset=["Close", "avg_compound"]))
+
+    # --- Upsert recomputed days into the existing merged data
+    changed_months = None
+    if trade_dates is not None:
+        # Only the month partitions holding recomputed days are read back and rewritten
+        changed_months = {pd.Timestamp(day).strftime("%Y-%m") for day in trade_dates}
+        cube_months = {pd.Timestamp(day).strftime("%Y-%m") for day in hour_days}
+        existing = read_months("merged_data", changed_months)
+        existing["trade_date"] = pd.to_datetime(existing["trade_date"]).dt.strftime("%Y-%m-%d")
+        recomputed = {day.strftime("%Y-%m-%d") for day in trade_dates}
+        kept = existing[~existing["trade_date"].isin(recomputed)]
+        merged = pd.concat([kept, merged], ignore_index=True)
+        merged["Date"] = pd.to_datetime(merged["Date"])
+        merged = merged.sort_values(["Date", "asset", "subreddit"], ignore_index=True)
+
+        # Day rows are keyed by trade date, hour rows by the hour of the posts and bars
+        cube_days = cube["Date"].dt.date
+        cube = cube[((cube["grain"] == "day") & cube_days.isin(trade_dates)) |
+                    ((cube["grain"] == "hour") & cube_days.isin(hour_days))]
+        existing_cube = read_months("rollup", cube_months)
+        existing_days = existing_cube["Date"].dt.date
+        stale = ((existing_cube["grain"] == "day") & existing_days.isin(trade_dates)) | \
+                ((existing_cube["grain"] == "hour") & existing_days.isin(hour_days))
+        cube = pd.concat([existing_cube[~stale], cube], ignore_index=True)
+
+    lap("finalize")
+
+    # --- Save merged output
+    if changed_months is not None:
+        # Months left without rows are removed. The CSV export holds the whole history, so it
+        # is only rewritten by full merges; the store is the up-to-date copy in between
+        write_months(merged, "merged_data", changed_months)
+        write_months(cube, "rollup", cube_months)
+    else:
+        os.makedirs("data", exist_ok=True)
+        merged.to_csv("data/merged_data.csv", index=False)
+        write_table(merged, "merged_data")
+        write_table(cube, "rollup")
+    clear_changes("reddit_sentiment")
+    clear_changes("financial_data")
+    lap("write")
+
+    # --- Final report
+    print("\n✅ Final merged dataset" + (f" (rewritten months: {', '.join(sorted(changed_months))})"
+                                        if changed_months is not None else ""))
+    print("Rows:", len(merged))
+    print("Assets:", merged['asset'].value_counts())
+    print("Subreddits:", merged['subreddit'].value_counts())
+    print("Rollup rows:", cube["grain"].value_counts().to_dict())
+export("process_data", incremental=trade_dates is not None, trade_dates=None if trade_dates is None else len(trade_dates))
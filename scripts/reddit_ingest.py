@@ -0,0 +1,122 @@
+import json
+import os
+from datetime import datetime, timezone
+from typing import Iterator
+
+import pandas as pd
+
+
+def cursor_path_for(csv_path: str) -> str:
+    """Cursor file stored next to the CSV it tracks (e.g. data/reddit_text.cursors.json)."""
+    return os.path.splitext(csv_path)[0] + ".cursors.json"
+
+
+def load_cursors(path: str) -> dict:
+    """Load per-subreddit high-water marks ({sub: {"id": ..., "created_utc": ...}})."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_cursors(cursors: dict, path: str) -> None:
+    """Write cursors atomically so an interrupted run never leaves a half-written file."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cursors, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def iter_new_posts(listing, cursor: dict | None, cutoff: datetime) -> Iterator:
+    """
+    Yield posts from a newest-first listing until the cursor or the retention cutoff is reached.
+
+    praw fetches listing pages lazily, so stopping early means older pages are never requested.
+
+    Args:
+        listing: Iterable of praw submissions ordered newest first (e.g. `subreddit.new(limit=...)`).
+        cursor (dict | None): Last seen post for this subreddit, or None to read back to `cutoff`.
+        cutoff (datetime): Oldest post time to keep.
+
+    Yields:
+        praw submissions newer than the cursor and inside the retention window.
+    """
+    cutoff_ts = cutoff.timestamp()
+    for post in listing:
+        if post.created_utc < cutoff_ts:
+            break
+        if cursor is not None:
+            if post.id == cursor["id"] or post.created_utc < cursor["created_utc"]:
+                break
+        yield post
+
+
+def advance_cursors(cursors: dict, posts_df: pd.DataFrame, failed=()) -> dict:
+    """
+    Move each subreddit's cursor to its newest post in `posts_df`.
+
+    Subreddits in `failed` keep their cursor: a fetch that stopped partway got the newest posts
+    but not the older ones, so the next run has to fetch from the old cursor again (posts seen
+    twice are deduped by ID when merged).
+    """
+    cursors = dict(cursors)
+    if posts_df.empty:
+        return cursors
+    newest = posts_df.sort_values("created_utc").groupby("subreddit", observed=True).tail(1)
+    for row in newest.itertuples(index=False):
+        if row.subreddit in failed:
+            continue
+        created = pd.Timestamp(row.created_utc).timestamp()
+        current = cursors.get(row.subreddit)
+        if current is None or created >= current["created_utc"]:
+            cursors[row.subreddit] = {"id": row.id, "created_utc": created}
+    return cursors
+
+
+def load_existing_posts(csv_path: str) -> pd.DataFrame | None:
+    """Load previously ingested posts, or None if there is nothing usable to append to."""
+    if not os.path.exists(csv_path):
+        return None
+    existing = pd.read_csv(csv_path)
+    if "id" not in existing.columns:
+        # Older exports have no post IDs to dedup on, so they need one full rescrape
+        return None
+    existing["created_utc"] = pd.to_datetime(existing["created_utc"], utc=True, format="mixed")
+    return existing
+
+
+def merge_posts(existing: pd.DataFrame | None, new_posts: pd.DataFrame, cutoff: datetime) -> pd.DataFrame:
+    """
+    Append newly scored posts to the existing ones, dedup on post ID and drop posts older than `cutoff`.
+
+    Returns:
+        pd.DataFrame: Posts inside the retention window, newest first.
+    """
+    frames = [df for df in (existing, new_posts) if df is not None and not df.empty]
+    if not frames:
+        return new_posts
+    merged = pd.concat(frames, ignore_index=True)
+    merged["created_utc"] = pd.to_datetime(merged["created_utc"], utc=True, format="mixed")
+    merged = merged.drop_duplicates(subset=["id"], keep="last")
+    merged = merged[merged["created_utc"] >= pd.Timestamp(cutoff).tz_convert(timezone.utc)]
+    return merged.sort_values("created_utc", ascending=False, ignore_index=True)
+
+
+def split_texts(posts_df: pd.DataFrame, existing_texts: pd.DataFrame | None = None) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Move post bodies into a separate table keyed by `text_id`, so each distinct text is stored once.
+
+    Args:
+        posts_df (pd.DataFrame): Posts with `text_id` and, optionally, a `text` column.
+        existing_texts (pd.DataFrame | None): Previously stored (text_id, text) rows.
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: Posts without `text`, and the texts referenced by them.
+    """
+    frames = [df for df in (existing_texts, posts_df) if df is not None and "text" in df.columns]
+    texts = pd.concat([df[["text_id", "text"]] for df in frames], ignore_index=True) if frames else \
+        pd.DataFrame(columns=["text_id", "text"])
+    texts = texts.dropna(subset=["text"]).drop_duplicates(subset=["text_id"], keep="last")
+    # Texts of posts that aged out of the retention window are dropped with them
+    texts = texts[texts["text_id"].isin(posts_df["text_id"])]
+    return posts_df.drop(columns=["text"], errors="ignore"), texts.reset_index(drop=True)
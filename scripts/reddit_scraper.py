@@ -1,20 +1,42 @@
 import os
+import sys
+import argparse
 import praw
 import pandas as pd
 from dotenv import load_dotenv
 from datetime import datetime, timezone, timedelta
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts.change_log import day_keys, key_months
+from scripts.data_store import TABLES, load_table, has_table, write_months, write_table
+from scripts.instrumentation import count, export, lap
+from scripts.reddit_ingest import (
+    advance_cursors, cursor_path_for, load_cursors, load_existing_posts, merge_posts, save_cursors, split_texts
+)
+from scripts.scoring import ScoringStage
+from scripts.sentiment_memo import MemoizedScoring, SentimentMemo, text_id
+from scripts.scrape_engine import print_stats, scrape_subreddits
+
+parser = argparse.ArgumentParser(description="Scrape Reddit posts (title + body) and score them with VADER.")
+parser.add_argument("--incremental", action="store_true",
+                    help="Only fetch posts newer than the last run and append them to the existing CSV.")
+parser.add_argument("--workers", type=int, default=4, help="Subreddits fetched concurrently.")
+parser.add_argument("--processes", type=int, default=None, help="Sentiment scoring processes (default: all CPUs).")
+parser.add_argument("--scorer", default="vader", help="Registered sentiment scorer to use.")
+args = parser.parse_args()
 
 # === Load environment variables (.env must include Reddit API keys) ===
 load_dotenv()
 
-reddit = praw.Reddit(
-    client_id=os.getenv("REDDIT_CLIENT_ID"),
-    client_secret=os.getenv("REDDIT_CLIENT_SECRET"),
-    username=os.getenv("REDDIT_USERNAME"),
-    password=os.getenv("REDDIT_PASSWORD"),
-    user_agent=os.getenv("USER_AGENT", "sentiment-dashboard")
-)
+# One client per fetch worker, since praw clients are not thread-safe
+def make_reddit():
+    return praw.Reddit(
+        client_id=os.getenv("REDDIT_CLIENT_ID"),
+        client_secret=os.getenv("REDDIT_CLIENT_SECRET"),
+        username=os.getenv("REDDIT_USERNAME"),
+        password=os.getenv("REDDIT_PASSWORD"),
+        user_agent=os.getenv("USER_AGENT", "sentiment-dashboard")
+    )
 
 # === Setup ===
 subreddits = [
@@ -24,40 +46,81 @@ subreddits = [
 ]
 limit = 1000  # per subreddit
 cutoff = datetime.now(timezone.utc) - timedelta(days=90)  # last 3 months
-analyzer = SentimentIntensityAnalyzer()
+# Distinct texts are scored once and memoized across runs; the stage starts before any fetch threads
+scoring = MemoizedScoring(ScoringStage(args.scorer, processes=args.processes), SentimentMemo(), args.scorer)
+texts_path = TABLES["texts"]["csv"]
+output_path = "data/reddit_text.csv"
+cursor_path = cursor_path_for(output_path)
+
+# === Resume from last run (incremental mode) ===
+existing = load_existing_posts(output_path) if args.incremental else None
+cursors = load_cursors(cursor_path) if existing is not None else {}
+if args.incremental and existing is None:
+    print("⚠️ No existing posts with IDs found, running a full scrape.")
+if existing is not None and "text_id" not in existing.columns:
+    existing["text_id"] = existing["text"].map(text_id)
+
+# === Build one row per fetched post (text is scored in batches by the scoring stage) ===
+def prepare_post(sub, post):
+    post_time = datetime.fromtimestamp(post.created_utc, tz=timezone.utc)
+
+    # Merge title + selftext
+    title = post.title or ""
+    body = post.selftext or ""
+    full_text = f"{title}\n{body}".strip()
+
+    # Skip empty or deleted posts
+    if not full_text or full_text.lower() in ["[deleted]", "[removed]"]:
+        return None
+
+    return {
+        "id": post.id,
+        "subreddit": sub,
+        "created_utc": post_time,
+        "text_id": text_id(full_text),
+        "text": full_text,
+        "score": post.score,
+        "num_comments": post.num_comments
+    }
 
 # === Collect Posts ===
-all_data = []
-for sub in subreddits:
-    print(f"📥 Scraping r/{sub}...")
-    for post in reddit.subreddit(sub).new(limit=limit):
-        post_time = datetime.fromtimestamp(post.created_utc, tz=timezone.utc)
-        if post_time < cutoff:
-            continue
-
-        # Merge title + selftext
-        title = post.title or ""
-        body = post.selftext or ""
-        full_text = f"{title}\n{body}".strip()
-
-        # Skip empty or deleted posts
-        if not full_text or full_text.lower() in ["[deleted]", "[removed]"]:
-            continue
-
-        sentiment = analyzer.polarity_scores(full_text)
-
-        all_data.append({
-            "subreddit": sub,
-            "created_utc": post_time,
-            "text": full_text,
-            "compound": sentiment["compound"],
-            "neg": sentiment["neg"],
-            "neu": sentiment["neu"],
-            "pos": sentiment["pos"]
-        })
-
-# === Save to CSV ===
-df = pd.DataFrame(all_data)
+print(f"📥 Scraping {len(subreddits)} subreddits with {args.workers} workers...")
+with scoring:
+    all_data, scrape_stats = scrape_subreddits(
+        make_reddit, subreddits, prepare_post, cutoff, scoring=scoring, text_key="text",
+        cursors=cursors, limit=limit, max_workers=args.workers
+    )
+lap("scrape_and_score")
+print_stats(scrape_stats)
+print(scoring.report())
+count("scoring.texts", scoring.total)
+count("cache.sentiment_memo.hits", scoring.memo_hits)
+
+# === Save to CSV (posts reference their body by text_id; each distinct body is stored once) ===
+# score and num_comments let the summarizer rank posts by engagement
+new_df = pd.DataFrame(all_data, columns=["id", "subreddit", "created_utc", "text_id", "text", "score", "num_comments",
+                                         "compound", "neg", "neu", "pos"])
+existing_texts = None
+if existing is not None and (has_table("texts") or os.path.exists(texts_path)):
+    existing_texts = load_table("texts")
+df, texts_df = split_texts(merge_posts(existing, new_df, cutoff), existing_texts)
 os.makedirs("data", exist_ok=True)
-df.to_csv("data/reddit_text.csv", index=False)
-print(f"✅ Saved {len(df)} posts to data/reddit_sentiment.csv")
+df.to_csv(output_path, index=False)
+texts_df.to_csv(texts_path, index=False)
+failed_subreddits = {sub for sub, stats in scrape_stats.items() if stats["error"]}
+save_cursors(advance_cursors(cursors, new_df, failed_subreddits), cursor_path)
+print(f"✅ Saved {len(df)} posts to {output_path} ({len(new_df)} new)")
+print(f"🗜️ {len(df)} posts reference {len(texts_df)} distinct texts in {texts_path}")
+# text_id is a hash of the text, so the same ids mean the same texts and nothing to rewrite
+if existing_texts is None or not has_table("texts") or set(texts_df["text_id"]) != set(existing_texts["text_id"]):
+    write_table(texts_df, "texts")
+if existing is not None and has_table("reddit_text"):
+    # Only the months holding new or aged-out posts are rewritten
+    aged_out = existing[~existing["id"].isin(df["id"])]
+    changes = day_keys(new_df, "created_utc", "subreddit") | day_keys(aged_out, "created_utc", "subreddit")
+    store_path = write_months(df, "reddit_text", key_months(changes))
+else:
+    store_path = write_table(df, "reddit_text")
+print(f"🗄️ Columnar store written to {store_path}")
+lap("write")
+export("reddit_scraper", incremental=existing is not None, new_posts=len(new_df))
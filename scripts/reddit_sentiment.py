@@ -1,24 +1,45 @@
 import os
+import sys
+import argparse
 import praw
 import pandas as pd
 from dotenv import load_dotenv
 from datetime import datetime, timezone, timedelta
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts.change_log import day_keys, key_months, record_changes
+from scripts.data_store import has_table, write_months, write_table
+from scripts.instrumentation import count, export, lap
+from scripts.reddit_ingest import (
+    advance_cursors, cursor_path_for, load_cursors, load_existing_posts, merge_posts, save_cursors
+)
+from scripts.scoring import ScoringStage
+from scripts.sentiment_memo import MemoizedScoring, SentimentMemo
+from scripts.scrape_engine import print_stats, scrape_subreddits
+
+parser = argparse.ArgumentParser(description="Scrape Reddit post titles and score them with VADER.")
+parser.add_argument("--incremental", action="store_true",
+                    help="Only fetch posts newer than the last run and append them to the existing CSV.")
+parser.add_argument("--workers", type=int, default=4, help="Subreddits fetched concurrently.")
+parser.add_argument("--processes", type=int, default=None, help="Sentiment scoring processes (default: all CPUs).")
+parser.add_argument("--scorer", default="vader", help="Registered sentiment scorer to use.")
+args = parser.parse_args()
 
 # Load environment variables
 load_dotenv()
 
-# Initialize Reddit client
-reddit = praw.Reddit(
-    client_id=os.getenv("REDDIT_CLIENT_ID"),
-    client_secret=os.getenv("REDDIT_CLIENT_SECRET"),
-    username=os.getenv("REDDIT_USERNAME"),
-    password=os.getenv("REDDIT_PASSWORD"),
-    user_agent=os.getenv("USER_AGENT", "sentiment-dashboard")  # ✅ fixed key
-)
+# Reddit client factory (one client per fetch worker)
+def make_reddit():
+    return praw.Reddit(
+        client_id=os.getenv("REDDIT_CLIENT_ID"),
+        client_secret=os.getenv("REDDIT_CLIENT_SECRET"),
+        username=os.getenv("REDDIT_USERNAME"),
+        password=os.getenv("REDDIT_PASSWORD"),
+        user_agent=os.getenv("USER_AGENT", "sentiment-dashboard")  # ✅ fixed key
+    )
 
-# Sentiment analyzer
-analyzer = SentimentIntensityAnalyzer()
+# Sentiment scoring stage (started before any fetch threads); repeated titles are scored once
+scoring = MemoizedScoring(ScoringStage(args.scorer, processes=args.processes), SentimentMemo(), args.scorer)
 
 # Target subreddits and timeframe
 subreddits = [
@@ -28,26 +49,56 @@ subreddits = [
 ]
 limit = 1000
 cutoff = datetime.now(timezone.utc) - timedelta(days=60)
+output_path = "data/reddit_sentiment.csv"
+cursor_path = cursor_path_for(output_path)
+
+# Incremental runs resume from each subreddit's last seen post
+existing = load_existing_posts(output_path) if args.incremental else None
+cursors = load_cursors(cursor_path) if existing is not None else {}
+if args.incremental and existing is None:
+    print("⚠️ No existing posts with IDs found, running a full scrape.")
+
+# Build one row per fetched post; the title is scored in batches by the scoring stage
+def prepare_post(sub, post):
+    return {
+        "id": post.id,
+        "subreddit": sub,
+        "title": post.title,
+        "created_utc": datetime.fromtimestamp(post.created_utc, tz=timezone.utc)
+    }
 
 # Collect and filter posts
-all_data = []
-for sub in subreddits:
-    for post in reddit.subreddit(sub).new(limit=limit):
-        post_time = datetime.fromtimestamp(post.created_utc, tz=timezone.utc)
-        if post_time >= cutoff:
-            score = analyzer.polarity_scores(post.title)
-            all_data.append({
-                "subreddit": sub,
-                "title": post.title,
-                "created_utc": post_time,
-                "compound": score["compound"],
-                "neg": score["neg"],
-                "neu": score["neu"],
-                "pos": score["pos"]
-            })
+with scoring:
+    all_data, scrape_stats = scrape_subreddits(
+        make_reddit, subreddits, prepare_post, cutoff, scoring=scoring, text_key="title",
+        cursors=cursors, limit=limit, max_workers=args.workers
+    )
+lap("scrape_and_score")
+print_stats(scrape_stats)
+print(scoring.report())
+count("scoring.texts", scoring.total)
+count("cache.sentiment_memo.hits", scoring.memo_hits)
 
 # Save to CSV
-df = pd.DataFrame(all_data)
+new_df = pd.DataFrame(all_data, columns=["id", "subreddit", "title", "created_utc", "compound", "neg", "neu", "pos"])
+df = merge_posts(existing, new_df, cutoff)
 os.makedirs("data", exist_ok=True)
-df.to_csv("data/reddit_sentiment.csv", index=False)
-print(f"✅ Saved {len(df)} recent posts to data/reddit_sentiment.csv")
+df.to_csv(output_path, index=False)
+failed_subreddits = {sub for sub, stats in scrape_stats.items() if stats["error"]}
+save_cursors(advance_cursors(cursors, new_df, failed_subreddits), cursor_path)
+if existing is not None:
+    # New posts and posts that aged out both change their day's aggregates
+    aged_out = existing[~existing["id"].isin(df["id"])]
+    changes = day_keys(new_df, "created_utc", "subreddit") | day_keys(aged_out, "created_utc", "subreddit")
+    record_changes("reddit_sentiment", changes)
+else:
+    record_changes("reddit_sentiment", full=True)
+print(f"✅ Saved {len(df)} recent posts to {output_path} ({len(new_df)} new)")
+if existing is not None and has_table("reddit_sentiment"):
+    # Only the months holding new or aged-out posts are rewritten
+    store_path = write_months(df, "reddit_sentiment", key_months(changes))
+else:
+    store_path = write_table(df, "reddit_sentiment")
+print(f"🗄️ Columnar store written to {store_path}")
+lap("write")
+export("reddit_sentiment", incremental=existing is not None, new_posts=len(new_df))
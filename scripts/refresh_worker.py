@@ -0,0 +1,58 @@
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.live_store import KEEP_SNAPSHOTS, publish_snapshot
+from scripts.pipeline import STAGES, print_timings, run_pipeline
+
+
+def refresh_once(max_workers: int = 4, keep: int = KEEP_SNAPSHOTS) -> dict | None:
+    """
+    Run the incremental pipeline, then publish the store as a new data version if it changed.
+
+    Nothing is published after a failed or blocked stage, so the dashboard never sees new raw
+    data without the merged tables built from it; the next cycle retries.
+
+    Returns:
+        dict | None: The published version record, or None.
+    """
+    results = run_pipeline(STAGES, max_workers=max_workers)
+    print_timings(results)
+    if any(result["status"] in ("failed", "blocked") for result in results):
+        print("⚠️ Some stages failed; keeping the current data version.")
+        return None
+    record = publish_snapshot(keep=keep)
+    if record is None:
+        print("ℹ️ No new data; the current data version is unchanged.")
+    else:
+        print(f"📦 Published data version {record['version']} ({record['store_dir']})")
+    return record
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Keep the dashboard's data fresh: rerun the incremental pipeline on a schedule "
+                    "and publish each change as a new data version.")
+    parser.add_argument("--interval", type=float, default=900, help="Seconds between the starts of two refreshes.")
+    parser.add_argument("--once", action="store_true", help="Refresh and publish once, then exit.")
+    parser.add_argument("--max-workers", type=int, default=4, help="Pipeline stages run at the same time.")
+    parser.add_argument("--keep", type=int, default=KEEP_SNAPSHOTS, help="Data versions kept on disk.")
+    args = parser.parse_args()
+
+    while True:
+        started = time.monotonic()
+        print(f"\n🔄 Refresh started at {datetime.now():%Y-%m-%d %H:%M:%S}")
+        refresh_once(args.max_workers, args.keep)
+        if args.once:
+            break
+        wait = max(0.0, args.interval - (time.monotonic() - started))
+        print(f"⏳ Next refresh in {wait:.0f}s")
+        try:
+            time.sleep(wait)
+        except KeyboardInterrupt:
+            print("👋 Refresh worker stopped.")
+            break
@@ -0,0 +1,57 @@
+import os
+import sys
+import time
+import argparse
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts.change_log import record_changes
+from scripts.data_store import TABLES, attach_texts, write_table
+from scripts.scoring import SCORERS, ScoringStage
+from scripts.sentiment_memo import SentimentMemo, text_id
+
+# Text column scored for each Reddit table
+TEXT_COLUMNS = {"reddit_text": "text", "reddit_sentiment": "title"}
+
+parser = argparse.ArgumentParser(description="Rescore stored Reddit posts, e.g. after a lexicon change.")
+parser.add_argument("table", choices=sorted(TEXT_COLUMNS), help="Table to rescore.")
+parser.add_argument("--scorer", default="vader", choices=sorted(SCORERS), help="Sentiment scorer to use.")
+parser.add_argument("--processes", type=int, default=None, help="Scoring processes (default: all CPUs).")
+parser.add_argument("--batch-size", type=int, default=512, help="Texts per worker task.")
+args = parser.parse_args()
+
+csv_path = TABLES[args.table]["csv"]
+text_col = TEXT_COLUMNS[args.table]
+
+df = pd.read_csv(csv_path)
+print(f"📥 Loaded {len(df)} posts from {csv_path}")
+
+# Posts that reference their body by text_id are rescored once per distinct text
+posts = attach_texts(df)
+# Posts whose text is missing (e.g. texts.csv not built) keep their current scores:
+# scoring them as "" would store a neutral score under their real text_id in the memo
+has_text = posts[text_col].notna().to_numpy()
+if not has_text.any():
+    sys.exit(f"❌ No texts found for {args.table}; build data/texts.csv or the store's texts table first.")
+if not has_text.all():
+    print(f"⚠️ {int((~has_text).sum())} posts have no text and keep their current scores.")
+post_texts = posts.loc[has_text, text_col].astype(str)
+post_ids = posts.loc[has_text, "text_id"] if "text_id" in posts.columns else post_texts.map(text_id)
+unique_texts = pd.DataFrame({"text_id": post_ids.values, "text": post_texts.values}).drop_duplicates(subset=["text_id"])
+
+start = time.perf_counter()
+with ScoringStage(args.scorer, processes=args.processes, batch_size=args.batch_size) as scoring:
+    scores = scoring.score(unique_texts["text"])
+    processes = scoring.processes
+elapsed = time.perf_counter() - start
+
+# Refresh the memo so later scrapes reuse the new scores instead of the stale ones
+SentimentMemo().put_many(unique_texts["text_id"].tolist(), unique_texts["text"].tolist(), scores.values, args.scorer)
+score_frame = scores.to_frame(index=unique_texts["text_id"])
+df.loc[has_text, score_frame.columns] = score_frame.loc[post_ids].values
+df.to_csv(csv_path, index=False)
+write_table(df, args.table)
+# Every score changed, so the merge rebuilds from scratch instead of finding nothing to update
+record_changes(args.table, full=True)
+print(f"✅ Rescored {int(has_text.sum())} posts ({len(unique_texts)} distinct texts) with '{args.scorer}' "
+      f"on {processes} process(es) in {elapsed:.1f}s ({len(unique_texts) / max(elapsed, 1e-9):.0f} texts/s)")
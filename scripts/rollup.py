@@ -0,0 +1,169 @@
+import math
+from datetime import timedelta
+
+import pandas as pd
+
+from scripts.frame_index import FrameIndex
+
+SUM_COLUMNS = ["sum_compound", "sum_neg", "sum_neu", "sum_pos"]
+PRICE_COLUMNS = ["Close", "pct_change", "Volume"]
+# Each (grain, subreddit, asset) cell is one time-sorted partition of the indexed cube
+CUBE_KEYS = ["grain", "subreddit", "asset"]
+# Hour rows pair posts with the first bar starting at least HOUR_LAG after their hour. While a
+# market is closed that is its next open, if it comes within MAX_WAIT (a weekend is ~65h for indices)
+HOUR_LAG = timedelta(hours=1)
+MAX_WAIT = timedelta(hours=72)
+
+
+def _sentiment_buckets(reddit_df: pd.DataFrame, freq: str) -> pd.DataFrame:
+    """Per (bucket, subreddit) post counts and score sums."""
+    posts = reddit_df.assign(
+        bucket=pd.to_datetime(reddit_df["created_utc"]).dt.floor(freq),
+        subreddit=reddit_df["subreddit"].astype(str)
+    )
+    grouped = posts.groupby(["bucket", "subreddit"])
+    buckets = grouped[["compound", "neg", "neu", "pos"]].sum()
+    buckets.columns = SUM_COLUMNS
+    buckets.insert(0, "n_posts", grouped["compound"].count().astype("int32"))
+    return buckets.reset_index()
+
+
+def _price_buckets(finance_df: pd.DataFrame, freq: str) -> pd.DataFrame:
+    """Per (bucket, asset) closing price, summed pct_change and volume."""
+    bars = finance_df.assign(
+        bucket=pd.to_datetime(finance_df["Date"]).dt.floor(freq),
+        asset=finance_df["asset"].astype(str)
+    ).sort_values("Date", kind="stable")
+    aggregations = {"Close": "last", "pct_change": "sum"}
+    if "Volume" in bars.columns:
+        aggregations["Volume"] = "sum"
+    return bars.groupby(["bucket", "asset"]).agg(aggregations).reset_index()
+
+
+def align_hourly(reddit_df: pd.DataFrame, finance_df: pd.DataFrame, lag: timedelta = HOUR_LAG,
+                 max_wait: timedelta = MAX_WAIT) -> pd.DataFrame:
+    """
+    Bucket posts into hours and pair each bucket with the return of a later bar, per asset.
+
+    Each (hour, subreddit) bucket is joined, for every asset, to the first hourly bar starting
+    at or after hour + `lag`, in one as-of join. Buckets falling while a market is closed get
+    the bar of its next open, whose return spans the closure, unless that is more than
+    `max_wait` after the target hour; those (and, with max_wait=0, every hour without a bar of
+    its own) keep empty prices.
+
+    Args:
+        reddit_df (pd.DataFrame): Posts with created_utc, subreddit and VADER score columns.
+        finance_df (pd.DataFrame): Hourly bars with Date, asset, Close and pct_change.
+        lag (timedelta): Delay between a post hour and the bar it is paired with.
+        max_wait (timedelta): Longest wait past the target hour for a market to open.
+
+    Returns:
+        pd.DataFrame: One row per (bucket, subreddit, asset); bucket is the posts' hour.
+    """
+    assets = sorted(finance_df["asset"].astype(str).unique())
+    hourly = _sentiment_buckets(reddit_df, "h").merge(pd.DataFrame({"asset": assets}), how="cross")
+    hourly["target"] = (hourly["bucket"] + lag).astype("datetime64[ns]")
+    prices = _price_buckets(finance_df, "h").rename(columns={"bucket": "target"})
+    prices["target"] = prices["target"].astype("datetime64[ns]")
+    aligned = pd.merge_asof(hourly.sort_values("target", kind="stable"), prices.sort_values("target"),
+                            on="target", by="asset", direction="forward", tolerance=pd.Timedelta(max_wait))
+    return aligned.drop(columns="target")
+
+
+def hour_window(lag: timedelta = HOUR_LAG, max_wait: timedelta = MAX_WAIT) -> int:
+    """Days after a post's day that the bar paired with its hour row can fall on."""
+    return math.ceil((lag + max_wait) / timedelta(days=1))
+
+
+def build_cube(reddit_df: pd.DataFrame, finance_df: pd.DataFrame, hour_lag: timedelta = HOUR_LAG,
+               max_wait: timedelta = MAX_WAIT) -> pd.DataFrame:
+    """
+    Precompute sentiment sums and counts at day and hour grain for every subreddit x asset pair.
+
+    Storing sums and counts instead of means lets any slice of the cube be re-aggregated
+    exactly: the mean over a selection is sum(sum_x) / sum(n_posts).
+
+    Day rows follow the merged data: sentiment from day d is paired with the prices of
+    trade date d + 1 (only days that have prices). Hour rows are dated by the posts' hour and
+    carry the return of a later bar (see align_hourly), so the dashboard can switch between
+    the two grains without recomputing anything.
+
+    Args:
+        reddit_df (pd.DataFrame): Posts with created_utc, subreddit and VADER score columns.
+        finance_df (pd.DataFrame): Hourly bars with Date, asset, Close and pct_change.
+        hour_lag (timedelta): Delay between a post hour and its bar, for hour rows.
+        max_wait (timedelta): Longest wait for a closed market to open, for hour rows.
+
+    Returns:
+        pd.DataFrame: One row per (grain, subreddit, asset, Date).
+    """
+    grains = []
+
+    # Day grain: sentiment on day d drives prices on trade date d + 1
+    daily = _sentiment_buckets(reddit_df, "D")
+    daily["bucket"] = daily["bucket"] + timedelta(days=1)
+    day_prices = _price_buckets(finance_df, "D")
+    daily = daily.merge(day_prices.dropna(subset=["Close"]), on="bucket", how="inner")
+    grains.append(("day", daily[daily["n_posts"] > 0]))
+
+    # Hour grain: each hour's posts against a later bar, kept even when no bar is found
+    grains.append(("hour", align_hourly(reddit_df, finance_df, hour_lag, max_wait)))
+
+    cube = pd.concat([frame.assign(grain=grain) for grain, frame in grains], ignore_index=True)
+    cube = cube.rename(columns={"bucket": "Date"})
+    columns = ["grain", "Date", "subreddit", "asset", "n_posts", *SUM_COLUMNS]
+    columns += [col for col in PRICE_COLUMNS if col in cube.columns]
+    return cube[columns]
+
+
+def cube_from_merged(merged_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Day-grain cube derived from merged_data when no precomputed cube exists.
+
+    Post counts are unknown there, so each daily average counts as one post.
+    """
+    cube = merged_df.assign(grain="day", n_posts=1)
+    for avg_col, sum_col in zip(["avg_compound", "avg_neg", "avg_neu", "avg_pos"], SUM_COLUMNS):
+        cube[sum_col] = pd.to_numeric(cube[avg_col], errors="coerce")
+    columns = ["grain", "Date", "subreddit", "asset", "n_posts", *SUM_COLUMNS]
+    columns += [col for col in PRICE_COLUMNS if col in cube.columns]
+    return cube[columns]
+
+
+def index_cube(cube: pd.DataFrame) -> FrameIndex:
+    """Partition the cube by (grain, subreddit, asset) and sort by Date so selections resolve with binary searches."""
+    cube = cube.copy()
+    for col in ["grain", "subreddit", "asset"]:
+        cube[col] = cube[col].astype(str)
+    if "Volume" in cube.columns:
+        cube["Volume"] = pd.to_numeric(cube["Volume"], errors="coerce")
+    cube["Date"] = pd.to_datetime(cube["Date"])
+    return FrameIndex(cube, CUBE_KEYS, "Date")
+
+
+def slice_cube(cube: FrameIndex, grain: str, subreddits, assets, start=None, end=None) -> pd.DataFrame:
+    """
+    Select rows of an indexed cube for the given subreddits, assets and inclusive date range.
+
+    Returns:
+        pd.DataFrame: Matching rows, ordered by subreddit, asset and Date, with avg_* means added.
+    """
+    cells = sorted((grain, subreddit, asset) for subreddit in subreddits for asset in assets)
+    return add_means(cube.take(cells, start, end))
+
+
+def add_means(rows: pd.DataFrame) -> pd.DataFrame:
+    """Derive avg_compound/avg_neg/avg_neu/avg_pos from the summed columns."""
+    rows = rows.copy()
+    for sum_col in SUM_COLUMNS:
+        rows[sum_col.replace("sum_", "avg_")] = rows[sum_col] / rows["n_posts"]
+    return rows
+
+
+def combine(rows: pd.DataFrame, by: list[str]) -> pd.DataFrame:
+    """Re-aggregate cube rows over `by`, producing post-weighted means and mean prices."""
+    sums = rows.groupby(by)[["n_posts", *SUM_COLUMNS]].sum()
+    price_cols = [col for col in PRICE_COLUMNS if col in rows.columns]
+    if price_cols:
+        sums = sums.join(rows.groupby(by)[price_cols].mean())
+    return add_means(sums.reset_index())
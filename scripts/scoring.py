@@ -0,0 +1,185 @@
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Protocol
+
+import numpy as np
+import pandas as pd
+
+SCORE_COLUMNS = ["compound", "neg", "neu", "pos"]
+SCORE_DECIMALS = 4  # VADER's own precision; float32 storage is rounded back to it on output
+
+
+class Scorer(Protocol):
+    """Anything with a VADER-style `polarity_scores(text) -> {"compound", "neg", "neu", "pos"}` method."""
+
+    def polarity_scores(self, text: str) -> dict: ...
+
+
+class VaderScorer:
+    """The VADER lexicon scorer the pipeline has always used."""
+
+    def __init__(self):
+        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+        self.analyzer = SentimentIntensityAnalyzer()
+
+    def polarity_scores(self, text: str) -> dict:
+        return self.analyzer.polarity_scores(text)
+
+
+# Scorer factories by name. Factories must be importable top-level callables so worker processes can rebuild them.
+SCORERS: dict[str, Callable[[], Scorer]] = {"vader": VaderScorer}
+
+
+def register_scorer(name: str, factory: Callable[[], Scorer]) -> None:
+    """Make another lexicon model available to the scoring stage under `name`."""
+    SCORERS[name] = factory
+
+
+def resolve_scorer(scorer: str | Callable[[], Scorer]) -> Callable[[], Scorer]:
+    if callable(scorer):
+        return scorer
+    try:
+        return SCORERS[scorer]
+    except KeyError:
+        raise ValueError(f"Unknown scorer '{scorer}'. Registered scorers: {', '.join(SCORERS)}") from None
+
+
+class SentimentScores:
+    """
+    Scores for a batch of texts, held in one float32 array of shape (n, 4).
+
+    Columns follow SCORE_COLUMNS (compound, neg, neu, pos) and are exposed as array views.
+    """
+
+    def __init__(self, values: np.ndarray):
+        self.values = np.asarray(values, dtype=np.float32).reshape(-1, len(SCORE_COLUMNS))
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def compound(self) -> np.ndarray:
+        return self.values[:, 0]
+
+    @property
+    def neg(self) -> np.ndarray:
+        return self.values[:, 1]
+
+    @property
+    def neu(self) -> np.ndarray:
+        return self.values[:, 2]
+
+    @property
+    def pos(self) -> np.ndarray:
+        return self.values[:, 3]
+
+    @classmethod
+    def concat(cls, parts: list["SentimentScores"]) -> "SentimentScores":
+        if not parts:
+            return cls(np.empty((0, len(SCORE_COLUMNS)), dtype=np.float32))
+        return cls(np.concatenate([part.values for part in parts]))
+
+    def to_frame(self, index=None) -> pd.DataFrame:
+        return pd.DataFrame(self.values.astype(np.float64).round(SCORE_DECIMALS), columns=SCORE_COLUMNS, index=index)
+
+
+def score_batch(scorer: Scorer, texts: list[str]) -> np.ndarray:
+    """Score texts with one scorer instance, returning an (n, 4) float32 array."""
+    out = np.empty((len(texts), len(SCORE_COLUMNS)), dtype=np.float32)
+    for i, text in enumerate(texts):
+        scores = scorer.polarity_scores(text)
+        out[i] = [scores[col] for col in SCORE_COLUMNS]
+    return out
+
+
+_worker_scorer = None
+
+
+def _init_worker(factory: Callable[[], Scorer]) -> None:
+    global _worker_scorer
+    _worker_scorer = factory()
+
+
+def _score_in_worker(texts: list[str]) -> np.ndarray:
+    return score_batch(_worker_scorer, texts)
+
+
+def _ready() -> None:
+    return None
+
+
+class ScoringStage:
+    """
+    Batched sentiment scoring spread across a process pool.
+
+    With `processes` <= 1 batches are scored in the calling process, which avoids pool
+    start-up cost for small runs.
+
+    Worker processes are forked as soon as the stage is created, so create it before
+    starting any threads (e.g. before the scrape engine's fetch workers).
+
+    Args:
+        scorer (str | Callable): Registered scorer name or a top-level factory returning a Scorer.
+        processes (int | None): Worker processes. Defaults to the number of CPUs.
+        batch_size (int): Texts sent to a worker per task.
+    """
+
+    def __init__(self, scorer: str | Callable[[], Scorer] = "vader", processes: int | None = None,
+                 batch_size: int = 256):
+        self.factory = resolve_scorer(scorer)
+        self.processes = processes if processes is not None else (os.cpu_count() or 1)
+        self.batch_size = batch_size
+        self._local_scorer = None
+        self._pool = None
+        if self.processes > 1:
+            # The fork start method launches every worker on the first submit, so warm up now
+            method = "fork" if "fork" in multiprocessing.get_all_start_methods() else None
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context(method),
+                initializer=_init_worker,
+                initargs=(self.factory,)
+            )
+            self._pool.submit(_ready).result()
+
+    def submit(self, texts: list[str]) -> Future:
+        """Score one batch, returning a Future that resolves to SentimentScores."""
+        if self._pool is not None:
+            future = self._pool.submit(_score_in_worker, list(texts))
+            result = Future()
+            future.add_done_callback(lambda f: _chain(f, result))
+            return result
+
+        if self._local_scorer is None:
+            self._local_scorer = self.factory()
+        result = Future()
+        try:
+            result.set_result(SentimentScores(score_batch(self._local_scorer, list(texts))))
+        except Exception as e:
+            result.set_exception(e)
+        return result
+
+    def score(self, texts) -> SentimentScores:
+        """Score any number of texts, split into batches across the pool."""
+        texts = [str(text) for text in texts]
+        futures = [self.submit(texts[i:i + self.batch_size]) for i in range(0, len(texts), self.batch_size)]
+        return SentimentScores.concat([future.result() for future in futures])
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self) -> "ScoringStage":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _chain(source: Future, target: Future) -> None:
+    if source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(SentimentScores(source.result()))
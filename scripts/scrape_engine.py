@@ -0,0 +1,213 @@
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable
+
+from scripts.reddit_ingest import iter_new_posts
+from scripts.scoring import SCORE_COLUMNS, SCORE_DECIMALS, ScoringStage
+
+LISTING_PAGE_SIZE = 100  # posts returned per Reddit listing request
+_DONE = object()
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every fetch worker, so concurrent scraping stays inside one request budget.
+
+    Args:
+        requests_per_minute (float): Sustained request rate allowed across all workers.
+        burst (int): Requests that may be made back to back before throttling kicks in.
+    """
+
+    def __init__(self, requests_per_minute: float = 90, burst: int = 5):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request may be made."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self.paused_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every worker for `seconds`, e.g. after the server answered 429."""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+
+def is_rate_limited(exc: Exception) -> bool:
+    """True if `exc` carries an HTTP 429 response (prawcore.TooManyRequests and friends)."""
+    response = getattr(exc, "response", None)
+    return getattr(response, "status_code", None) == 429
+
+
+def _retry_after(exc: Exception, attempt: int, base_delay: float, max_delay: float) -> float:
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        return min(max_delay, float(headers["retry-after"]))
+    except (KeyError, TypeError, ValueError):
+        return min(max_delay, base_delay * 2 ** attempt) * (1 + random.random() * 0.25)
+
+
+def _paced(listing, limiter: RateLimiter, limit: int | None = None):
+    """
+    Take one token from the limiter before each listing page after the first is requested.
+
+    A listing requests its next page inside `next()` once the current page is used up, so the
+    token is taken before that call rather than after the page has arrived. No token is taken
+    once `limit` posts have been read, since the listing stops without another request.
+    """
+    posts = iter(listing)
+    count = 0
+    while True:
+        if count and count % LISTING_PAGE_SIZE == 0 and (limit is None or count < limit):
+            limiter.acquire()
+        try:
+            post = next(posts)
+        except StopIteration:
+            return
+        count += 1
+        yield post
+
+
+def scrape_subreddits(make_client: Callable, subreddits: list[str], prepare_post: Callable,
+                      cutoff: datetime, scoring: ScoringStage | None = None, text_key: str = "text",
+                      cursors: dict | None = None, limit: int = 1000,
+                      max_workers: int = 4, requests_per_minute: float = 90, max_retries: int = 5,
+                      base_delay: float = 2.0, max_delay: float = 60.0,
+                      queue_size: int = 2000) -> tuple[list[dict], dict]:
+    """
+    Fetch several subreddits concurrently and score their posts in a separate stage.
+
+    Fetch workers share one RateLimiter and back off on 429 responses. Posts are handed to
+    the scoring stage through a bounded queue and scored in batches on the ScoringStage's
+    process pool, so network waits and sentiment scoring overlap.
+
+    Args:
+        make_client (Callable): Returns a Reddit client (praw.Reddit or a fake with the same
+            `subreddit(name).new(limit=...)` interface). Called once per fetch worker, since praw
+            clients are not thread-safe.
+        subreddits (list[str]): Subreddits to fetch.
+        prepare_post (Callable): `prepare_post(subreddit, post) -> dict | None` building one output row
+            without scores. Returning None drops the post.
+        cutoff (datetime): Oldest post time to keep.
+        scoring (ScoringStage | None): Stage that scores `row[text_key]`. Defaults to in-process VADER.
+        text_key (str): Row field holding the text to score.
+        cursors (dict | None): Per-subreddit high-water marks from an earlier run.
+        limit (int): Max posts requested per subreddit.
+        max_workers (int): Subreddits fetched at the same time.
+        requests_per_minute (float): Shared request budget across all workers.
+        max_retries (int): Retries per subreddit after a 429 before giving up on it.
+        base_delay, max_delay (float): Exponential backoff bounds in seconds.
+        queue_size (int): Max posts buffered between the fetch and scoring stages.
+
+    Returns:
+        tuple[list[dict], dict]: Scored rows, and per-subreddit stats
+        ({sub: {"posts", "seconds", "posts_per_sec", "retries", "error"}}).
+    """
+    cursors = cursors or {}
+    limiter = RateLimiter(requests_per_minute)
+    posts = queue.Queue(maxsize=queue_size)
+    local = threading.local()
+    stats = {sub: {"posts": 0, "seconds": 0.0, "posts_per_sec": 0.0, "retries": 0, "error": None}
+             for sub in subreddits}
+
+    def fetch(sub: str) -> None:
+        if not hasattr(local, "client"):
+            local.client = make_client()
+        started = time.perf_counter()
+        seen = set()
+        for attempt in range(max_retries + 1):
+            try:
+                limiter.acquire()
+                listing = local.client.subreddit(sub).new(limit=limit)
+                for post in iter_new_posts(_paced(listing, limiter, limit), cursors.get(sub), cutoff):
+                    # A retried listing starts from the newest post again
+                    if post.id in seen:
+                        continue
+                    seen.add(post.id)
+                    posts.put((sub, post))
+                break
+            except Exception as e:
+                if not is_rate_limited(e) or attempt == max_retries:
+                    stats[sub]["error"] = str(e)
+                    break
+                stats[sub]["retries"] += 1
+                limiter.pause(_retry_after(e, attempt, base_delay, max_delay))
+
+        elapsed = time.perf_counter() - started
+        stats[sub].update(
+            posts=len(seen),
+            seconds=elapsed,
+            posts_per_sec=len(seen) / elapsed if elapsed > 0 else 0.0
+        )
+
+    scoring = scoring or ScoringStage(processes=1)
+    batches = []
+    errors = []
+
+    def score() -> None:
+        pending = []
+        while True:
+            item = posts.get()
+            if item is not _DONE and errors:
+                # Keep draining so fetch workers never block on a full queue
+                continue
+            if item is not _DONE:
+                try:
+                    row = prepare_post(*item)
+                except Exception as e:
+                    errors.append(e)
+                    continue
+                if row is not None:
+                    pending.append(row)
+            if pending and (item is _DONE or len(pending) >= scoring.batch_size):
+                batches.append((pending, scoring.submit([row[text_key] for row in pending])))
+                pending = []
+            if item is _DONE:
+                return
+
+    scorer = threading.Thread(target=score, name="scrape-scorer", daemon=True)
+    scorer.start()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(subreddits)))) as executor:
+            list(executor.map(fetch, subreddits))
+    finally:
+        posts.put(_DONE)
+        scorer.join()
+    if errors:
+        raise errors[0]
+
+    rows = []
+    for batch_rows, future in batches:
+        scores = future.result().values.tolist()
+        for row, values in zip(batch_rows, scores):
+            row.update((col, round(value, SCORE_DECIMALS)) for col, value in zip(SCORE_COLUMNS, values))
+            rows.append(row)
+    return rows, stats
+
+
+def print_stats(stats: dict) -> None:
+    """Print a one-line throughput summary per subreddit."""
+    for sub, s in stats.items():
+        line = f"   r/{sub}: {s['posts']} posts in {s['seconds']:.1f}s ({s['posts_per_sec']:.1f} posts/s)"
+        if s["retries"]:
+            line += f", {s['retries']} rate-limit retries"
+        if s["error"]:
+            line += f" ❌ {s['error']}"
+        print(line)
@@ -0,0 +1,214 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+import numpy as np
+
+from scripts.scoring import ScoringStage, SentimentScores
+
+DEFAULT_MEMO_PATH = "data/sentiment_memo.sqlite"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Canonical form used for hashing: NFKC, collapsed whitespace, stripped.
+
+    Case is kept because VADER treats capitalized words as emphasis, so
+    case-only variants can legitimately score differently.
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", str(text))).strip()
+
+
+def text_id(text: str) -> str:
+    """Stable 16-hex-digit ID of a text's normalized content."""
+    return hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()[:16]
+
+
+class SentimentMemo:
+    """
+    Persistent SQLite memo of sentiment scores keyed by (scorer, normalized text hash).
+
+    Each distinct text is stored and scored once, no matter how many posts or
+    subreddits it appears in.
+
+    Args:
+        path (str): SQLite file to store entries in.
+    """
+
+    def __init__(self, path: str = DEFAULT_MEMO_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS scores ("
+                " scorer TEXT NOT NULL,"
+                " text_id TEXT NOT NULL,"
+                " text TEXT NOT NULL,"
+                " compound REAL, neg REAL, neu REAL, pos REAL,"
+                " PRIMARY KEY (scorer, text_id))"
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get_many(self, text_ids: list[str], scorer: str) -> dict[str, list[float]]:
+        """Return {text_id: [compound, neg, neu, pos]} for the IDs already memoized."""
+        found = {}
+        with self._connect() as conn:
+            # Chunk to stay below SQLite's bound-parameter limit
+            for i in range(0, len(text_ids), 900):
+                chunk = text_ids[i:i + 900]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT text_id, compound, neg, neu, pos FROM scores"
+                    f" WHERE scorer = ? AND text_id IN ({placeholders})",
+                    [scorer, *chunk]
+                )
+                for row in rows:
+                    found[row[0]] = list(row[1:])
+        return found
+
+    def put_many(self, text_ids: list[str], texts: list[str], scores: np.ndarray, scorer: str) -> None:
+        """Insert or refresh scores for the given texts."""
+        rows = [
+            (scorer, tid, text, *map(float, values))
+            for tid, text, values in zip(text_ids, texts, scores)
+        ]
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO scores (scorer, text_id, text, compound, neg, neu, pos)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+
+class MemoizedScoring:
+    """
+    Wraps a ScoringStage so each distinct text is scored at most once across batches and runs.
+
+    Exposes the same `submit` / `score` / `batch_size` interface as ScoringStage, so it can be
+    handed to the scrape engine directly. Counters for the dedup report accumulate across calls.
+
+    Args:
+        stage (ScoringStage): Stage used for texts missing from the memo.
+        memo (SentimentMemo): Persistent memo.
+        scorer_name (str): Name the scores are memoized under.
+    """
+
+    def __init__(self, stage: ScoringStage, memo: SentimentMemo, scorer_name: str = "vader"):
+        self.stage = stage
+        self.memo = memo
+        self.scorer_name = scorer_name
+        self.batch_size = stage.batch_size
+        self.total = 0
+        self.memo_hits = 0
+        self.batch_duplicates = 0
+        self.scored = 0
+        self._inflight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, texts: list[str]) -> Future:
+        ids = [text_id(text) for text in texts]
+        known = self.memo.get_many(list(set(ids)), self.scorer_name)
+
+        with self._lock:
+            # Texts already being scored for an earlier batch are awaited rather than rescored
+            waiting = {tid: self._inflight[tid] for tid in ids if tid not in known and tid in self._inflight}
+            missing = {}
+            for tid, text in zip(ids, texts):
+                if tid not in known and tid not in waiting and tid not in missing:
+                    missing[tid] = text
+            scored = Future()
+            for tid in missing:
+                self._inflight[tid] = scored
+
+            self.total += len(texts)
+            self.memo_hits += sum(tid in known for tid in ids)
+            self.batch_duplicates += len(texts) - sum(tid in known for tid in ids) - len(missing)
+            self.scored += len(missing)
+
+        result = Future()
+
+        def finish() -> None:
+            try:
+                lookup = dict(known)
+                for future in {*waiting.values(), scored}:
+                    lookup.update(future.result())
+                values = np.array([lookup[tid] for tid in ids], dtype=np.float32)
+            except Exception as e:
+                result.set_exception(e)
+                return
+            result.set_result(SentimentScores(values))
+
+        def on_scored(f: Future) -> None:
+            try:
+                new_scores = f.result().values
+                self.memo.put_many(list(missing), list(missing.values()), new_scores, self.scorer_name)
+                scored.set_result(dict(zip(missing, new_scores.tolist())))
+            except Exception as e:
+                scored.set_exception(e)
+            finally:
+                with self._lock:
+                    for tid in missing:
+                        self._inflight.pop(tid, None)
+
+        # Resolve once our own scores and every awaited batch are in, without blocking callback threads
+        dependencies = {*waiting.values(), scored}
+        remaining = [len(dependencies)]
+        countdown_lock = threading.Lock()
+
+        def on_dependency_done(_: Future) -> None:
+            with countdown_lock:
+                remaining[0] -= 1
+                done = remaining[0] == 0
+            if done:
+                finish()
+
+        for future in dependencies:
+            future.add_done_callback(on_dependency_done)
+
+        if missing:
+            self.stage.submit(list(missing.values())).add_done_callback(on_scored)
+        else:
+            scored.set_result({})
+        return result
+
+    def score(self, texts) -> SentimentScores:
+        texts = [str(text) for text in texts]
+        futures = [self.submit(texts[i:i + self.batch_size]) for i in range(0, len(texts), self.batch_size)]
+        return SentimentScores.concat([future.result() for future in futures])
+
+    @property
+    def dedup_ratio(self) -> float:
+        """Share of texts this run that did not need scoring (memo hits plus in-run duplicates)."""
+        return 1 - self.scored / self.total if self.total else 0.0
+
+    def report(self) -> str:
+        return (
+            f"🔁 Dedup: {self.total} texts, {self.memo_hits} memo hits, {self.batch_duplicates} in-run duplicates, "
+            f"{self.scored} scored (dedup ratio {self.dedup_ratio:.1%})"
+        )
+
+    def close(self) -> None:
+        self.stage.close()
+
+    def __enter__(self) -> "MemoizedScoring":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from scripts.instrumentation import count
+
+DEFAULT_CACHE_PATH = "data/summary_cache.sqlite"
+
+
+class SummaryCache:
+    """
+    Persistent SQLite store for generated summaries with TTL and LRU eviction.
+
+    Entries are keyed by a hash of everything that determines the LLM output
+    (model, prompt template, subreddit and post texts), so a repeated view is
+    answered from disk without a network call.
+
+    Args:
+        path (str): SQLite file to store entries in.
+        ttl_seconds (float | None): Age after which an entry is treated as stale. None keeps entries forever.
+        max_entries (int | None): Entries kept before the least recently used ones are evicted. None never evicts.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl_seconds: float | None = 7 * 24 * 3600,
+                 max_entries: int | None = 1000):
+        self.path = path
+        self.name = os.path.splitext(os.path.basename(path))[0]
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_summaries_last_access ON summaries (last_access)")
+
+    @contextmanager
+    def _connect(self):
+        # One short-lived connection per call keeps the cache safe to share across threads
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(**parts) -> str:
+        """Hash the given keyword parts into a stable cache key."""
+        payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """Return the cached value for `key`, or None if it is missing or expired."""
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT value, created_at FROM summaries WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM summaries WHERE key = ?", (key,))
+                row = None
+            if row is not None:
+                conn.execute("UPDATE summaries SET last_access = ? WHERE key = ?", (now, key))
+
+        count(f"cache.{self.name}.{'misses' if row is None else 'hits'}")
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        """Store `value` under `key` and evict stale or least recently used entries."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, value, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        if self.ttl_seconds is not None:
+            conn.execute("DELETE FROM summaries WHERE created_at < ?", (now - self.ttl_seconds,))
+        if self.max_entries is None:
+            return
+        conn.execute(
+            "DELETE FROM summaries WHERE key IN ("
+            " SELECT key FROM summaries ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    def clear(self) -> None:
+        """Remove every entry and reset the hit/miss counters."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM summaries")
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Return hit/miss counters for this process and the number of stored entries."""
+        with self._connect() as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": entries}
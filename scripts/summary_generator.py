@@ -1,8 +1,17 @@
+import math
 import os
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator
+
 import openai
 import pandas as pd
 from dotenv import load_dotenv
 
+from scripts.instrumentation import count, observe, span, submit
+from scripts.summary_cache import SummaryCache
+
 # Load environment variables
 load_dotenv()
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
@@ -10,26 +19,131 @@ GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 if not GROQ_API_KEY:
     raise ValueError("GROQ_API_KEY is not set. Please add it to your .env file.")
 
-# Groq-compatible OpenAI client
+# Groq-compatible OpenAI client (GROQ_BASE_URL can point it at another OpenAI-compatible server)
 client = openai.OpenAI(
     api_key=GROQ_API_KEY,
-    base_url="https://api.groq.com/openai/v1"
+    base_url=os.getenv("GROQ_BASE_URL", "https://api.groq.com/openai/v1")
+)
+
+MODEL = "llama3-8b-8192"
+SYSTEM_PROMPT = "You are a financial sentiment analyst."
+PROMPT_TEMPLATE = (
+    "Summarize the sentiment in r/{subreddit} over the selected period. "
+    "Highlight key themes, tone, and any major opinions expressed.\n\n"
+    "Posts:\n{posts}"
 )
+# Map-reduce mode: one summary per day/week chunk, then a summary of those summaries
+CHUNK_PROMPT_TEMPLATE = (
+    "Summarize the sentiment in r/{subreddit} during {period}. "
+    "Highlight key themes, tone, and any major opinions expressed.\n\n"
+    "Posts:\n{posts}"
+)
+REDUCE_PROMPT_TEMPLATE = (
+    "Below are summaries of r/{subreddit} for consecutive periods from {start} to {end}. "
+    "Combine them into one summary of the sentiment over the whole period: key themes, "
+    "how the tone shifted over time, and any major opinions expressed.\n\n"
+    "Summaries:\n{summaries}"
+)
+CHUNK_FREQS = {"D": "D", "W": "W-SUN"}
+TEMPERATURE = 0.7
+MAX_TOKENS = 200
+REQUEST_TIMEOUT = 30.0
+# Prompt size limits, in estimated tokens (roughly 4 characters each for English text)
+PROMPT_TOKEN_BUDGET = 3000
+POST_TOKEN_LIMIT = 150
+CHARS_PER_TOKEN = 4
+
+# Persistent summary cache shared by every caller in this process
+summary_cache = SummaryCache()
+# Chunk summaries describe a fixed set of posts, so they never go stale and are kept forever
+chunk_cache = SummaryCache(path="data/summary_chunks.sqlite", ttl_seconds=None, max_entries=None)
 
-def summarize_with_groq(posts_df: pd.DataFrame, subreddit: str, max_posts: int = 20) -> str:
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate; close enough for budgeting without a tokenizer dependency."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut `text` at a word boundary so it fits in about `max_tokens` tokens."""
+    limit = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text[:limit].rsplit(" ", 1)[0] or text[:limit]
+    return cut.rstrip() + "…"
+
+
+def select_posts(posts_df: pd.DataFrame, max_posts: int = 20, token_budget: int = PROMPT_TOKEN_BUDGET,
+                 post_token_limit: int = POST_TOKEN_LIMIT) -> list[str]:
     """
-    Summarize sentiment in a subreddit using Groq LLaMA3 (based on 'text' or 'title' column).
+    Pick the most informative posts that fit in the token budget, truncating each one.
+
+    Posts are ranked by how strongly they lean (|compound|) and by engagement (score plus
+    comment count), whichever columns are present; without either, the original order is kept.
+    The chosen posts are returned in their original order.
 
     Args:
-        posts_df (pd.DataFrame): DataFrame with Reddit posts. Must include 'text' or 'title' column.
-        subreddit (str): Subreddit name (for prompt context).
-        max_posts (int): Max number of posts to include in prompt.
+        posts_df (pd.DataFrame): Posts with a 'text' column.
+        max_posts (int): Max number of posts to include.
+        token_budget (int): Estimated tokens available for the post texts.
+        post_token_limit (int): Estimated tokens any single post may use.
 
     Returns:
-        str: Summary generated by LLaMA 3
+        list[str]: Truncated post texts.
+    """
+    posts = posts_df.assign(text=posts_df["text"].astype("string").str.strip()).reset_index(drop=True)
+    posts = posts[posts["text"].fillna("") != ""]
+
+    signals = []
+    if "compound" in posts.columns:
+        signals.append(pd.to_numeric(posts["compound"], errors="coerce").abs().rank(pct=True))
+    engagement_cols = [col for col in ("score", "num_comments") if col in posts.columns]
+    if engagement_cols:
+        engagement = posts[engagement_cols].apply(pd.to_numeric, errors="coerce").sum(axis=1)
+        signals.append(engagement.rank(pct=True))
+    if signals:
+        ranking = pd.concat(signals, axis=1).mean(axis=1).fillna(0)
+        order = ranking.sort_values(ascending=False, kind="stable").index
+    else:
+        order = posts.index
+
+    chosen = {}
+    used = 0
+    for idx in order:
+        if len(chosen) >= max_posts:
+            break
+        text = truncate_to_tokens(posts.at[idx, "text"], post_token_limit)
+        cost = estimate_tokens(text) + 1  # newline separator
+        if used + cost > token_budget:
+            # A shorter post further down the ranking may still fit
+            continue
+        chosen[idx] = text
+        used += cost
+    return [chosen[idx] for idx in sorted(chosen)]
+
+
+def build_prompt(posts_df: pd.DataFrame, subreddit: str, max_posts: int = 20,
+                 token_budget: int = PROMPT_TOKEN_BUDGET, template: str = PROMPT_TEMPLATE,
+                 **fields) -> tuple[str, list[str]]:
+    """
+    Build the user prompt for a subreddit within `token_budget` estimated tokens.
+
+    Args:
+        template (str): Prompt template with {subreddit} and {posts} placeholders.
+        **fields: Values for any other placeholders in `template`.
+
+    Returns:
+        tuple[str, list[str]]: The prompt and the (truncated) post texts it contains.
     """
+    overhead = estimate_tokens(SYSTEM_PROMPT + template.format(subreddit=subreddit, posts="", **fields))
+    texts = select_posts(posts_df, max_posts, max(0, token_budget - overhead))
+    return template.format(subreddit=subreddit, posts="\n".join(texts), **fields), texts
+
+
+def _post_texts(posts_df: pd.DataFrame) -> tuple[pd.DataFrame | None, str | None]:
+    """Return posts with a 'text' column (falling back to 'title'), or None and a message to show instead."""
     if posts_df.empty:
-        return "No posts available for this period."
+        return None, "No posts available for this period."
 
     # Use 'text' column if present, fallback to 'title'
     if "text" not in posts_df.columns:
@@ -37,31 +151,374 @@ def summarize_with_groq(posts_df: pd.DataFrame, subreddit: str, max_posts: int =
             posts_df = posts_df.copy()
             posts_df["text"] = posts_df["title"]
         else:
-            return "No usable post content found (no 'text' or 'title' column)."
+            return None, "No usable post content found (no 'text' or 'title' column)."
+    return posts_df, None
 
-    sample_texts = posts_df["text"].dropna().astype(str).head(max_posts)
-    if sample_texts.empty:
-        return "No post content to summarize."
 
-    combined_text = "\n".join(sample_texts)
+def _cache_key(subreddit: str, texts: list[str], template: str = PROMPT_TEMPLATE, **fields) -> str:
+    return SummaryCache.make_key(
+        model=MODEL,
+        system=SYSTEM_PROMPT,
+        template=template,
+        temperature=TEMPERATURE,
+        max_tokens=MAX_TOKENS,
+        subreddit=subreddit,
+        posts=texts,
+        **fields
+    )
+
+
+def _messages(prompt: str) -> list[dict]:
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+
 
-    prompt = (
-        f"Summarize the sentiment in r/{subreddit} over the selected period. "
-        f"Highlight key themes, tone, and any major opinions expressed.\n\n"
-        f"Posts:\n{combined_text}"
+def _complete(prompt: str, timeout: float | None) -> str:
+    """Blocking chat completion for `prompt`; raises on API errors."""
+    start = time.perf_counter()
+    count("llm.requests")
+    response = client.with_options(timeout=timeout).chat.completions.create(
+        model=MODEL,
+        messages=_messages(prompt),
+        temperature=TEMPERATURE,
+        max_tokens=MAX_TOKENS
     )
+    observe("llm.latency_s", time.perf_counter() - start)
+    return response.choices[0].message.content.strip()
 
+
+def _stream_completion(prompt: str, cache_key: str | None, cache: SummaryCache | None,
+                       timeout: float | None) -> Iterator[str]:
+    """Stream a chat completion for `prompt`, caching the joined text once the stream completes."""
+    pieces = []
+    start = time.perf_counter()
+    count("llm.requests")
     try:
-        response = client.chat.completions.create(
-            model="llama3-8b-8192",
-            messages=[
-                {"role": "system", "content": "You are a financial sentiment analyst."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=200
+        stream = client.with_options(timeout=timeout).chat.completions.create(
+            model=MODEL,
+            messages=_messages(prompt),
+            temperature=TEMPERATURE,
+            max_tokens=MAX_TOKENS,
+            stream=True
         )
-        return response.choices[0].message.content.strip()
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            piece = chunk.choices[0].delta.content
+            if piece:
+                # Leading whitespace is dropped, matching the .strip() of the blocking call
+                if not pieces:
+                    piece = piece.lstrip()
+                    if not piece:
+                        continue
+                    observe("llm.first_token_s", time.perf_counter() - start)
+                pieces.append(piece)
+                yield piece
+    except Exception as e:
+        count("llm.errors")
+        yield f"Error generating summary: {str(e)}"
+        return
+
+    observe("llm.latency_s", time.perf_counter() - start)
+    if cache is not None and pieces:
+        cache.set(cache_key, "".join(pieces).strip())
+
+
+def summarize_with_groq(posts_df: pd.DataFrame, subreddit: str, max_posts: int = 20,
+                        cache: SummaryCache | None = summary_cache,
+                        timeout: float | None = REQUEST_TIMEOUT,
+                        token_budget: int = PROMPT_TOKEN_BUDGET) -> str:
+    """
+    Summarize sentiment in a subreddit using Groq LLaMA3 (based on 'text' or 'title' column).
+
+    Args:
+        posts_df (pd.DataFrame): DataFrame with Reddit posts. Must include 'text' or 'title' column.
+        subreddit (str): Subreddit name (for prompt context).
+        max_posts (int): Max number of posts to include in prompt.
+        cache (SummaryCache | None): Cache consulted before calling Groq. Pass None to always call the API.
+        timeout (float | None): Seconds to wait for the Groq response before giving up.
+        token_budget (int): Estimated prompt tokens; posts are picked and truncated to fit.
+
+    Returns:
+        str: Summary generated by LLaMA 3
+    """
+    posts_df, message = _post_texts(posts_df)
+    if posts_df is None:
+        return message
+
+    prompt, texts = build_prompt(posts_df, subreddit, max_posts, token_budget)
+    if not texts:
+        return "No post content to summarize."
+
+    cache_key = None
+    if cache is not None:
+        cache_key = _cache_key(subreddit, texts)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    try:
+        summary = _complete(prompt, timeout)
+        # Only successful responses are cached so transient API errors are retried
+        if cache is not None:
+            cache.set(cache_key, summary)
+        return summary
 
     except Exception as e:
         return f"Error generating summary: {str(e)}"
+
+
+def stream_summary(posts_df: pd.DataFrame, subreddit: str, max_posts: int = 20,
+                   cache: SummaryCache | None = summary_cache,
+                   timeout: float | None = REQUEST_TIMEOUT,
+                   token_budget: int = PROMPT_TOKEN_BUDGET) -> Iterator[str]:
+    """
+    Like `summarize_with_groq`, but yield the summary in chunks as Groq generates it.
+
+    A cached summary is yielded as a single chunk. The full summary is cached once the
+    stream completes; an interrupted or failed stream is not cached.
+
+    Yields:
+        str: Consecutive pieces of the summary (or a single error/notice message).
+    """
+    posts_df, message = _post_texts(posts_df)
+    if posts_df is None:
+        yield message
+        return
+
+    prompt, texts = build_prompt(posts_df, subreddit, max_posts, token_budget)
+    if not texts:
+        yield "No post content to summarize."
+        return
+
+    cache_key = None
+    if cache is not None:
+        cache_key = _cache_key(subreddit, texts)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+    yield from _stream_completion(prompt, cache_key, cache, timeout)
+
+
+def stream_many(posts_by_subreddit: dict[str, pd.DataFrame], max_posts: int = 20, max_workers: int = 8,
+                cache: SummaryCache | None = summary_cache,
+                timeout: float | None = REQUEST_TIMEOUT,
+                stream_fn: Callable[..., Iterator[str]] | None = None) -> Iterator[tuple[str, str]]:
+    """
+    Stream several subreddit summaries concurrently, interleaving their chunks as they arrive.
+
+    Each stream runs on a worker thread and pushes its chunks onto a shared queue, so the
+    caller (e.g. the Streamlit script thread) can render every summary progressively.
+
+    Args:
+        stream_fn (Callable | None): Streaming summarizer called as
+            `stream_fn(posts_df, subreddit, max_posts=..., cache=..., timeout=...)`.
+            Defaults to `stream_summary`; pass `stream_map_reduce` to cover whole periods.
+
+    Yields:
+        tuple[str, str]: (subreddit, chunk) pairs in arrival order.
+    """
+    if not posts_by_subreddit:
+        return
+
+    stream_fn = stream_fn or stream_summary
+    chunks = queue.Queue()
+    done = object()
+
+    def pump(subreddit, posts_df):
+        try:
+            for piece in stream_fn(posts_df, subreddit, max_posts=max_posts, cache=cache, timeout=timeout):
+                chunks.put((subreddit, piece))
+        except Exception as e:
+            chunks.put((subreddit, f"Error generating summary: {str(e)}"))
+        finally:
+            chunks.put((subreddit, done))
+
+    workers = max(1, min(max_workers, len(posts_by_subreddit)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for subreddit, posts_df in posts_by_subreddit.items():
+            submit(executor, pump, subreddit, posts_df)
+        remaining = len(posts_by_subreddit)
+        while remaining:
+            subreddit, piece = chunks.get()
+            if piece is done:
+                remaining -= 1
+            else:
+                yield subreddit, piece
+
+
+def chunk_posts(posts_df: pd.DataFrame, freq: str = "W") -> list[tuple[str, pd.DataFrame]]:
+    """
+    Split posts into calendar chunks: "D" for days, "W" for Monday-to-Sunday weeks.
+
+    Returns:
+        list[tuple[str, pd.DataFrame]]: (period label, posts) pairs in time order.
+    """
+    times = pd.to_datetime(posts_df["created_utc"], utc=True, format="mixed").dt.tz_localize(None)
+    periods = times.dt.to_period(CHUNK_FREQS[freq])
+    chunks = []
+    for period, group in posts_df.groupby(periods.to_numpy(), sort=True):
+        start = period.start_time.strftime("%Y-%m-%d")
+        label = start if freq == "D" else f"the week of {start}"
+        chunks.append((label, group))
+    return chunks
+
+
+def summarize_chunk(posts_df: pd.DataFrame, subreddit: str, period: str, max_posts: int = 20,
+                    cache: SummaryCache | None = chunk_cache,
+                    timeout: float | None = REQUEST_TIMEOUT,
+                    token_budget: int = PROMPT_TOKEN_BUDGET) -> str | None:
+    """
+    Summarize one day/week of posts (the map step), or return None if it has no text.
+    Request errors are raised, so the caller can report which periods are missing.
+
+    The cache key covers the chunk's post texts, so a chunk is only summarized again when
+    its posts change; widening the date range reuses every chunk already summarized.
+    """
+    prompt, texts = build_prompt(posts_df, subreddit, max_posts, token_budget,
+                                 template=CHUNK_PROMPT_TEMPLATE, period=period)
+    if not texts:
+        return None
+
+    cache_key = None
+    if cache is not None:
+        cache_key = _cache_key(subreddit, texts, template=CHUNK_PROMPT_TEMPLATE, period=period)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+    summary = _complete(prompt, timeout)
+    if cache is not None:
+        cache.set(cache_key, summary)
+    return summary
+
+
+def _reduce_prompt(subreddit: str, summaries: list[tuple[str, str]]) -> str:
+    lines = "\n".join(f"- {label}: {text}" for label, text in summaries)
+    return REDUCE_PROMPT_TEMPLATE.format(subreddit=subreddit, start=summaries[0][0], end=summaries[-1][0],
+                                         summaries=lines)
+
+
+def _reduce_key(subreddit: str, summaries: list[tuple[str, str]]) -> str:
+    return SummaryCache.make_key(model=MODEL, system=SYSTEM_PROMPT, template=REDUCE_PROMPT_TEMPLATE,
+                                 temperature=TEMPERATURE, max_tokens=MAX_TOKENS, subreddit=subreddit,
+                                 summaries=summaries)
+
+
+def _fit_summaries(summaries: list[tuple[str, str]], subreddit: str, token_budget: int, max_workers: int,
+                   cache: SummaryCache | None, timeout: float | None) -> list[tuple[str, str]]:
+    """
+    Merge consecutive chunk summaries in rounds until they fit in one reduce prompt.
+
+    Each round groups neighbouring summaries into batches that fit the budget and reduces the
+    batches in parallel, so long ranges turn into a shallow tree of summaries.
+    """
+    overhead = estimate_tokens(SYSTEM_PROMPT + REDUCE_PROMPT_TEMPLATE) + 20
+    while len(summaries) > 1 and overhead + sum(estimate_tokens(text) + 10 for _, text in summaries) > token_budget:
+        batches, batch, used = [], [], overhead
+        for label, text in summaries:
+            cost = estimate_tokens(text) + 10
+            if batch and used + cost > token_budget:
+                batches.append(batch)
+                batch, used = [], overhead
+            batch.append((label, text))
+            used += cost
+        batches.append(batch)
+        if len(batches) == len(summaries):
+            # Every summary alone fills the budget; reducing further would not shrink anything
+            break
+
+        def reduce_batch(batch):
+            if len(batch) == 1:
+                return batch[0]
+            label = f"{batch[0][0]} to {batch[-1][0]}"
+            key = _reduce_key(subreddit, batch)
+            cached = cache.get(key) if cache is not None else None
+            if cached is not None:
+                return label, cached
+            text = _complete(_reduce_prompt(subreddit, batch), timeout)
+            if cache is not None:
+                cache.set(key, text)
+            return label, text
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batches)))) as executor:
+            futures = [submit(executor, reduce_batch, batch) for batch in batches]
+            summaries = [future.result() for future in futures]
+    return summaries
+
+
+def stream_map_reduce(posts_df: pd.DataFrame, subreddit: str, max_posts: int = 20,
+                      cache: SummaryCache | None = summary_cache,
+                      timeout: float | None = REQUEST_TIMEOUT,
+                      freq: str = "W", max_workers: int = 4,
+                      chunk_cache: SummaryCache | None = chunk_cache,
+                      token_budget: int = PROMPT_TOKEN_BUDGET) -> Iterator[str]:
+    """
+    Summarize a whole date range: summarize each day/week in parallel, then stream a summary of those.
+
+    Args:
+        posts_df (pd.DataFrame): Posts with 'created_utc' and 'text' (or 'title').
+        subreddit (str): Subreddit name (for prompt context).
+        max_posts (int): Max number of posts per chunk prompt.
+        cache (SummaryCache | None): Cache for the final and intermediate reduce steps.
+        timeout (float | None): Per-request timeout in seconds.
+        freq (str): Chunk size, "D" (daily) or "W" (weekly).
+        max_workers (int): Max chunk requests in flight for this subreddit.
+        chunk_cache (SummaryCache | None): Permanent cache for the per-chunk summaries.
+        token_budget (int): Estimated tokens per prompt, for chunks and reduce steps alike.
+
+    Yields:
+        str: Consecutive pieces of the final summary (or a single error/notice message), preceded by
+            a notice naming the periods left out when some of them could not be summarized.
+    """
+    posts_df, message = _post_texts(posts_df)
+    if posts_df is None:
+        yield message
+        return
+
+    chunks = chunk_posts(posts_df, freq)
+    with span("summaries.map"), ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+        futures = [submit(executor, summarize_chunk, posts, subreddit, period, max_posts, chunk_cache, timeout, token_budget)
+                   for period, posts in chunks]
+    summaries, failed = [], []
+    for (label, _), future in zip(chunks, futures):
+        try:
+            text = future.result()
+        except Exception:
+            failed.append(label)
+            continue
+        if text:
+            summaries.append((label, text))
+    if not summaries:
+        yield "Error generating summary: no period could be summarized." if chunks else "No post content to summarize."
+        return
+    if failed:
+        # Say which periods the summary leaves out, and keep the partial summary out of the
+        # cache so the next request retries them instead of reusing it as the whole period's
+        yield f"⚠️ No summary for {', '.join(failed)} (request failed); the summary below covers the other periods.\n\n"
+        cache = None
+    if len(summaries) == 1:
+        yield summaries[0][1]
+        return
+
+    try:
+        with span("summaries.reduce"):
+            summaries = _fit_summaries(summaries, subreddit, token_budget, max_workers, cache, timeout)
+    except Exception as e:
+        yield f"Error generating summary: {str(e)}"
+        return
+    if len(summaries) == 1:
+        yield summaries[0][1]
+        return
+
+    cache_key = None
+    if cache is not None:
+        cache_key = _reduce_key(subreddit, summaries)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+    yield from _stream_completion(_reduce_prompt(subreddit, summaries), cache_key, cache, timeout)
@@ -0,0 +1,52 @@
+import pandas as pd
+
+from scripts.frame_index import FrameIndex
+
+TEXT_DTYPE = pd.StringDtype("pyarrow")
+STRING_COLS = ["text", "title", "text_id", "id"]
+# Strings repeated this often (cross-posts, bot posts) are stored once, as categories
+DEDUP_RATIO = 0.5
+FLOAT_COLS = ["compound", "neg", "neu", "pos"]
+
+
+def compact_text(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink a Reddit posts frame: categorical subreddit, Arrow-backed strings, float32 scores.
+
+    String columns with many repeats are made categorical as well, storing each distinct value once.
+
+    Args:
+        df (pd.DataFrame): Posts with subreddit and created_utc columns.
+
+    Returns:
+        pd.DataFrame: Compact copy of `df`.
+    """
+    df = df.copy()
+    df["subreddit"] = df["subreddit"].astype(str).astype("category")
+    times = pd.to_datetime(df["created_utc"], utc=True, format="mixed")
+    df["created_utc"] = times.dt.tz_localize(None)
+    for col in STRING_COLS:
+        if col in df.columns:
+            df[col] = df[col].astype(TEXT_DTYPE)
+            if df[col].nunique() <= len(df) * DEDUP_RATIO:
+                df[col] = df[col].astype("category")
+    for col in FLOAT_COLS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float32")
+    return df
+
+
+class TextIndex(FrameIndex):
+    """
+    Compact posts frame partitioned by subreddit and sorted by created_utc (see `FrameIndex`).
+
+    Args:
+        df (pd.DataFrame): Posts with subreddit and created_utc columns.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        super().__init__(compact_text(df), "subreddit", "created_utc")
+
+    @property
+    def subreddits(self) -> list[str]:
+        return self.partitions